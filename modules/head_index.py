@@ -0,0 +1 @@
+from snakevortex.game.head_index import *
@@ -0,0 +1 @@
+from snakevortex.game.input_queue import *
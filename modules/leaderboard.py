@@ -0,0 +1 @@
+from snakevortex.game.leaderboard import *
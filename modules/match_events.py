@@ -0,0 +1 @@
+from snakevortex.game.match_events import *
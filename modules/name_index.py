@@ -0,0 +1 @@
+from snakevortex.game.name_index import *
@@ -0,0 +1 @@
+from snakevortex.game.sessions import *
@@ -0,0 +1 @@
+from snakevortex.game.snapshot import *
@@ -0,0 +1 @@
+from snakevortex.game.world_snapshot import *
@@ -0,0 +1,8 @@
+from snakevortex.cluster import create_router
+from snakevortex.config import ROUTER_HOST, ROUTER_PORT
+
+app = create_router()
+
+
+if __name__ == "__main__":
+    app.run(host=ROUTER_HOST, port=ROUTER_PORT, debug=False)
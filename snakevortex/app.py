@@ -1,29 +1,24 @@
 import asyncio
+import time
 from pathlib import Path
 
 from quart import Quart
 
-from snakevortex.config import RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW
-from snakevortex.game.arena_system import init_arena
-from snakevortex.game.bot_ai import create_bot
-from snakevortex.game.food_system import generate_food, generate_power_food
-from snakevortex.game.game_loop import game_loop
-from snakevortex.game.game_state import FOOD_COUNT, POWER_FOOD_COUNT, game_state
+from snakevortex.cluster import ClusterNode
+from snakevortex.config import (
+    RATE_LIMIT_REQUESTS,
+    RATE_LIMIT_WINDOW,
+    RECLAIM_GRACE_MS,
+    STARTUP_BUDGET_MS,
+    WS_HANDSHAKE_REQUESTS,
+    WS_HANDSHAKE_WINDOW,
+)
+from snakevortex.game.match_events import on_match_end
+from snakevortex.game.room import activate_room
+from snakevortex.storage import ScoreStore, WorldStore
 from snakevortex.web.routes import register_routes
 from snakevortex.web.security import RateLimiter, is_same_origin
-
-
-def initialize_game():
-    init_arena()
-
-    for _ in range(FOOD_COUNT):
-        game_state["food"].append(generate_food())
-
-    for _ in range(POWER_FOOD_COUNT):
-        game_state["power_food"].append(generate_power_food())
-
-    for _ in range(8):
-        create_bot()
+from snakevortex.web.static_assets import StaticAssetPipeline
 
 
 def create_app():
@@ -35,11 +30,34 @@ def create_app():
     )
 
     rate_limiter = RateLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW)
-    register_routes(app, rate_limiter, is_same_origin)
+    handshake_limiter = RateLimiter(WS_HANDSHAKE_REQUESTS, WS_HANDSHAKE_WINDOW)
+    assets = StaticAssetPipeline(app.static_folder).build()
+    score_store = ScoreStore()
+    world_store = WorldStore()
+    cluster_node = ClusterNode()
+    on_match_end(score_store.record_match)
+    register_routes(app, rate_limiter, is_same_origin, assets, handshake_limiter, score_store, cluster_node)
 
     @app.before_serving
     async def startup():
-        initialize_game()
-        asyncio.create_task(game_loop())
+        started = time.perf_counter()
+        world = await world_store.load()
+        if world is not None:
+            activate_room(world, RECLAIM_GRACE_MS)
+        await score_store.start()
+        world_store.start()
+        asyncio.create_task(rate_limiter.run_expiry())
+        asyncio.create_task(handshake_limiter.run_expiry())
+        cluster_node.start()
+
+        startup_ms = (time.perf_counter() - started) * 1000
+        if startup_ms > STARTUP_BUDGET_MS:
+            print(f"Startup took {startup_ms:.1f} ms, over the {STARTUP_BUDGET_MS:.0f} ms budget")
+
+    @app.after_serving
+    async def shutdown():
+        await cluster_node.close()
+        await world_store.close()
+        await score_store.close()
 
     return app
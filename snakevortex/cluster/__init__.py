@@ -0,0 +1,4 @@
+from .directory import RoomDirectory
+from .discovery import DISCOVERY_BACKENDS, DirectoryDiscovery, StaticDiscovery, create_discovery
+from .node import ClusterNode
+from .router import create_router
@@ -0,0 +1,94 @@
+import time
+
+from snakevortex.config import CLUSTER_ROOM_TTL, CLUSTER_TICK_BUDGET_MS
+
+MAX_ROOM_ID_LENGTH = 64
+OVERLOADED_PENALTY = 1.0
+
+
+def parse_room_status(status):
+    if not isinstance(status, dict):
+        raise ValueError("room status must be an object")
+
+    room_id = status["room"]
+    url = status["url"]
+    if not isinstance(room_id, str) or not room_id or len(room_id) > MAX_ROOM_ID_LENGTH:
+        raise ValueError("invalid room id")
+    if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+        raise ValueError("invalid room url")
+
+    return {
+        "room": room_id,
+        "url": url.rstrip("/"),
+        "players": int(status.get("players", 0)),
+        "max_players": max(1, int(status.get("max_players", 1))),
+        "clients": int(status.get("clients", 0)),
+        "tick_ms": float(status.get("tick_ms") or 0.0),
+        "bytes_per_second": int(status.get("bytes_per_second", 0)),
+        "accepting": bool(status.get("accepting", True)),
+    }
+
+
+def websocket_url(room):
+    url = room["url"]
+    if url.startswith("https://"):
+        return "wss://" + url[len("https://"):] + "/ws"
+    return "ws://" + url[len("http://"):] + "/ws"
+
+
+class RoomDirectory:
+    def __init__(self, ttl=CLUSTER_ROOM_TTL, tick_budget_ms=CLUSTER_TICK_BUDGET_MS):
+        self.ttl = ttl
+        self.tick_budget_ms = tick_budget_ms
+        self.rooms = {}
+
+    def update(self, status, now=None):
+        now = time.monotonic() if now is None else now
+        room = parse_room_status(status)
+        previous = self.rooms.get(room["room"])
+        room["updated"] = now
+        room["assigned"] = 0
+        room["routed"] = previous["routed"] if previous else 0
+        self.rooms[room["room"]] = room
+        return room
+
+    def remove(self, room_id):
+        self.rooms.pop(room_id, None)
+
+    def live_rooms(self, now=None):
+        now = time.monotonic() if now is None else now
+        stale = [room_id for room_id, room in self.rooms.items() if now - room["updated"] > self.ttl]
+        for room_id in stale:
+            del self.rooms[room_id]
+        return self.rooms
+
+    def load(self, room):
+        load = (room["players"] + room["assigned"]) / room["max_players"]
+        if room["tick_ms"] > self.tick_budget_ms:
+            load += OVERLOADED_PENALTY
+        return load
+
+    def has_capacity(self, room):
+        return room["accepting"] and room["players"] + room["assigned"] < room["max_players"]
+
+    def pick(self, hint=None, now=None):
+        rooms = self.live_rooms(now)
+        room = rooms.get(hint) if isinstance(hint, str) else None
+        if room is None:
+            candidates = [room for room in rooms.values() if self.has_capacity(room)] or list(rooms.values())
+            if not candidates:
+                return None
+            room = min(candidates, key=self.load)
+
+        room["assigned"] += 1
+        room["routed"] += 1
+        return room
+
+    def describe(self, now=None):
+        now = time.monotonic() if now is None else now
+        rooms = []
+        for room in self.live_rooms(now).values():
+            entry = dict(room, age_s=round(now - room["updated"], 1))
+            del entry["updated"]
+            rooms.append(entry)
+        return rooms
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import urllib.request
+
+from snakevortex.config import CLUSTER_BACKENDS, CLUSTER_DISCOVERY, CLUSTER_HEARTBEAT_INTERVAL
+from snakevortex.cluster.directory import RoomDirectory
+
+STATUS_TIMEOUT = 2.0
+
+
+class DirectoryDiscovery:
+    accepts_registrations = True
+
+    def __init__(self, directory=None):
+        self.directory = directory or RoomDirectory()
+
+    def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class StaticDiscovery:
+    accepts_registrations = False
+
+    def __init__(self, urls, directory=None, interval=CLUSTER_HEARTBEAT_INTERVAL):
+        self.urls = [url.rstrip("/") for url in urls if url]
+        self.directory = directory or RoomDirectory()
+        self.interval = interval
+        self._poller = None
+
+    def start(self):
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll_loop())
+
+    async def close(self):
+        if self._poller is None:
+            return
+        self._poller.cancel()
+        try:
+            await self._poller
+        except asyncio.CancelledError:
+            pass
+        self._poller = None
+
+    async def poll(self):
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._fetch, url) for url in self.urls),
+            return_exceptions=True,
+        )
+        for status in results:
+            if isinstance(status, dict):
+                try:
+                    self.directory.update(status)
+                except (KeyError, TypeError, ValueError):
+                    pass
+
+    async def _poll_loop(self):
+        while True:
+            await self.poll()
+            await asyncio.sleep(self.interval)
+
+    def _fetch(self, url):
+        with urllib.request.urlopen(f"{url}/cluster/status", timeout=STATUS_TIMEOUT) as response:
+            return json.loads(response.read())
+
+
+DISCOVERY_BACKENDS = {
+    "directory": lambda: DirectoryDiscovery(),
+    "static": lambda: StaticDiscovery(CLUSTER_BACKENDS.split(",")),
+}
+
+
+def create_discovery(name=CLUSTER_DISCOVERY):
+    factory = DISCOVERY_BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown discovery backend: {name}")
+    return factory()
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+import urllib.request
+
+from snakevortex.config import (
+    CLUSTER_DIRECTORY_URL,
+    CLUSTER_HEARTBEAT_INTERVAL,
+    CLUSTER_NODE_ID,
+    CLUSTER_PUBLIC_URL,
+    CLUSTER_SECRET,
+)
+from snakevortex.game.game_state import MAX_PLAYERS, connected_clients, game_state, tick_stats
+from snakevortex.game.room import is_room_active
+from snakevortex.web.connection import traffic
+
+HEARTBEAT_TIMEOUT = 2.0
+
+
+class ClusterNode:
+    def __init__(
+        self,
+        node_id=CLUSTER_NODE_ID,
+        public_url=CLUSTER_PUBLIC_URL,
+        directory_url=CLUSTER_DIRECTORY_URL,
+        interval=CLUSTER_HEARTBEAT_INTERVAL,
+        secret=CLUSTER_SECRET,
+    ):
+        self.node_id = node_id
+        self.public_url = public_url.rstrip("/")
+        self.directory_url = directory_url.rstrip("/")
+        self.interval = interval
+        self.secret = secret
+        self.heartbeats = 0
+        self.heartbeat_failures = 0
+        self._last_bytes = traffic["bytes_sent"]
+        self._last_sample = time.monotonic()
+        self._bytes_per_second = 0.0
+        self._reporter = None
+
+    def status(self):
+        now = time.monotonic()
+        elapsed = now - self._last_sample
+        if elapsed >= 1.0:
+            self._bytes_per_second = (traffic["bytes_sent"] - self._last_bytes) / elapsed
+            self._last_bytes = traffic["bytes_sent"]
+            self._last_sample = now
+
+        players = len(game_state["players"])
+        return {
+            "room": self.node_id,
+            "url": self.public_url,
+            "players": players,
+            "max_players": MAX_PLAYERS,
+            "clients": len(connected_clients),
+            "tick_ms": tick_stats["tick_ms"],
+            "tick_interval_ms": tick_stats["tick_interval_ms"],
+            "bytes_per_second": round(self._bytes_per_second),
+            "accepting": players < MAX_PLAYERS,
+            "active": is_room_active(),
+        }
+
+    def start(self):
+        if self.directory_url and self._reporter is None:
+            self._reporter = asyncio.create_task(self._report_loop())
+
+    async def close(self):
+        if self._reporter is None:
+            return
+        self._reporter.cancel()
+        try:
+            await self._reporter
+        except asyncio.CancelledError:
+            pass
+        self._reporter = None
+
+    async def _report_loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self._post, self.status())
+                self.heartbeats += 1
+            except Exception as exc:
+                self.heartbeat_failures += 1
+                if self.heartbeat_failures == 1 or self.heartbeat_failures % 30 == 0:
+                    print(f"Room heartbeat to {self.directory_url} failed: {exc}")
+            await asyncio.sleep(self.interval)
+
+    def _post(self, status):
+        headers = {"Content-Type": "application/json"}
+        if self.secret:
+            headers["Authorization"] = f"Bearer {self.secret}"
+        request = urllib.request.Request(
+            f"{self.directory_url}/cluster/rooms",
+            data=json.dumps(status).encode("utf-8"),
+            headers=headers,
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=HEARTBEAT_TIMEOUT) as response:
+            response.read()
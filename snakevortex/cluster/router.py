@@ -0,0 +1,132 @@
+import asyncio
+from pathlib import Path
+
+import websockets
+from quart import Quart, abort, jsonify, request, websocket
+
+from snakevortex.cluster.directory import websocket_url
+from snakevortex.cluster.discovery import create_discovery
+from snakevortex.config import (
+    CLUSTER_SECRET,
+    MAX_WS_MESSAGE_SIZE,
+    RATE_LIMIT_REQUESTS,
+    RATE_LIMIT_WINDOW,
+    TRUSTED_PROXIES,
+    WS_HANDSHAKE_REQUESTS,
+    WS_HANDSHAKE_WINDOW,
+)
+from snakevortex.web.routes import register_page_routes
+from snakevortex.web.security import RateLimiter, carries_secret, client_address, is_same_origin
+from snakevortex.web.static_assets import StaticAssetPipeline
+
+UPSTREAM_OPEN_TIMEOUT = 5
+
+
+def is_cluster_member(headers, remote_addr, secret=CLUSTER_SECRET):
+    if secret:
+        return carries_secret(headers, secret)
+    return remote_addr in TRUSTED_PROXIES
+
+
+async def relay_frames(client, upstream):
+    async def client_to_room():
+        while True:
+            message = await client.receive()
+            if len(message) <= MAX_WS_MESSAGE_SIZE:
+                await upstream.send(message)
+
+    async def room_to_client():
+        async for message in upstream:
+            await client.send(message)
+
+    tasks = [asyncio.create_task(client_to_room()), asyncio.create_task(room_to_client())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def create_router(discovery=None):
+    base_dir = Path(__file__).resolve().parent.parent.parent
+    app = Quart(
+        __name__,
+        static_folder=str(base_dir / "static"),
+        template_folder=str(base_dir / "templates"),
+    )
+
+    discovery = discovery or create_discovery()
+    directory = discovery.directory
+    rate_limiter = RateLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW)
+    handshake_limiter = RateLimiter(WS_HANDSHAKE_REQUESTS, WS_HANDSHAKE_WINDOW)
+    assets = StaticAssetPipeline(app.static_folder).build()
+    register_page_routes(app, rate_limiter, assets)
+
+    @app.route("/cluster/rooms", methods=["POST"])
+    async def register_room():
+        if not discovery.accepts_registrations:
+            abort(404)
+        if not is_cluster_member(request.headers, request.remote_addr):
+            abort(403)
+
+        try:
+            directory.update(await request.get_json(silent=True))
+        except (KeyError, TypeError, ValueError):
+            abort(400)
+        return "", 204
+
+    @app.route("/cluster/rooms")
+    async def list_rooms():
+        return jsonify({"rooms": directory.describe()})
+
+    @app.websocket("/ws")
+    async def relay():
+        if not is_same_origin(websocket.headers):
+            return
+
+        client_ip = client_address(websocket.remote_addr, websocket.headers)
+        if not handshake_limiter.is_allowed(client_ip):
+            abort(429)
+
+        room = directory.pick(websocket.args.get("room"))
+        if room is None:
+            abort(503)
+
+        headers = {"X-Forwarded-For": client_ip}
+        if CLUSTER_SECRET:
+            headers["Authorization"] = f"Bearer {CLUSTER_SECRET}"
+
+        try:
+            upstream = await websockets.connect(
+                websocket_url(room),
+                additional_headers=headers,
+                compression=None,
+                max_size=None,
+                open_timeout=UPSTREAM_OPEN_TIMEOUT,
+            )
+        except (OSError, asyncio.TimeoutError, websockets.InvalidHandshake) as exc:
+            status = exc.response.status_code if isinstance(exc, websockets.InvalidStatus) else None
+            if status is not None and status < 500:
+                abort(429 if status == 429 else 502)
+            print(f"Room {room['room']} unreachable: {exc}")
+            directory.remove(room["room"])
+            abort(502)
+
+        try:
+            await websocket.accept()
+            await relay_frames(websocket._get_current_object(), upstream)
+        finally:
+            await upstream.close()
+
+    @app.before_serving
+    async def startup():
+        discovery.start()
+        asyncio.create_task(rate_limiter.run_expiry())
+        asyncio.create_task(handshake_limiter.run_expiry())
+
+    @app.after_serving
+    async def shutdown():
+        await discovery.close()
+
+    return app
@@ -1,8 +1,52 @@
+import os
+
 RATE_LIMIT_REQUESTS = 10
 RATE_LIMIT_WINDOW = 60
+RATE_LIMIT_MAX_ENTRIES = 10000
+RATE_LIMIT_EXPIRY_INTERVAL = 30
+WS_HANDSHAKE_REQUESTS = 20
+WS_HANDSHAKE_WINDOW = 60
+WS_MESSAGE_RATE = 30
+WS_MESSAGE_BURST = 60
 MAX_WS_MESSAGE_SIZE = 4096
 MIN_MOVE_INTERVAL_MS = 40
 PING_INTERVAL_MS = 800
+OUTBOUND_QUEUE_DEPTH = 8
+SNAPSHOT_MIN_INTERVAL_MS = 1000 / 30
+SNAPSHOT_MAX_INTERVAL_MS = 200
+NET_STATS_INTERVAL_MS = 2000
+RANK_UPDATE_INTERVAL_MS = 500
+WS_COMPRESSION_ENABLED = True
+WS_COMPRESSION_LEVEL = 6
+WS_COMPRESSION_WINDOW_BITS = 12
+WS_COMPRESSION_MEM_LEVEL = 5
+WS_COMPRESSION_THRESHOLD = 512
+WS_COMPRESSION_CONTEXT_TAKEOVER = False
+STORE_PATH = "data/snakevortex.sqlite3"
+STORE_FLUSH_INTERVAL = 2.0
+STORE_BATCH_SIZE = 256
+STORE_QUEUE_LIMIT = 10000
+STORE_LEADERBOARD_TTL = 10.0
+WORLD_SNAPSHOT_PATH = os.environ.get("SNAKEVORTEX_WORLD_SNAPSHOT", "data/world.snapshot")
+WORLD_SNAPSHOT_INTERVAL = 5.0
+WORLD_SNAPSHOT_MAX_AGE = 300
+RECLAIM_GRACE_MS = 20000
+RESUME_GRACE_MS = 10000
+STARTUP_BUDGET_MS = 50.0
 DEFAULT_PLAYER_COLOR = "#ff6b6b"
 SERVER_HOST = "0.0.0.0"
-SERVER_PORT = 8081
+SERVER_PORT = int(os.environ.get("SNAKEVORTEX_PORT", 8081))
+TRUSTED_PROXIES = tuple(
+    address.strip() for address in os.environ.get("SNAKEVORTEX_TRUSTED_PROXIES", "127.0.0.1,::1").split(",") if address.strip()
+)
+CLUSTER_NODE_ID = os.environ.get("SNAKEVORTEX_NODE_ID", "main")
+CLUSTER_PUBLIC_URL = os.environ.get("SNAKEVORTEX_PUBLIC_URL", f"http://127.0.0.1:{SERVER_PORT}")
+CLUSTER_DIRECTORY_URL = os.environ.get("SNAKEVORTEX_DIRECTORY_URL", "")
+CLUSTER_SECRET = os.environ.get("SNAKEVORTEX_CLUSTER_SECRET", "")
+CLUSTER_DISCOVERY = os.environ.get("SNAKEVORTEX_DISCOVERY", "directory")
+CLUSTER_BACKENDS = os.environ.get("SNAKEVORTEX_BACKENDS", "")
+CLUSTER_HEARTBEAT_INTERVAL = 2.0
+CLUSTER_ROOM_TTL = 6.0
+CLUSTER_TICK_BUDGET_MS = 12.0
+ROUTER_HOST = "0.0.0.0"
+ROUTER_PORT = int(os.environ.get("SNAKEVORTEX_ROUTER_PORT", 8080))
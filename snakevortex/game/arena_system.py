@@ -1,3 +1,4 @@
+import math
 import time
 from .game_state import game_state, WORLD_WIDTH, WORLD_HEIGHT
 from .utils import clamp
@@ -5,88 +6,184 @@ from .utils import clamp
 DEFAULT_SHRINK_DELAY_MS = 45000
 DEFAULT_SHRINK_DURATION_MS = 120000
 DEFAULT_MIN_SIZE = 750
+KEYFRAME_INTERVAL_MS = 1000
+SHRINK_EVENT_STEP = 8.0
+
+_bounds_listeners = []
+
+class Arena:
+    def __init__(self, now_ms, shrink_delay_ms=DEFAULT_SHRINK_DELAY_MS, shrink_duration_ms=DEFAULT_SHRINK_DURATION_MS, min_size=DEFAULT_MIN_SIZE):
+        self.start_time_ms = now_ms
+        self.shrink_delay_ms = shrink_delay_ms
+        self.shrink_duration_ms = shrink_duration_ms
+        self.min_size = float(min_size)
+        self.full_size = float(min(WORLD_WIDTH, WORLD_HEIGHT))
+        self.center_x = WORLD_WIDTH / 2.0
+        self.center_y = WORLD_HEIGHT / 2.0
+        self.active = False
+        self.phase = 'static'
+        self.progress = 0.0
+        self.size = self.full_size
+        self.bounds = self._bounds_for_size(self.full_size)
+        self.keyframes = self._build_keyframes()
+        self._event_bounds = self.bounds
+        self._wire = None
+
+    def _build_keyframes(self):
+        duration = max(1.0, float(self.shrink_duration_ms))
+        steps = max(1, int(math.ceil(duration / KEYFRAME_INTERVAL_MS)))
+        keyframes = []
+        for i in range(steps + 1):
+            offset = min(duration, float(i * KEYFRAME_INTERVAL_MS))
+            progress = offset / duration
+            keyframes.append((offset, self.full_size + (self.min_size - self.full_size) * progress))
+        return keyframes
+
+    def _bounds_for_size(self, size):
+        half = size / 2.0
+        return (
+            float(self.center_x - half),
+            float(self.center_y - half),
+            float(self.center_x + half),
+            float(self.center_y + half),
+        )
+
+    def size_at_offset(self, offset_ms):
+        if offset_ms <= 0:
+            return self.full_size
+        keyframes = self.keyframes
+        index = int(offset_ms // KEYFRAME_INTERVAL_MS)
+        if index >= len(keyframes) - 1:
+            return keyframes[-1][1]
+        start_offset, start_size = keyframes[index]
+        end_offset, end_size = keyframes[index + 1]
+        span = end_offset - start_offset
+        if span <= 0:
+            return end_size
+        return start_size + (end_size - start_size) * ((offset_ms - start_offset) / span)
+
+    def bounds_at(self, now_ms):
+        if not self.active:
+            return self.bounds
+        offset = now_ms - (self.start_time_ms + self.shrink_delay_ms)
+        return self._bounds_for_size(self.size_at_offset(offset))
+
+    def time_to_shrink_ms(self, now_ms):
+        if not self.active:
+            return self.shrink_delay_ms
+        return (self.start_time_ms + self.shrink_delay_ms) - now_ms
+
+    def reset(self, now_ms):
+        if not self.active and self.size == self.full_size:
+            return
+        self.start_time_ms = now_ms
+        self.active = False
+        self.phase = 'static'
+        self.progress = 0.0
+        self._set_size(self.full_size)
+
+    def update(self, now_ms):
+        if not self.active:
+            self.active = True
+            self.start_time_ms = now_ms
+            self._wire = None
+
+        offset = now_ms - (self.start_time_ms + self.shrink_delay_ms)
+        if offset <= 0:
+            if self.phase != 'static':
+                self.phase = 'static'
+                self.progress = 0.0
+                self._set_size(self.full_size)
+            return
+
+        if self.phase == 'final':
+            return
+
+        duration = max(1.0, float(self.shrink_duration_ms))
+        self.progress = clamp(offset / duration, 0.0, 1.0)
+        self.phase = 'shrinking' if self.progress < 1.0 else 'final'
+        self._set_size(self.size_at_offset(offset))
+
+    def _set_size(self, size):
+        self._wire = None
+        if size == self.size:
+            return
+        self.size = size
+        self.bounds = self._bounds_for_size(size)
+
+        previous = self._event_bounds
+        grown = self.bounds[2] - self.bounds[0] > previous[2] - previous[0]
+        shrunk_by = (previous[2] - previous[0]) - (self.bounds[2] - self.bounds[0])
+        if grown or shrunk_by >= SHRINK_EVENT_STEP or self.phase == 'final':
+            self._event_bounds = self.bounds
+            kind = 'grow' if grown else 'shrink'
+            for listener in _bounds_listeners:
+                listener(kind, previous, self.bounds)
+
+    def to_wire(self):
+        if self._wire is None:
+            min_x, min_y, max_x, max_y = self.bounds
+            self._wire = {
+                'start_time_ms': self.start_time_ms,
+                'shrink_delay_ms': self.shrink_delay_ms,
+                'shrink_duration_ms': self.shrink_duration_ms,
+                'min_size': self.min_size,
+                'active': self.active,
+                'phase': self.phase,
+                'progress': self.progress,
+                'min_x': min_x,
+                'min_y': min_y,
+                'max_x': max_x,
+                'max_y': max_y,
+                'size': self.size
+            }
+        return self._wire
+
+def on_bounds_change(listener):
+    if listener not in _bounds_listeners:
+        _bounds_listeners.append(listener)
+    return listener
+
+def get_arena():
+    arena = game_state.get('arena')
+    if arena is None:
+        init_arena()
+        arena = game_state['arena']
+    return arena
 
 def init_arena():
     if 'arena' in game_state:
         return
     now_ms = time.time() * 1000
-    game_state['arena'] = {
-        'start_time_ms': now_ms,
-        'shrink_delay_ms': DEFAULT_SHRINK_DELAY_MS,
-        'shrink_duration_ms': DEFAULT_SHRINK_DURATION_MS,
-        'min_size': DEFAULT_MIN_SIZE,
-        'active': False,
-        'phase': 'static',
-        'progress': 0.0,
-        'min_x': 0.0,
-        'min_y': 0.0,
-        'max_x': float(WORLD_WIDTH),
-        'max_y': float(WORLD_HEIGHT),
-        'size': float(min(WORLD_WIDTH, WORLD_HEIGHT))
-    }
+    game_state['arena'] = Arena(now_ms)
     update_arena(now_ms)
 
 def update_arena(now_ms):
-    arena = game_state.get('arena')
-    if not arena:
-        init_arena()
-        arena = game_state['arena']
+    arena = get_arena()
 
     active_players = any(p.get('alive') for p in game_state.get('players', {}).values())
     if not active_players:
-        arena['active'] = False
-        arena['phase'] = 'static'
-        arena['progress'] = 0.0
-        arena['size'] = float(min(WORLD_WIDTH, WORLD_HEIGHT))
-        arena['min_x'] = 0.0
-        arena['min_y'] = 0.0
-        arena['max_x'] = float(WORLD_WIDTH)
-        arena['max_y'] = float(WORLD_HEIGHT)
-        arena['start_time_ms'] = now_ms
+        arena.reset(now_ms)
         return
 
-    if not arena.get('active'):
-        arena['active'] = True
-        arena['start_time_ms'] = now_ms
-
-    start = arena.get('start_time_ms', now_ms)
-    delay = arena.get('shrink_delay_ms', DEFAULT_SHRINK_DELAY_MS)
-    duration = arena.get('shrink_duration_ms', DEFAULT_SHRINK_DURATION_MS)
-    min_size = float(arena.get('min_size', DEFAULT_MIN_SIZE))
-
-    full_size = float(min(WORLD_WIDTH, WORLD_HEIGHT))
-    t = now_ms - (start + delay)
-
-    if t <= 0:
-        progress = 0.0
-        phase = 'static'
-    else:
-        progress = clamp(t / max(1.0, float(duration)), 0.0, 1.0)
-        phase = 'shrinking' if progress < 1.0 else 'final'
-
-    size = full_size + (min_size - full_size) * progress
-    cx = WORLD_WIDTH / 2.0
-    cy = WORLD_HEIGHT / 2.0
-
-    half = size / 2.0
-    min_x = cx - half
-    max_x = cx + half
-    min_y = cy - half
-    max_y = cy + half
-
-    arena['phase'] = phase
-    arena['progress'] = progress
-    arena['size'] = size
-    arena['min_x'] = float(min_x)
-    arena['max_x'] = float(max_x)
-    arena['min_y'] = float(min_y)
-    arena['max_y'] = float(max_y)
+    arena.update(now_ms)
+
+def restore_arena(state, offset_ms):
+    arena = Arena(state['start_time_ms'] + offset_ms, state['shrink_delay_ms'], state['shrink_duration_ms'], state['min_size'])
+    arena.active = state['active']
+    arena.phase = state['phase']
+    arena.progress = state['progress']
+    arena.size = state['size']
+    arena.bounds = arena._bounds_for_size(arena.size)
+    arena._event_bounds = arena.bounds
+    game_state['arena'] = arena
+    return arena
 
 def get_arena_bounds():
     arena = game_state.get('arena')
     if not arena:
         return 0.0, 0.0, float(WORLD_WIDTH), float(WORLD_HEIGHT)
-    return arena['min_x'], arena['min_y'], arena['max_x'], arena['max_y']
+    return arena.bounds
 
 def clamp_to_arena(x, y, margin=0.0):
     min_x, min_y, max_x, max_y = get_arena_bounds()
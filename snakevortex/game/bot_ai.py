@@ -5,6 +5,9 @@ import uuid
 from .game_state import game_state, INITIAL_SNAKE_LENGTH, get_nearby_cells
 from .snake_logic import create_snake
 from .utils import find_safe_spawn_position, distance_squared, normalize_angle
+from .arena_system import get_arena_bounds
+from .name_index import index_entity, is_name_taken, get_entity
+from .head_index import nearest_heads, get_head
 
 BOT_NAMES = [
     "Viper", "Anaconda", "Python", "Cobra", "Boa",
@@ -43,29 +46,53 @@ power_food_cache = {'data': [], 'timestamp': 0}
 _bot_decision_cache = {}
 _pathfinding_cache = {}
 _danger_cache = {'bucket': -1, 'data': {}}
+_trajectory_cache = {}
+_rollout_cache = {}
 MAX_CACHE_SIZE = 1000
 
+TICK_MS = 1000 / 60
+ROLLOUT_STEPS = 6
+ROLLOUT_STEP_TICKS = 8
+ROLLOUT_NODE_BUDGET = 48
+ROLLOUT_DEPTH_DECAY = 0.85
+ROLLOUT_CACHE_MS = 120
+ROLLOUT_CELL_SIZE = 16
+ROLLOUT_ANGLE_BUCKETS = 128
+HUNT_CANDIDATES = 4
+THREAT_RADIUS = 220
+THREAT_LENGTH_MARGIN = 5
+
+BOT_TIERS = {
+    'reactive': {'planner': False, 'hunts': False, 'node_budget': 0, 'cost_ms': 0.01},
+    'standard': {'planner': True, 'hunts': False, 'node_budget': ROLLOUT_NODE_BUDGET // 2, 'cost_ms': 0.03},
+    'expert': {'planner': True, 'hunts': True, 'node_budget': ROLLOUT_NODE_BUDGET, 'cost_ms': 0.06}
+}
+TIER_ORDER = ('expert', 'standard', 'reactive')
+DEFAULT_BOT_TIER = 'expert'
+AI_COST_SMOOTHING = 0.05
+
+_ai_accounting = {
+    'tier_ms': {tier: 0.0 for tier in BOT_TIERS},
+    'tier_cost': {tier: settings['cost_ms'] for tier, settings in BOT_TIERS.items()},
+    'tick_ms': 0.0
+}
+
 def _get_arena_bounds():
-    arena = game_state.get('arena')
-    if arena and all(k in arena for k in ('min_x', 'min_y', 'max_x', 'max_y')):
-        return arena['min_x'], arena['min_y'], arena['max_x'], arena['max_y']
-    return 0, 0, 2000, 2000
+    return get_arena_bounds()
 
 def _get_arena_center():
-    min_x, min_y, max_x, max_y = _get_arena_bounds()
+    min_x, min_y, max_x, max_y = get_arena_bounds()
     return (min_x + max_x) / 2.0, (min_y + max_y) / 2.0
 
 def _arena_phase():
-    arena = game_state.get('arena', {})
-    return arena.get('phase', 'static')
+    arena = game_state.get('arena')
+    return arena.phase if arena else 'static'
 
 def _arena_time_to_shrink_ms(now_ms):
-    arena = game_state.get('arena', {})
-    start = arena.get('start_time_ms')
-    delay = arena.get('shrink_delay_ms')
-    if start is None or delay is None:
+    arena = game_state.get('arena')
+    if not arena:
         return None
-    return (start + delay) - now_ms
+    return arena.time_to_shrink_ms(now_ms)
 
 def generate_creative_name():
     patterns = [
@@ -79,25 +106,17 @@ def generate_creative_name():
     return random.choice(patterns)()
 
 def get_unique_bot_name():
-    used_names = set()
-    
-    for player in game_state['players'].values():
-        used_names.add(player['name'].lower())
-    
-    for bot in game_state['bots'].values():
-        used_names.add(bot['name'].lower())
-    
     max_attempts = 50
     for _ in range(max_attempts):
         name = generate_creative_name()
-        if name.lower() not in used_names:
+        if not is_name_taken(name):
             return name
     
     suffix = random.randint(100, 999)
     base_name = random.choice(HUMAN_NAMES)
     return f"{base_name}{suffix}"
 
-def create_bot():
+def create_bot(tier=DEFAULT_BOT_TIER):
     bot_id = str(uuid.uuid4())
     start_pos = find_safe_spawn_position()
     now_ms = time.time() * 1000
@@ -127,7 +146,7 @@ def create_bot():
         'decision_cooldown': 0,
         'bot_type': bot_type,
         'personality': personality,
-        'target_player': None,
+        'target_id': None,
         'hunt_duration': 0,
         'mistake_chance': personality['mistake_rate'],
         'reaction_delay': personality['reaction_time'],
@@ -135,10 +154,13 @@ def create_bot():
         'hunting_range': personality['hunt_range'],
         'intent': {'type': 'roam', 'until_ms': 0, 'target': None},
         'intent_seed': random.random(),
-        'last_intent_change': 0
+        'last_intent_change': 0,
+        'tier': tier,
+        'cpu_ms': 0.0
     }
     
     game_state['bots'][bot_id] = bot
+    index_entity(bot)
     return bot
 
 def generate_personality(bot_type):
@@ -210,10 +232,90 @@ def update_food_cache():
         power_food_cache['data'] = [power for power in game_state['power_food'] if power.get('scale', 1.0) > 0.5]
         power_food_cache['timestamp'] = current_time
 
+def bot_tier_name(bot):
+    tier = bot.get('tier')
+    return tier if tier in BOT_TIERS else DEFAULT_BOT_TIER
+
+def get_bot_tier(bot):
+    return BOT_TIERS[bot_tier_name(bot)]
+
+def count_bot_tiers(bots):
+    counts = {tier: 0 for tier in BOT_TIERS}
+    for bot in bots:
+        counts[bot_tier_name(bot)] += 1
+    return counts
+
+def account_bot_cpu(bot, elapsed_ms):
+    bot['cpu_ms'] = bot.get('cpu_ms', 0.0) + elapsed_ms
+    _ai_accounting['tier_ms'][bot_tier_name(bot)] += elapsed_ms
+
+def finish_ai_tick():
+    counts = count_bot_tiers(bot for bot in game_state['bots'].values() if bot['alive'])
+    tick_ms = 0.0
+    for tier, spent in _ai_accounting['tier_ms'].items():
+        tick_ms += spent
+        if counts[tier]:
+            cost = _ai_accounting['tier_cost'][tier]
+            _ai_accounting['tier_cost'][tier] = cost + (spent / counts[tier] - cost) * AI_COST_SMOOTHING
+        _ai_accounting['tier_ms'][tier] = 0.0
+
+    _ai_accounting['tick_ms'] += (tick_ms - _ai_accounting['tick_ms']) * AI_COST_SMOOTHING
+
+def projected_ai_ms(bots):
+    return sum(_ai_accounting['tier_cost'][bot_tier_name(bot)] for bot in bots)
+
+def choose_bot_tier(bots, budget_ms, min_experts):
+    if count_bot_tiers(bots)['expert'] < min_experts:
+        return 'expert'
+
+    projected = projected_ai_ms(bots)
+    for tier in TIER_ORDER:
+        if projected + _ai_accounting['tier_cost'][tier] <= budget_ms:
+            return tier
+    return TIER_ORDER[-1]
+
+def rebalance_bot_tiers(bots, budget_ms, min_experts):
+    projected = projected_ai_ms(bots)
+    experts = count_bot_tiers(bots)['expert']
+
+    if projected > budget_ms:
+        for current, lower in (('standard', 'reactive'), ('expert', 'standard')):
+            if current == 'expert' and experts <= min_experts:
+                continue
+            for bot in bots:
+                if bot_tier_name(bot) == current:
+                    bot['tier'] = lower
+                    return
+        return
+
+    for current, higher in (('reactive', 'standard'), ('standard', 'expert')):
+        extra = _ai_accounting['tier_cost'][higher] - _ai_accounting['tier_cost'][current]
+        if projected + extra > budget_ms * 0.8:
+            continue
+        for bot in bots:
+            if bot_tier_name(bot) == current:
+                bot['tier'] = higher
+                return
+
+def get_ai_stats():
+    counts = count_bot_tiers(bot for bot in game_state['bots'].values() if bot['alive'])
+    return {
+        'ai_ms': round(_ai_accounting['tick_ms'], 3),
+        'tiers': {
+            tier: {'bots': counts[tier], 'cost_ms': round(_ai_accounting['tier_cost'][tier], 4)}
+            for tier in TIER_ORDER
+        }
+    }
+
 def bot_ai(bot):
     if not bot['alive'] or not bot['snake']:
         return
-    
+
+    started = time.perf_counter()
+    decide_bot_direction(bot)
+    account_bot_cpu(bot, (time.perf_counter() - started) * 1000)
+
+def decide_bot_direction(bot):
     current_time = time.time() * 1000
     head = bot['snake'][0]
     
@@ -235,7 +337,10 @@ def bot_ai(bot):
         bot['cached_nearby_food'] = get_nearby_food_spatial(head, 220)
         bot['last_food_scan'] = current_time
     
-    target_direction = calculate_target_direction(bot, head, current_time)
+    if get_bot_tier(bot)['planner']:
+        target_direction = calculate_target_direction(bot, head, current_time)
+    else:
+        target_direction = reactive_direction(bot, head, current_time)
     
     if len(_bot_decision_cache) > MAX_CACHE_SIZE:
         oldest_keys = sorted(_bot_decision_cache.keys(), key=lambda k: _bot_decision_cache[k][0])[:MAX_CACHE_SIZE//2]
@@ -262,15 +367,15 @@ def calculate_target_direction(bot, head, current_time):
         bot['intent'] = choose_intent(bot, head, current_time)
         intent = bot['intent']
     
-    target_player = find_hunting_target(bot, head)
+    target_player = find_hunting_target(bot, head) if get_bot_tier(bot)['hunts'] else None
     if target_player and random.random() < personality['chase_priority']:
-        bot['target_player'] = target_player['name']
+        bot['target_id'] = target_player['id']
         bot['hunt_duration'] = current_time + random.randint(3000, 8000)
-        bot['intent'] = {'type': 'hunt', 'until_ms': current_time + min(2500, personality.get('commitment_ms', 1200)), 'target': target_player['name']}
+        bot['intent'] = {'type': 'hunt', 'until_ms': current_time + min(2500, personality.get('commitment_ms', 1200)), 'target': target_player['id']}
         return plan_direction(bot, head, current_time, bot['intent'])
     
-    if bot.get('target_player') and current_time < bot.get('hunt_duration', 0):
-        current_target = find_player_by_name(bot['target_player'])
+    if bot.get('target_id') and current_time < bot.get('hunt_duration', 0):
+        current_target = game_state['players'].get(bot['target_id'])
         if current_target and current_target['alive']:
             target_distance = math.sqrt(distance_squared(head, current_target['snake'][0]))
             
@@ -282,9 +387,9 @@ def calculate_target_direction(bot, head, current_time):
                 bot['desired_speed'] = 2.0
                 bot['speed'] = 2.0
                 
-            return plan_direction(bot, head, current_time, {'type': 'hunt', 'until_ms': bot.get('hunt_duration', current_time + 1000), 'target': bot['target_player']})
+            return plan_direction(bot, head, current_time, {'type': 'hunt', 'until_ms': bot.get('hunt_duration', current_time + 1000), 'target': bot['target_id']})
     
-    bot['target_player'] = None
+    bot['target_id'] = None
     bot['desired_speed'] = 2.0
     bot['speed'] = 2.0
 
@@ -329,12 +434,27 @@ def choose_intent(bot, head, now_ms):
     to_center = math.atan2(center_y - head['y'], center_x - head['x'])
     return {'type': 'roam', 'until_ms': now_ms + personality.get('commitment_ms', 1200), 'target': {'angle': to_center + roam_bias}}
 
+def reactive_direction(bot, head, current_time):
+    intent = bot.get('intent')
+    if not intent or intent.get('type') == 'hunt' or current_time >= intent.get('until_ms', 0):
+        bot['intent'] = choose_intent(bot, head, current_time)
+        intent = bot['intent']
+    bot['target_id'] = None
+    bot['desired_speed'] = 2.0
+    return intent_direction(bot, head, intent)
+
 def plan_direction(bot, head, now_ms, intent):
+    base_direction = intent_direction(bot, head, intent)
+    candidate_directions = build_candidate_directions(bot, base_direction)
+    best_direction = select_best_direction(bot, head, now_ms, intent, candidate_directions)
+    return best_direction
+
+def intent_direction(bot, head, intent):
     intent_type = intent.get('type', 'roam')
     base_direction = bot.get('target_direction', bot['direction'])
 
     if intent_type == 'hunt':
-        target = find_player_by_name(intent.get('target')) or find_bot_by_name(intent.get('target'))
+        target = get_entity(intent.get('target'))
         if target and target.get('alive') and target.get('snake'):
             base_direction = calculate_hunting_direction(bot, head, target)
 
@@ -348,9 +468,7 @@ def plan_direction(bot, head, now_ms, intent):
         if angle is not None:
             base_direction = angle
 
-    candidate_directions = build_candidate_directions(bot, base_direction)
-    best_direction = select_best_direction(bot, head, now_ms, intent, candidate_directions)
-    return best_direction
+    return base_direction
 
 def pick_food_target(bot, head, foods):
     if not foods:
@@ -386,57 +504,49 @@ def build_candidate_directions(bot, base_direction):
     candidates.append(base_direction + math.pi)
     return candidates
 
+def find_nearest_threat(bot, head):
+    def is_threat(entity):
+        return entity['alive'] and entity['length'] >= bot['length'] + THREAT_LENGTH_MARGIN
+
+    found = nearest_heads(head['x'], head['y'], 1, max_radius=THREAT_RADIUS, exclude_id=bot['id'], predicate=is_threat)
+    if not found:
+        return None
+    entry = found[0][1]
+    return {'x': entry[0], 'y': entry[1]}
+
 def select_best_direction(bot, head, now_ms, intent, candidates):
-    scored = []
-    for direction in candidates:
-        scored.append((score_direction(bot, head, now_ms, intent, direction), direction))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    if not scored:
+    threat = find_nearest_threat(bot, head)
+    ranked = sorted(((intent_score(bot, head, now_ms, intent, direction, threat), direction) for direction in candidates), key=lambda x: x[0], reverse=True)
+    if not ranked:
         return bot.get('target_direction', bot['direction'])
 
+    horizon = rollout_horizon(now_ms)
+    budget = [get_bot_tier(bot)['node_budget']]
+    scored = []
+    best_total = None
+    for upper_bound, direction in ranked:
+        if best_total is not None and best_total >= upper_bound:
+            break
+        hazard = rollout_hazard(bot, head, now_ms, direction, horizon, budget)
+        if hazard is None:
+            break
+        total = upper_bound + hazard
+        scored.append((total, direction))
+        if best_total is None or total > best_total:
+            best_total = total
+
+    scored.sort(key=lambda x: x[0], reverse=True)
     if random.random() < bot['mistake_chance'] * 0.35 and len(scored) > 1:
         return scored[min(2, len(scored) - 1)][1]
     return scored[0][1]
 
-def score_direction(bot, head, now_ms, intent, direction):
-    min_x, min_y, max_x, max_y = _get_arena_bounds()
+def intent_score(bot, head, now_ms, intent, direction, threat=None):
     center_x, center_y = _get_arena_center()
-
-    dx = math.cos(direction)
-    dy = math.sin(direction)
-
-    speed = float(bot.get('desired_speed', bot.get('speed', 2.0)))
-    lookahead = 5
-    step = max(14.0, speed * 14.0)
-
-    risk = bot['personality'].get('risk_tolerance', 0.5)
-    arena_awareness = bot['personality'].get('arena_awareness', 0.9)
-    phase = _arena_phase()
-
-    margin = 55.0 + (1.0 - risk) * 35.0
-    if phase == 'shrinking':
-        margin += 40.0 * arena_awareness
-
     score = 0.0
 
     turn_cost = abs(normalize_angle(direction - bot['direction']))
     score -= turn_cost * 14.0
 
-    for i in range(1, lookahead + 1):
-        px = head['x'] + dx * step * i
-        py = head['y'] + dy * step * i
-
-        if px < min_x or px > max_x or py < min_y or py > max_y:
-            return -1e9
-
-        edge_dist = min(px - min_x, max_x - px, py - min_y, max_y - py)
-        if edge_dist < margin:
-            score -= (margin - edge_dist) * (7.0 + 6.0 * arena_awareness)
-
-        danger = collision_danger(px, py, bot['id'], now_ms)
-        if danger > 0:
-            score -= danger * (11.0 + (1.0 - risk) * 9.0)
-
     intent_type = intent.get('type', 'roam')
 
     if intent_type in ('food', 'roam'):
@@ -451,8 +561,7 @@ def score_direction(bot, head, now_ms, intent, direction):
         score += target_alignment_score(head, direction, {'x': center_x, 'y': center_y}) * 65.0
 
     if intent_type == 'hunt':
-        target_name = intent.get('target')
-        target = find_player_by_name(target_name) or find_bot_by_name(target_name)
+        target = get_entity(intent.get('target'))
         if target and target.get('alive') and target.get('snake'):
             score += target_alignment_score(head, direction, target['snake'][0]) * 70.0
 
@@ -460,9 +569,127 @@ def score_direction(bot, head, now_ms, intent, direction):
     if time_to_shrink is not None and time_to_shrink < 8000:
         score += target_alignment_score(head, direction, {'x': center_x, 'y': center_y}) * 35.0
 
+    if threat is not None:
+        score -= target_alignment_score(head, direction, threat) * 60.0 * (1.0 - bot['personality'].get('risk_tolerance', 0.5))
+
     score += random.uniform(-1.3, 1.3)
     return score
 
+def rollout_horizon(now_ms):
+    arena = game_state.get('arena')
+    horizon = []
+    for step in range(1, ROLLOUT_STEPS + 1):
+        if arena:
+            horizon.append(arena.bounds_at(now_ms + step * ROLLOUT_STEP_TICKS * TICK_MS))
+        else:
+            horizon.append(_get_arena_bounds())
+    return horizon
+
+def bot_turn_rate(bot):
+    base_turn_rate = 0.12
+    
+    if bot['bot_type'] == 'hunter':
+        max_turn_rate = base_turn_rate * 1.2
+    elif bot['bot_type'] == 'aggressive':
+        max_turn_rate = base_turn_rate * 1.1
+    elif bot['bot_type'] == 'defensive':
+        max_turn_rate = base_turn_rate * 0.8
+    else:
+        max_turn_rate = base_turn_rate
+    
+    if bot.get('target_id') and 'speed' in bot.get('powers', {}):
+        max_turn_rate *= 1.3
+
+    return max_turn_rate
+
+def _angle_bucket(angle):
+    return int(round((angle % (2 * math.pi)) / (2 * math.pi) * ROLLOUT_ANGLE_BUCKETS)) % ROLLOUT_ANGLE_BUCKETS
+
+def get_trajectory(turn, speed, turn_rate):
+    key = (_angle_bucket(turn), round(speed * 4), round(turn_rate * 200))
+    trajectory = _trajectory_cache.get(key)
+    if trajectory is not None:
+        return trajectory
+
+    remaining = normalize_angle(key[0] * 2 * math.pi / ROLLOUT_ANGLE_BUCKETS)
+    step_speed = key[1] / 4
+    step_turn = key[2] / 200
+    heading = 0.0
+    x = 0.0
+    y = 0.0
+    points = []
+    for _ in range(ROLLOUT_STEPS):
+        for _ in range(ROLLOUT_STEP_TICKS):
+            delta = max(-step_turn, min(step_turn, remaining))
+            heading += delta
+            remaining -= delta
+            x += math.cos(heading) * step_speed
+            y += math.sin(heading) * step_speed
+        points.append((x, y))
+
+    trajectory = tuple(points)
+    if len(_trajectory_cache) > MAX_CACHE_SIZE * 4:
+        _trajectory_cache.clear()
+    _trajectory_cache[key] = trajectory
+    return trajectory
+
+def rollout_hazard(bot, head, now_ms, direction, horizon, budget):
+    speed = float(bot.get('desired_speed', bot.get('speed', 2.0)))
+    heading = bot['direction']
+    cache_key = (
+        bot['id'],
+        int(head['x'] // ROLLOUT_CELL_SIZE),
+        int(head['y'] // ROLLOUT_CELL_SIZE),
+        _angle_bucket(heading),
+        _angle_bucket(direction),
+        round(speed * 4)
+    )
+    cached = _rollout_cache.get(cache_key)
+    if cached is not None and now_ms - cached[0] < ROLLOUT_CACHE_MS:
+        return cached[1]
+    if budget[0] < ROLLOUT_STEPS:
+        return None
+
+    risk = bot['personality'].get('risk_tolerance', 0.5)
+    arena_awareness = bot['personality'].get('arena_awareness', 0.9)
+    margin = 55.0 + (1.0 - risk) * 35.0
+    if _arena_phase() == 'shrinking':
+        margin += 40.0 * arena_awareness
+    edge_weight = 7.0 + 6.0 * arena_awareness
+    danger_weight = 11.0 + (1.0 - risk) * 9.0
+
+    cos_h = math.cos(heading)
+    sin_h = math.sin(heading)
+    trajectory = get_trajectory(direction - heading, speed, bot_turn_rate(bot))
+
+    hazard = 0.0
+    weight = 1.0
+    for step, (fx, fy) in enumerate(trajectory):
+        budget[0] -= 1
+
+        px = head['x'] + fx * cos_h - fy * sin_h
+        py = head['y'] + fx * sin_h + fy * cos_h
+        min_x, min_y, max_x, max_y = horizon[step]
+
+        if px < min_x or px > max_x or py < min_y or py > max_y:
+            hazard = -1e9 * weight
+            break
+
+        edge_dist = min(px - min_x, max_x - px, py - min_y, max_y - py)
+        if edge_dist < margin:
+            hazard -= (margin - edge_dist) * edge_weight * weight
+
+        danger = collision_danger(px, py, bot['id'], now_ms)
+        if danger > 0:
+            hazard -= danger * danger_weight * weight
+
+        weight *= ROLLOUT_DEPTH_DECAY
+
+    if len(_rollout_cache) > MAX_CACHE_SIZE * 4:
+        _rollout_cache.clear()
+    _rollout_cache[cache_key] = (now_ms, hazard)
+    return hazard
+
 def collision_danger(x, y, bot_id, now_ms=None):
     if now_ms is None:
         now_ms = time.time() * 1000
@@ -550,33 +777,23 @@ def find_hunting_target(bot, head):
         return None
     
     hunting_range = bot['hunting_range']
+    hunts_bots = bot['bot_type'] in ['hunter', 'aggressive'] and bot['length'] > 12
     best_target = None
     best_score = 0
-    
-    all_targets = []
-    
-    for player in game_state['players'].values():
-        if player['alive'] and player['snake']:
-            all_targets.append(('player', player))
-    
-    if bot['bot_type'] in ['hunter', 'aggressive'] and bot['length'] > 12:
-        for other_bot in game_state['bots'].values():
-            if (other_bot['alive'] and other_bot['snake'] and 
-                other_bot['id'] != bot['id'] and other_bot['length'] < bot['length'] - 3):
-                all_targets.append(('bot', other_bot))
-    
-    for target_type, target in all_targets:
-        target_head = target['snake'][0]
-        distance = math.sqrt(distance_squared(head, target_head))
-        
-        if distance > hunting_range:
-            continue
-        
+
+    def is_prey(target):
+        if not target['alive'] or bot['length'] - target['length'] < -5:
+            return False
+        if target['id'] in game_state['bots']:
+            return hunts_bots and target['length'] < bot['length'] - 3
+        return True
+    
+    candidates = nearest_heads(head['x'], head['y'], HUNT_CANDIDATES, max_radius=hunting_range, exclude_id=bot['id'], predicate=is_prey)
+    for dist_sq, entry in candidates:
+        target_type = entry[3]
+        target = entry[4]
         size_advantage = bot['length'] - target['length']
-        if size_advantage < -5:
-            continue
-        
-        score = calculate_hunting_score(bot, target, distance, size_advantage)
+        score = calculate_hunting_score(bot, target, math.sqrt(dist_sq), size_advantage)
         
         if target_type == 'player':
             score *= 1.5
@@ -626,9 +843,12 @@ def calculate_intercept_direction(bot, head, target):
         return math.atan2(target_head['y'] - head['y'], target_head['x'] - head['x'])
     
     target_head = target['snake'][0]
-    target_neck = target['snake'][1]
-    
-    target_direction = math.atan2(target_head['y'] - target_neck['y'], target_head['x'] - target_neck['x'])
+    indexed = get_head(target['id'])
+    if indexed is not None:
+        target_direction = indexed[2]
+    else:
+        target_neck = target['snake'][1]
+        target_direction = math.atan2(target_head['y'] - target_neck['y'], target_head['x'] - target_neck['x'])
     target_speed = target.get('speed', 2.0)
     
     predict_time = 0.5
@@ -637,18 +857,6 @@ def calculate_intercept_direction(bot, head, target):
     
     return math.atan2(predicted_y - head['y'], predicted_x - head['x'])
 
-def find_player_by_name(name):
-    for player in game_state['players'].values():
-        if player['name'] == name:
-            return player
-    return None
-
-def find_bot_by_name(name):
-    for bot in game_state['bots'].values():
-        if bot['name'] == name:
-            return bot
-    return None
-
 def update_bot_direction(bot):
     angle_diff = bot['target_direction'] - bot['direction']
     
@@ -657,22 +865,7 @@ def update_bot_direction(bot):
     while angle_diff < -math.pi:
         angle_diff += 2 * math.pi
     
-    base_turn_rate = 0.12
-    
-    if bot['bot_type'] == 'hunter':
-        max_turn_rate = base_turn_rate * 1.2
-    elif bot['bot_type'] == 'aggressive':
-        max_turn_rate = base_turn_rate * 1.1
-    elif bot['bot_type'] == 'defensive':
-        max_turn_rate = base_turn_rate * 0.8
-    else:
-        max_turn_rate = base_turn_rate
-    
-    if bot.get('target_player') and 'speed' in bot.get('powers', {}):
-        max_turn_rate *= 1.3
-    
-    human_variance = random.uniform(0.8, 1.2)
-    max_turn_rate *= human_variance
+    max_turn_rate = bot_turn_rate(bot) * random.uniform(0.8, 1.2)
     
     if abs(angle_diff) > max_turn_rate:
         bot['direction'] += max_turn_rate if angle_diff > 0 else -max_turn_rate
@@ -824,6 +1017,10 @@ def clear_bot_caches():
     for key in expired_pathfinding_keys:
         del _pathfinding_cache[key]
     
+    expired_rollout_keys = [k for k, (cache_time, _) in _rollout_cache.items() if current_time - cache_time > ROLLOUT_CACHE_MS]
+    for key in expired_rollout_keys:
+        del _rollout_cache[key]
+    
     if len(_bot_decision_cache) > MAX_CACHE_SIZE * 2:
         _bot_decision_cache.clear()
     
@@ -1,6 +1,7 @@
 import time
 from .game_state import game_state, get_nearby_cells
 from .utils import distance_squared
+from .arena_system import get_arena_bounds
 
 def check_collision(snake, entity_id, entity_type):
     if not snake or len(snake) == 0:
@@ -8,14 +9,7 @@ def check_collision(snake, entity_id, entity_type):
     
     head = snake[0]
     
-    arena = game_state.get('arena')
-    if arena and all(k in arena for k in ('min_x', 'min_y', 'max_x', 'max_y')):
-        min_x = float(arena['min_x'])
-        min_y = float(arena['min_y'])
-        max_x = float(arena['max_x'])
-        max_y = float(arena['max_y'])
-    else:
-        min_x, min_y, max_x, max_y = 0.0, 0.0, 2000.0, 2000.0
+    min_x, min_y, max_x, max_y = get_arena_bounds()
 
     if head['x'] < min_x or head['x'] > max_x or head['y'] < min_y or head['y'] > max_y:
         return True
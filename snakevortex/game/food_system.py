@@ -1,6 +1,6 @@
 import random
 import time
-from .game_state import game_state, WORLD_WIDTH, WORLD_HEIGHT, get_random_position_cached
+from .game_state import game_state, WORLD_WIDTH, WORLD_HEIGHT, get_random_position_cached, random_positions
 from .arena_system import clamp_to_arena
 
 FOOD_COLORS = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#f9ca24', '#f0932b', '#eb4d4b', '#6c5ce7', '#a29bfe']
@@ -13,8 +13,74 @@ POWER_TYPES = [
     {'type': 'double_score', 'color': '#ffff00', 'duration': 7000}
 ]
 
+ITEM_CELL_SIZE = 100
+ITEM_EDGE_MARGIN = 10.0
+
 _food_batch_cache = []
 _power_batch_cache = []
+_item_grid = {'food': {}, 'power_food': {}}
+
+def _item_cell(x, y):
+    return (int(x // ITEM_CELL_SIZE), int(y // ITEM_CELL_SIZE))
+
+def _index_item(kind, item):
+    cell = _item_cell(item['x'], item['y'])
+    item['cell'] = cell
+    bucket = _item_grid[kind].get(cell)
+    if bucket is None:
+        _item_grid[kind][cell] = {id(item): item}
+    else:
+        bucket[id(item)] = item
+
+def _unindex_item(kind, item):
+    bucket = _item_grid[kind].get(item.get('cell'))
+    if bucket is None:
+        return
+    bucket.pop(id(item), None)
+    if not bucket:
+        del _item_grid[kind][item['cell']]
+
+def _add_items(kind, items):
+    for item in items:
+        item['x'], item['y'] = clamp_to_arena(item['x'], item['y'], margin=ITEM_EDGE_MARGIN)
+        _index_item(kind, item)
+    game_state[kind].extend(items)
+
+def add_food(items):
+    _add_items('food', items)
+
+def add_power_food(items):
+    _add_items('power_food', items)
+
+def reindex_items():
+    for kind in _item_grid:
+        _item_grid[kind] = {}
+        for item in game_state[kind]:
+            _index_item(kind, item)
+
+def move_item(kind, item, x, y):
+    item['x'] = x
+    item['y'] = y
+    if _item_cell(x, y) != item.get('cell'):
+        _unindex_item(kind, item)
+        _index_item(kind, item)
+
+def items_in_cell(kind, cell):
+    bucket = _item_grid[kind].get(cell)
+    return list(bucket.values()) if bucket else []
+
+def remove_vanished_items():
+    for kind in _item_grid:
+        items = game_state[kind]
+        if all(item.get('scale', 1.0) > 0 for item in items):
+            continue
+        kept = []
+        for item in items:
+            if item.get('scale', 1.0) > 0:
+                kept.append(item)
+            else:
+                _unindex_item(kind, item)
+        game_state[kind] = kept
 
 def generate_food():
     position = get_random_position_cached()
@@ -41,11 +107,38 @@ def generate_power_food():
         'created_at': time.time() * 1000
     }
 
+def generate_food_batch(count):
+    created_at = time.time() * 1000
+    colors = random.choices(FOOD_COLORS, k=count)
+    sizes = random.choices(range(3, 8), k=count)
+    return [
+        {'x': x, 'y': y, 'size': size, 'color': color, 'scale': 1.0, 'created_at': created_at}
+        for (x, y), size, color in zip(random_positions(count), sizes, colors)
+    ]
+
+def generate_power_food_batch(count):
+    created_at = time.time() * 1000
+    power_types = random.choices(POWER_TYPES, k=count)
+    sizes = random.choices(range(8, 13), k=count)
+    return [
+        {
+            'x': x,
+            'y': y,
+            'size': size,
+            'color': power_type['color'],
+            'type': power_type['type'],
+            'duration': power_type['duration'],
+            'scale': 1.0,
+            'created_at': created_at
+        }
+        for (x, y), size, power_type in zip(random_positions(count), sizes, power_types)
+    ]
+
 def batch_generate_food(count):
     global _food_batch_cache
     
     if len(_food_batch_cache) < count:
-        _food_batch_cache.extend([generate_food() for _ in range(count * 2)])
+        _food_batch_cache.extend(generate_food_batch(count * 2))
     
     result = _food_batch_cache[:count]
     _food_batch_cache = _food_batch_cache[count:]
@@ -55,7 +148,7 @@ def batch_generate_power_food(count):
     global _power_batch_cache
     
     if len(_power_batch_cache) < count:
-        _power_batch_cache.extend([generate_power_food() for _ in range(count * 2)])
+        _power_batch_cache.extend(generate_power_food_batch(count * 2))
     
     result = _power_batch_cache[:count]
     _power_batch_cache = _power_batch_cache[count:]
@@ -104,7 +197,7 @@ def remove_consumed_food(consumed_indices):
     
     for index in sorted(consumed_indices, reverse=True):
         if 0 <= index < len(game_state['food']):
-            game_state['food'].pop(index)
+            _unindex_item('food', game_state['food'].pop(index))
 
 def remove_consumed_power_food(consumed_indices):
     if not consumed_indices:
@@ -112,4 +205,4 @@ def remove_consumed_power_food(consumed_indices):
     
     for index in sorted(consumed_indices, reverse=True):
         if 0 <= index < len(game_state['power_food']):
-            game_state['power_food'].pop(index)
+            _unindex_item('power_food', game_state['power_food'].pop(index))
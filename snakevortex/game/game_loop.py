@@ -1,28 +1,71 @@
 import asyncio
-import json
 import time
-from .game_state import game_state, connected_clients, FOOD_COUNT, POWER_FOOD_COUNT, update_spatial_grid, get_cached_leaderboard
+from snakevortex.config import SNAPSHOT_MIN_INTERVAL_MS
+from snakevortex.web.frames import PreparedFrame
+from .game_state import game_state, connected_clients, tick_stats, FOOD_COUNT, POWER_FOOD_COUNT, SPECTATOR_SEND_INTERVAL_MS, BOT_COUNT, BOT_SPAWNS_PER_TICK, BOT_AI_BUDGET_MS, MIN_EXPERT_BOTS, update_spatial_grid
 from .snake_logic import move_snake, grow_snake, apply_power_effects, clean_expired_powers, update_entity_speed
 from .collision import check_collision, check_food_collision, check_power_food_collision
-from .food_system import generate_food, generate_power_food, create_death_food, animate_food_scaling, remove_consumed_food, remove_consumed_power_food, batch_generate_food, batch_generate_power_food
-from .bot_ai import bot_ai, update_food_cache, clear_bot_caches, create_bot
-from .arena_system import update_arena
+from .food_system import create_death_food, animate_food_scaling, remove_consumed_food, remove_consumed_power_food, batch_generate_food, batch_generate_power_food, add_food, add_power_food, reindex_items, remove_vanished_items, items_in_cell, ITEM_CELL_SIZE
+from .bot_ai import bot_ai, update_food_cache, clear_bot_caches, create_bot, finish_ai_tick, choose_bot_tier, rebalance_bot_tiers, get_ai_stats
+from .arena_system import update_arena, on_bounds_change
+from .input_queue import drain_inputs, discard_inputs
+from .leaderboard import track_entity, update_entity_score, untrack_entity, get_rank
+from .name_index import unindex_entity
+from .match_events import end_match
+from .sessions import is_detached, expire_sessions, drop_session, get_session_stats
+from .head_index import rebuild_head_index
+from .snapshot import SnapshotEncoder
 
 FRAME_TIME = 1000 / 60
+TICK_STATS_WINDOW = 120
 last_frame_time = 0
 last_bot_check = 0
+last_broadcast_time = 0
+last_spectator_broadcast = 0
+_tick_window = {'ticks': 0, 'tick_ms': 0.0, 'tick_max_ms': 0.0, 'broadcasts': 0, 'broadcast_ms': 0.0, 'started': 0.0}
+
+def record_tick(current_time, tick_ms, broadcast_ms):
+    window = _tick_window
+    if window['ticks'] == 0:
+        window['started'] = current_time
+
+    window['ticks'] += 1
+    window['tick_ms'] += tick_ms
+    window['tick_max_ms'] = max(window['tick_max_ms'], tick_ms)
+    if broadcast_ms is not None:
+        window['broadcasts'] += 1
+        window['broadcast_ms'] += broadcast_ms
+
+    if window['ticks'] < TICK_STATS_WINDOW:
+        return
+
+    tick_stats['tick_ms'] = round(window['tick_ms'] / window['ticks'], 2)
+    tick_stats['tick_max_ms'] = round(window['tick_max_ms'], 2)
+    tick_stats['broadcast_ms'] = round(window['broadcast_ms'] / window['broadcasts'], 2) if window['broadcasts'] else 0.0
+    tick_stats['tick_interval_ms'] = round((current_time - window['started']) / (window['ticks'] - 1), 2)
+    tick_stats['clients'] = len(connected_clients)
+    tick_stats['ai'] = get_ai_stats()
+    tick_stats['sessions'] = get_session_stats()
+    window.update(ticks=0, tick_ms=0.0, tick_max_ms=0.0, broadcasts=0, broadcast_ms=0.0)
 
 async def game_loop():
-    global last_frame_time
+    global last_frame_time, last_broadcast_time
     
     while True:
         current_time = time.time() * 1000
         
         if current_time - last_frame_time >= FRAME_TIME:
             try:
+                started = time.perf_counter()
                 await update_game_state()
-                await broadcast_game_state()
+                broadcast_ms = None
+                if current_time - last_broadcast_time >= SNAPSHOT_MIN_INTERVAL_MS - FRAME_TIME / 2:
+                    broadcast_started = time.perf_counter()
+                    await broadcast_game_state()
+                    broadcast_ms = (time.perf_counter() - broadcast_started) * 1000
+                    last_broadcast_time = current_time
                 last_frame_time = current_time
+                record_tick(current_time, (time.perf_counter() - started) * 1000, broadcast_ms)
             except Exception as e:
                 print(f"Game loop error: {e}")
         
@@ -34,12 +77,18 @@ async def update_game_state():
     update_arena(current_time)
     if not game_state['spatial_grid']:
         update_spatial_grid()
+        rebuild_head_index()
     update_food_cache()
+    drain_inputs()
+    release_detached_players(current_time)
 
     await move_all_entities(current_time)
+    finish_ai_tick()
     update_spatial_grid()
+    rebuild_head_index()
     await resolve_collisions_and_consumptions(current_time)
     cull_items_outside_arena()
+    remove_vanished_items()
     
     animate_food_scaling()
     maintain_food_count()
@@ -57,6 +106,9 @@ async def move_all_entities(current_time):
         spawn_time = player.get('spawn_time_ms')
         if spawn_time is not None and current_time < spawn_time:
             continue
+        track_entity(player)
+        if is_detached(player['id']):
+            continue
         update_entity_speed(player, current_time)
         if player.get('direction') is not None:
             move_snake(player['snake'], player['direction'], player['speed'])
@@ -67,6 +119,7 @@ async def move_all_entities(current_time):
         spawn_time = bot.get('spawn_time_ms')
         if spawn_time is not None and current_time < spawn_time:
             continue
+        track_entity(bot)
         bot_ai(bot)
         update_entity_speed(bot, current_time)
         if bot.get('direction') is not None:
@@ -80,7 +133,7 @@ async def resolve_collisions_and_consumptions(current_time):
         if not player.get('alive'):
             continue
         spawn_time = player.get('spawn_time_ms')
-        if spawn_time is not None and current_time < spawn_time:
+        if (spawn_time is not None and current_time < spawn_time) or is_detached(player_id):
             continue
         if check_collision(player.get('snake', []), player_id, 'player'):
             to_kill_players.append((player_id, player))
@@ -106,7 +159,7 @@ async def resolve_collisions_and_consumptions(current_time):
         if not player.get('alive'):
             continue
         spawn_time = player.get('spawn_time_ms')
-        if spawn_time is not None and current_time < spawn_time:
+        if (spawn_time is not None and current_time < spawn_time) or is_detached(player['id']):
             continue
         consumed_food = check_food_collision(player['snake'], player['id'])
         consumed_power = check_power_food_collision(player['snake'], player['id'])
@@ -138,21 +191,43 @@ async def resolve_collisions_and_consumptions(current_time):
         apply_power_effects(bot)
         clean_expired_powers(bot)
 
+_pending_cull_bounds = []
+
+ARENA_CULL_MARGIN = 20.0
+
+@on_bounds_change
+def _queue_arena_cull(kind, previous_bounds, bounds):
+    if kind == 'shrink':
+        _pending_cull_bounds.append((previous_bounds, bounds))
+
+def _strip_cells(outer, inner):
+    first_col = int((outer[0] - ARENA_CULL_MARGIN) // ITEM_CELL_SIZE)
+    first_row = int((outer[1] - ARENA_CULL_MARGIN) // ITEM_CELL_SIZE)
+    last_col = int((outer[2] + ARENA_CULL_MARGIN) // ITEM_CELL_SIZE)
+    last_row = int((outer[3] + ARENA_CULL_MARGIN) // ITEM_CELL_SIZE)
+    inner_min_x, inner_min_y, inner_max_x, inner_max_y = inner
+
+    for cx in range(first_col, last_col + 1):
+        for cy in range(first_row, last_row + 1):
+            if (cx * ITEM_CELL_SIZE >= inner_min_x and (cx + 1) * ITEM_CELL_SIZE <= inner_max_x and
+                    cy * ITEM_CELL_SIZE >= inner_min_y and (cy + 1) * ITEM_CELL_SIZE <= inner_max_y):
+                continue
+            yield cx, cy
+
 def cull_items_outside_arena():
-    arena = game_state.get('arena')
-    if not arena:
-        return
-    if not all(k in arena for k in ('min_x', 'min_y', 'max_x', 'max_y')):
+    if not _pending_cull_bounds:
         return
 
-    min_x = float(arena['min_x'])
-    min_y = float(arena['min_y'])
-    max_x = float(arena['max_x'])
-    max_y = float(arena['max_y'])
+    outer = _pending_cull_bounds[0][0]
+    min_x, min_y, max_x, max_y = _pending_cull_bounds[-1][1]
+    _pending_cull_bounds.clear()
 
-    margin = 20.0
-    game_state['food'] = [f for f in game_state['food'] if (f.get('scale', 1.0) > 0) and (min_x - margin <= f['x'] <= max_x + margin) and (min_y - margin <= f['y'] <= max_y + margin)]
-    game_state['power_food'] = [p for p in game_state['power_food'] if (p.get('scale', 1.0) > 0) and (min_x - margin <= p['x'] <= max_x + margin) and (min_y - margin <= p['y'] <= max_y + margin)]
+    inner = (min_x - ARENA_CULL_MARGIN, min_y - ARENA_CULL_MARGIN, max_x + ARENA_CULL_MARGIN, max_y + ARENA_CULL_MARGIN)
+    for cell in _strip_cells(outer, inner):
+        for kind in ('food', 'power_food'):
+            for item in items_in_cell(kind, cell):
+                if not (inner[0] <= item['x'] <= inner[2] and inner[1] <= item['y'] <= inner[3]):
+                    item['scale'] = 0.0
 
 async def process_food_consumption_for_entity(entity, consumed_indices):
     if not consumed_indices:
@@ -175,6 +250,7 @@ async def process_food_consumption_for_entity(entity, consumed_indices):
     
     entity['score'] += score_gain
     entity['length'] += growth_amount
+    update_entity_score(entity)
 
     segment_multiplier = 1
     if entity['length'] >= 300:
@@ -203,24 +279,28 @@ async def process_power_consumption_for_entity(entity, consumed_indices):
             entity['powers'][power_type] = current_time + duration
             entity['score'] += 20
     
+    update_entity_score(entity)
     remove_consumed_power_food(consumed_indices)
 
 async def kill_player(player_id, player):
+    untrack_entity(player_id)
+    end_match(player, 'death')
     player['alive'] = False
     player['death_time'] = time.time() * 1000
     
     death_food = create_death_food(player['snake'], player['score'])
-    game_state['food'].extend(death_food)
+    add_food(death_food)
     
     player['snake'] = []
     player['powers'] = {}
 
 async def kill_bot(bot_id, bot):
+    untrack_entity(bot_id)
     bot['alive'] = False
     bot['death_time'] = time.time() * 1000
     
     death_food = create_death_food(bot['snake'], bot['score'])
-    game_state['food'].extend(death_food)
+    add_food(death_food)
     
     bot['snake'] = []
     bot['powers'] = {}
@@ -232,12 +312,12 @@ def maintain_food_count():
     if current_food < FOOD_COUNT:
         needed = FOOD_COUNT - current_food
         new_food = batch_generate_food(needed)
-        game_state['food'].extend(new_food)
+        add_food(new_food)
     
     if current_power < POWER_FOOD_COUNT:
         needed = POWER_FOOD_COUNT - current_power
         new_power = batch_generate_power_food(needed)
-        game_state['power_food'].extend(new_power)
+        add_power_food(new_power)
 
 def maintain_bot_count():
     global last_bot_check
@@ -246,55 +326,53 @@ def maintain_bot_count():
     if current_time - last_bot_check < 5000:
         return
     
-    alive_bots = sum(1 for bot in game_state['bots'].values() if bot['alive'])
+    alive_bots = [bot for bot in game_state['bots'].values() if bot['alive']]
+    rebalance_bot_tiers(alive_bots, BOT_AI_BUDGET_MS, MIN_EXPERT_BOTS)
     
-    if alive_bots < 8:
-        for _ in range(8 - alive_bots):
-            create_bot()
+    missing = BOT_COUNT - len(alive_bots)
+    for _ in range(min(missing, BOT_SPAWNS_PER_TICK)):
+        alive_bots.append(create_bot(choose_bot_tier(alive_bots, BOT_AI_BUDGET_MS, MIN_EXPERT_BOTS)))
     
-    last_bot_check = current_time
+    if missing <= BOT_SPAWNS_PER_TICK:
+        last_bot_check = current_time
 
 async def broadcast_game_state():
+    global last_spectator_broadcast
+
     if not connected_clients:
         return
     
     try:
-        leaderboard = get_cached_leaderboard()
-        
-        message = {
-            'type': 'game_state',
-            'players': game_state['players'],
-            'bots': game_state['bots'],
-            'food': game_state['food'],
-            'power_food': game_state['power_food'],
-            'leaderboard': leaderboard,
-            'arena': game_state.get('arena')
-        }
+        current_time = time.time() * 1000
+        encoder = SnapshotEncoder(current_time, prepare=PreparedFrame)
+        player_clients = []
+        spectator_clients = []
         
-        message_json = json.dumps(message)
-        clients_copy = connected_clients.copy()
+        for client in list(connected_clients):
+            if client.player_id:
+                player_clients.append(client)
+            elif client.spectator_admitted:
+                spectator_clients.append(client)
         
-        tasks = []
-        for client in clients_copy:
-            tasks.append(send_to_client(client, message_json))
+        for client in player_clients:
+            client.push_rank(get_rank(client.player_id), current_time)
+            client.push_frame(encoder.player_frame(client.player_id))
         
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        if spectator_clients and current_time - last_spectator_broadcast >= SPECTATOR_SEND_INTERVAL_MS:
+            last_spectator_broadcast = current_time
+            for client in spectator_clients:
+                client.push_frame(encoder.spectator_frame(client.follow_target))
     
     except Exception as e:
         print(f"Broadcast error: {e}")
 
-async def send_to_client(client, message):
-    try:
-        await client.send(message)
-    except Exception as e:
-        connected_clients.discard(client)
-
 def cleanup_inactive_players():
     current_time = time.time()
     inactive_players = []
     
     for player_id, player in game_state['players'].items():
+        if is_detached(player_id):
+            continue
         if 'last_ping' in player and current_time - player['last_ping'] > 30:
             inactive_players.append(player_id)
     
@@ -303,20 +381,41 @@ def cleanup_inactive_players():
             player = game_state['players'][player_id]
             if player['alive']:
                 death_food = create_death_food(player['snake'], player['score'])
-                game_state['food'].extend(death_food)
+                add_food(death_food)
+                end_match(player, 'inactive')
+            untrack_entity(player_id)
+            unindex_entity(player_id)
+            drop_session(player_id)
             del game_state['players'][player_id]
 
+def release_detached_players(current_time):
+    for player_id in expire_sessions(current_time):
+        player = game_state['players'].get(player_id)
+        if player is None:
+            continue
+        if player['alive']:
+            death_food = create_death_food(player['snake'], player['score'])
+            add_food(death_food)
+            end_match(player, 'disconnect')
+        untrack_entity(player_id)
+        unindex_entity(player_id)
+        discard_inputs(player_id)
+        del game_state['players'][player_id]
+
 def cleanup_dead_entities():
     current_time = time.time() * 1000
     
     dead_players = [pid for pid, player in game_state['players'].items() 
                    if not player['alive'] and current_time - player.get('death_time', current_time) > 60000]
     for pid in dead_players:
+        unindex_entity(pid)
+        drop_session(pid)
         del game_state['players'][pid]
     
     dead_bots = [bid for bid, bot in game_state['bots'].items() 
                 if not bot['alive'] and current_time - bot.get('death_time', current_time) > 60000]
     for bid in dead_bots:
+        unindex_entity(bid)
         del game_state['bots'][bid]
     
     game_state['food'] = [f for f in game_state['food'] 
@@ -330,3 +429,5 @@ def cleanup_dead_entities():
     
     if len(game_state['power_food']) > POWER_FOOD_COUNT * 3:
         game_state['power_food'] = game_state['power_food'][-POWER_FOOD_COUNT * 2:]
+
+    reindex_items()
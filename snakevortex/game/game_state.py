@@ -3,26 +3,41 @@ import random
 from collections import defaultdict
 
 MAX_PLAYERS = 20
+MAX_SPECTATORS = 200
+SPECTATOR_SEND_INTERVAL_MS = 100
+SPECTATOR_FOLLOW_RADIUS = 900
 FOOD_COUNT = 200
 POWER_FOOD_COUNT = 25
 INITIAL_SNAKE_LENGTH = 4
 WORLD_WIDTH = 2000
 WORLD_HEIGHT = 2000
 GRID_SIZE = 100
+BOT_COUNT = 8
+BOT_SPAWNS_PER_TICK = 2
+BOT_AI_BUDGET_MS = 1.5
+MIN_EXPERT_BOTS = 2
 
 game_state = {
     'players': {},
     'bots': {},
     'food': [],
     'power_food': [],
-    'leaderboard': [],
     'spatial_grid': defaultdict(list),
-    'last_leaderboard_update': 0,
-    'leaderboard_cache': []
+    'spatial_version': 0
 }
 
 connected_clients = set()
 
+tick_stats = {
+    'tick_ms': 0.0,
+    'tick_max_ms': 0.0,
+    'broadcast_ms': 0.0,
+    'tick_interval_ms': 0.0,
+    'clients': 0,
+    'ai': None,
+    'sessions': None
+}
+
 _position_pool = []
 _pool_refill_time = 0
 
@@ -39,6 +54,7 @@ def get_nearby_cells(x, y, radius=1):
 
 def update_spatial_grid():
     game_state['spatial_grid'].clear()
+    game_state['spatial_version'] += 1
     now_ms = time.time() * 1000
     
     for player_id, player in game_state['players'].items():
@@ -55,45 +71,10 @@ def update_spatial_grid():
                 cell = get_grid_key(segment['x'], segment['y'])
                 game_state['spatial_grid'][cell].append(('bot', bot_id, segment))
 
-def get_cached_leaderboard():
-    current_time = time.time() * 1000
-    
-    if current_time - game_state['last_leaderboard_update'] > 500:
-        all_entities = []
-        
-        for player in game_state['players'].values():
-            spawn_time = player.get('spawn_time_ms')
-            if player['alive'] and (spawn_time is None or current_time >= spawn_time):
-                all_entities.append({
-                    'name': player['name'],
-                    'score': player['score'],
-                    'length': player['length']
-                })
-        
-        for bot in game_state['bots'].values():
-            spawn_time = bot.get('spawn_time_ms')
-            if bot['alive'] and (spawn_time is None or current_time >= spawn_time):
-                all_entities.append({
-                    'name': bot['name'],
-                    'score': bot['score'],
-                    'length': bot['length']
-                })
-        
-        game_state['leaderboard_cache'] = sorted(all_entities, key=lambda x: x['score'], reverse=True)
-        game_state['last_leaderboard_update'] = current_time
-    
-    return game_state['leaderboard_cache']
-
-def get_random_position_cached():
-    global _position_pool, _pool_refill_time
-    
-    current_time = time.time() * 1000
+def _position_area():
     arena = game_state.get('arena')
-    if arena and all(k in arena for k in ('min_x', 'min_y', 'max_x', 'max_y')):
-        min_x = float(arena['min_x'])
-        min_y = float(arena['min_y'])
-        max_x = float(arena['max_x'])
-        max_y = float(arena['max_y'])
+    if arena:
+        min_x, min_y, max_x, max_y = arena.bounds
     else:
         min_x = 0.0
         min_y = 0.0
@@ -111,13 +92,27 @@ def get_random_position_cached():
     if min_y_s >= max_y_s:
         min_y_s = min_y
         max_y_s = max_y
+    return int(min_x_s), int(min_y_s), int(max_x_s), int(max_y_s)
+
+def random_positions(count):
+    min_x, min_y, max_x, max_y = _position_area()
+    span_x = max_x - min_x + 1
+    span_y = max_y - min_y + 1
+    rand = random.random
+    return [(min_x + int(rand() * span_x), min_y + int(rand() * span_y)) for _ in range(count)]
+
+def get_random_position_cached():
+    global _position_pool, _pool_refill_time
+    
+    current_time = time.time() * 1000
+    min_x_s, min_y_s, max_x_s, max_y_s = _position_area()
     
     if current_time - _pool_refill_time > 1000 or len(_position_pool) < 10:
         _position_pool = []
         for _ in range(50):
             _position_pool.append({
-                'x': random.randint(int(min_x_s), int(max_x_s)),
-                'y': random.randint(int(min_y_s), int(max_y_s))
+                'x': random.randint(min_x_s, max_x_s),
+                'y': random.randint(min_y_s, max_y_s)
             })
         _pool_refill_time = current_time
     
@@ -125,6 +120,6 @@ def get_random_position_cached():
         return _position_pool.pop()
     
     return {
-        'x': random.randint(int(min_x_s), int(max_x_s)),
-        'y': random.randint(int(min_y_s), int(max_y_s))
+        'x': random.randint(min_x_s, max_x_s),
+        'y': random.randint(min_y_s, max_y_s)
     }
@@ -0,0 +1,112 @@
+import heapq
+import math
+from .game_state import game_state
+
+HEAD_CELL_SIZE = 200
+
+_heads = {
+    'cells': {},
+    'entries': {}
+}
+
+def _cell(x, y):
+    return (int(x // HEAD_CELL_SIZE), int(y // HEAD_CELL_SIZE))
+
+def rebuild_head_index():
+    cells = {}
+    entries = {}
+
+    for kind, entities in (('player', game_state['players']), ('bot', game_state['bots'])):
+        for entity in entities.values():
+            snake = entity['snake']
+            if not entity['alive'] or not snake:
+                continue
+
+            head = snake[0]
+            if len(snake) > 1:
+                heading = math.atan2(head['y'] - snake[1]['y'], head['x'] - snake[1]['x'])
+            else:
+                heading = entity.get('direction') or 0.0
+
+            entry = (head['x'], head['y'], heading, kind, entity)
+            entries[entity['id']] = entry
+            key = _cell(head['x'], head['y'])
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [entry]
+            else:
+                bucket.append(entry)
+
+    _heads['cells'] = cells
+    _heads['entries'] = entries
+
+def get_head(entity_id):
+    return _heads['entries'].get(entity_id)
+
+def heads_within(x, y, radius, exclude_id=None):
+    cells = _heads['cells']
+    radius_sq = radius * radius
+    min_cx, min_cy = _cell(x - radius, y - radius)
+    max_cx, max_cy = _cell(x + radius, y + radius)
+    results = []
+
+    for cx in range(min_cx, max_cx + 1):
+        for cy in range(min_cy, max_cy + 1):
+            bucket = cells.get((cx, cy))
+            if not bucket:
+                continue
+            for entry in bucket:
+                dx = entry[0] - x
+                dy = entry[1] - y
+                dist_sq = dx * dx + dy * dy
+                if dist_sq <= radius_sq and entry[4]['id'] != exclude_id:
+                    results.append((dist_sq, entry))
+
+    return results
+
+def nearest_heads(x, y, k, max_radius=None, exclude_id=None, predicate=None):
+    cells = _heads['cells']
+    if not cells or k <= 0:
+        return []
+
+    center_x, center_y = _cell(x, y)
+    if max_radius is not None:
+        max_ring = int(max_radius // HEAD_CELL_SIZE) + 1
+    else:
+        max_ring = max(max(abs(cx - center_x), abs(cy - center_y)) for cx, cy in cells)
+    max_radius_sq = None if max_radius is None else max_radius * max_radius
+
+    best = []
+    for ring in range(max_ring + 1):
+        for cx in range(center_x - ring, center_x + ring + 1):
+            for cy in range(center_y - ring, center_y + ring + 1):
+                if max(abs(cx - center_x), abs(cy - center_y)) != ring:
+                    continue
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for entry in bucket:
+                    entity = entry[4]
+                    if entity['id'] == exclude_id or (predicate is not None and not predicate(entity)):
+                        continue
+                    dx = entry[0] - x
+                    dy = entry[1] - y
+                    dist_sq = dx * dx + dy * dy
+                    if max_radius_sq is not None and dist_sq > max_radius_sq:
+                        continue
+                    item = (-dist_sq, id(entity), entry)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif dist_sq < -best[0][0]:
+                        heapq.heapreplace(best, item)
+
+        if len(best) == k:
+            reach = ring * HEAD_CELL_SIZE
+            if -best[0][0] <= reach * reach:
+                break
+
+    return [(-item[0], item[2]) for item in sorted(best, reverse=True)]
+
+def nearest_head_distance(x, y, max_radius=None, exclude_id=None):
+    found = nearest_heads(x, y, 1, max_radius=max_radius, exclude_id=exclude_id)
+    return math.sqrt(found[0][0]) if found else None
@@ -0,0 +1,41 @@
+import time
+from collections import deque
+from .game_state import game_state
+
+INPUT_QUEUE_DEPTH = 16
+
+_input_queues = {}
+
+def queue_input(player_id, seq, direction, accelerating):
+    queue = _input_queues.get(player_id)
+    if queue is None:
+        queue = deque(maxlen=INPUT_QUEUE_DEPTH)
+        _input_queues[player_id] = queue
+    queue.append((seq, direction, accelerating))
+
+def discard_inputs(player_id):
+    _input_queues.pop(player_id, None)
+
+def drain_inputs():
+    if not _input_queues:
+        return
+
+    now = time.time()
+    for player_id, queue in list(_input_queues.items()):
+        player = game_state['players'].get(player_id)
+        if not player:
+            del _input_queues[player_id]
+            continue
+
+        if not queue:
+            continue
+
+        if player.get('alive'):
+            seq, direction, accelerating = queue[-1]
+            player['direction'] = direction
+            player['desired_speed'] = 3.0 if accelerating else 2.0
+            if seq is not None:
+                player['input_seq'] = seq
+            player['last_ping'] = now
+
+        queue.clear()
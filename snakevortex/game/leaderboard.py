@@ -0,0 +1,92 @@
+import bisect
+from .game_state import game_state
+
+LEADERBOARD_SIZE = 10
+
+_board = {
+    'keys': {},
+    'order': [],
+    'sequence': 0,
+    'top_cache': None
+}
+
+def _entry_key(entity, sequence):
+    return (-entity['score'], sequence, entity['id'])
+
+def _touches_top(index):
+    return index < LEADERBOARD_SIZE
+
+def track_entity(entity):
+    entity_id = entity['id']
+    if entity_id in _board['keys']:
+        return
+
+    _board['sequence'] += 1
+    key = _entry_key(entity, _board['sequence'])
+    index = bisect.bisect_left(_board['order'], key)
+    _board['order'].insert(index, key)
+    _board['keys'][entity_id] = key
+
+    if _touches_top(index):
+        _board['top_cache'] = None
+
+def update_entity_score(entity):
+    entity_id = entity['id']
+    old_key = _board['keys'].get(entity_id)
+    if old_key is None:
+        return
+
+    order = _board['order']
+    old_index = bisect.bisect_left(order, old_key)
+    new_key = _entry_key(entity, old_key[1])
+
+    if new_key != old_key:
+        del order[old_index]
+        new_index = bisect.bisect_left(order, new_key)
+        order.insert(new_index, new_key)
+        _board['keys'][entity_id] = new_key
+    else:
+        new_index = old_index
+
+    if _touches_top(old_index) or _touches_top(new_index):
+        _board['top_cache'] = None
+
+def untrack_entity(entity_id):
+    key = _board['keys'].pop(entity_id, None)
+    if key is None:
+        return
+
+    order = _board['order']
+    index = bisect.bisect_left(order, key)
+    del order[index]
+
+    if _touches_top(index):
+        _board['top_cache'] = None
+
+def _find_entity(entity_id):
+    return game_state['players'].get(entity_id) or game_state['bots'].get(entity_id)
+
+def get_top_entries():
+    if _board['top_cache'] is None:
+        top = []
+        for _, _, entity_id in _board['order'][:LEADERBOARD_SIZE]:
+            entity = _find_entity(entity_id)
+            if not entity:
+                continue
+            top.append({
+                'name': entity['name'],
+                'score': entity['score'],
+                'length': entity['length']
+            })
+        _board['top_cache'] = top
+
+    return _board['top_cache']
+
+def get_rank(entity_id):
+    key = _board['keys'].get(entity_id)
+    if key is None:
+        return None
+    return bisect.bisect_left(_board['order'], key) + 1
+
+def get_ranked_count():
+    return len(_board['order'])
@@ -0,0 +1,24 @@
+import time
+
+_match_listeners = []
+
+def on_match_end(listener):
+    if listener not in _match_listeners:
+        _match_listeners.append(listener)
+    return listener
+
+def end_match(player, cause):
+    if player.get('match_recorded'):
+        return
+    player['match_recorded'] = True
+
+    record = {
+        'name': player['name'],
+        'score': player.get('score', 0),
+        'length': player.get('length', 0),
+        'started_at': (player.get('spawn_time_ms') or time.time() * 1000) / 1000,
+        'ended_at': time.time(),
+        'cause': cause
+    }
+    for listener in _match_listeners:
+        listener(record)
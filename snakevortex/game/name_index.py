@@ -0,0 +1,40 @@
+from .game_state import game_state
+
+_index = {
+    'names': {},
+    'keys': {}
+}
+
+def name_key(name):
+    return name.casefold()
+
+def index_entity(entity):
+    key = name_key(entity['name'])
+    _index['names'].setdefault(key, {})[entity['id']] = None
+    _index['keys'][entity['id']] = key
+
+def unindex_entity(entity_id):
+    key = _index['keys'].pop(entity_id, None)
+    holders = _index['names'].get(key)
+    if holders is None:
+        return
+    holders.pop(entity_id, None)
+    if not holders:
+        del _index['names'][key]
+
+def is_name_taken(name):
+    return name_key(name) in _index['names']
+
+def get_entity(entity_id):
+    if entity_id is None:
+        return None
+    return game_state['players'].get(entity_id) or game_state['bots'].get(entity_id)
+
+def find_entity_id(name):
+    if not name:
+        return None
+    holders = _index['names'].get(name_key(name))
+    return next(iter(holders)) if holders else None
+
+def find_entity_by_name(name):
+    return get_entity(find_entity_id(name))
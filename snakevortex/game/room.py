@@ -0,0 +1,42 @@
+import asyncio
+import time
+from .arena_system import init_arena
+from .world_snapshot import restore_world
+
+_room = {
+    'task': None,
+    'restored': False,
+    'activated_at_ms': None,
+    'activation_ms': 0.0
+}
+
+def is_room_active():
+    return _room['task'] is not None
+
+def prepare_room(world=None, reclaim_grace_ms=0):
+    now_ms = time.time() * 1000
+    if world is None:
+        init_arena()
+    else:
+        restore_world(world, now_ms, reclaim_grace_ms)
+        _room['restored'] = True
+    _room['activated_at_ms'] = now_ms
+
+def activate_room(world=None, reclaim_grace_ms=0):
+    from .game_loop import game_loop
+
+    if _room['task'] is not None:
+        return False
+
+    started = time.perf_counter()
+    prepare_room(world, reclaim_grace_ms)
+    _room['task'] = asyncio.create_task(game_loop())
+    _room['activation_ms'] = (time.perf_counter() - started) * 1000
+    return True
+
+def get_room_stats():
+    return {
+        'active': is_room_active(),
+        'restored': _room['restored'],
+        'activation_ms': round(_room['activation_ms'], 2)
+    }
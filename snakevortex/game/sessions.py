@@ -0,0 +1,70 @@
+import secrets
+
+SESSION_TOKEN_BYTES = 18
+MAX_SESSION_TOKEN_LENGTH = 64
+
+_sessions = {
+    'tokens': {},
+    'owners': {},
+    'detached': {},
+    'resumed': 0,
+    'expired': 0
+}
+
+def issue_session(player_id):
+    drop_session(player_id)
+    token = secrets.token_urlsafe(SESSION_TOKEN_BYTES)
+    _sessions['tokens'][token] = player_id
+    _sessions['owners'][player_id] = token
+    return token
+
+def drop_session(player_id):
+    token = _sessions['owners'].pop(player_id, None)
+    if token is not None:
+        _sessions['tokens'].pop(token, None)
+    _sessions['detached'].pop(player_id, None)
+
+def detach_session(player_id, deadline_ms):
+    if player_id in _sessions['owners']:
+        _sessions['detached'][player_id] = deadline_ms
+
+def is_detached(player_id):
+    return player_id in _sessions['detached']
+
+def claim_session(token):
+    if not isinstance(token, str) or len(token) > MAX_SESSION_TOKEN_LENGTH:
+        return None, None
+
+    player_id = _sessions['tokens'].get(token)
+    if player_id is None:
+        return None, None
+
+    _sessions['resumed'] += 1
+    return player_id, issue_session(player_id)
+
+def expire_sessions(now_ms):
+    detached = _sessions['detached']
+    if not detached:
+        return []
+
+    expired = [player_id for player_id, deadline in detached.items() if now_ms >= deadline]
+    for player_id in expired:
+        drop_session(player_id)
+    _sessions['expired'] += len(expired)
+    return expired
+
+def get_session_stats():
+    return {
+        'detached': len(_sessions['detached']),
+        'resumed': _sessions['resumed'],
+        'expired': _sessions['expired']
+    }
+
+def export_sessions():
+    return dict(_sessions['owners'])
+
+def restore_sessions(owners, deadline_ms):
+    for player_id, token in owners.items():
+        _sessions['tokens'][token] = player_id
+        _sessions['owners'][player_id] = token
+        _sessions['detached'][player_id] = deadline_ms
@@ -77,6 +77,7 @@ def apply_magnet_effect(entity):
     magnet_range = 80
     
     from .game_state import game_state
+    from .food_system import move_item
     
     for food in game_state['food']:
         if food.get('scale', 1.0) > 0:
@@ -89,8 +90,7 @@ def apply_magnet_effect(entity):
                     dist = math.sqrt(dist_sq)
                     move_factor = 2.0 / dist
                     
-                    food['x'] += dx * move_factor
-                    food['y'] += dy * move_factor
+                    move_item('food', food, food['x'] + dx * move_factor, food['y'] + dy * move_factor)
 
 def clean_expired_powers(entity):
     current_time = time.time() * 1000
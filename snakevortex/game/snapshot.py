@@ -0,0 +1,198 @@
+import json
+import math
+import time
+from .game_state import game_state, SPECTATOR_FOLLOW_RADIUS
+from .leaderboard import get_top_entries, get_ranked_count
+from .name_index import find_entity_by_name
+from .head_index import heads_within
+
+SNAKE_VIEW_MARGIN = 400
+LOD_ENABLED = True
+LOD_FULL_RADIUS = 600
+LOD_CELL_SIZE = 500
+LOD_MIN_ANGLE = 0.2
+LOD_MAX_GAP = 48.0
+
+ENTITY_WIRE_FIELDS = (
+    'id', 'name', 'alive', 'color', 'score', 'length', 'powers', 'direction', 'speed',
+    'spawn_time_ms', 'spawn_duration_ms', 'spawn_protection', 'input_seq'
+)
+FOOD_WIRE_FIELDS = ('x', 'y', 'size', 'color', 'scale')
+POWER_WIRE_FIELDS = ('x', 'y', 'size', 'color', 'scale', 'type')
+
+def _arena_wire():
+    arena = game_state.get('arena')
+    return arena.to_wire() if arena else None
+
+def find_follow_center(target_name):
+    entity = find_entity_by_name(target_name)
+    if entity is None or entity['name'] != target_name or not entity['alive'] or not entity['snake']:
+        return None
+
+    head = entity['snake'][0]
+    return head['x'], head['y']
+
+def _within(item, center_x, center_y, radius):
+    return abs(item['x'] - center_x) <= radius and abs(item['y'] - center_y) <= radius
+
+def _angle_between(a, b):
+    diff = (a - b) % (2 * math.pi)
+    return min(diff, 2 * math.pi - diff)
+
+def simplify_snake(snake, min_angle=LOD_MIN_ANGLE, max_gap=LOD_MAX_GAP):
+    count = len(snake)
+    if count <= 3:
+        return snake
+
+    max_gap_sq = max_gap * max_gap
+    kept = [snake[0], snake[1]]
+    last = snake[1]
+    last_heading = math.atan2(snake[1]['y'] - snake[0]['y'], snake[1]['x'] - snake[0]['x'])
+
+    for i in range(2, count - 1):
+        point = snake[i]
+        dx = point['x'] - last['x']
+        dy = point['y'] - last['y']
+        dist_sq = dx * dx + dy * dy
+        if dist_sq <= 1e-6:
+            continue
+
+        heading = math.atan2(dy, dx)
+        if dist_sq >= max_gap_sq or _angle_between(heading, last_heading) >= min_angle:
+            kept.append(point)
+            last = point
+            last_heading = heading
+
+    kept.append(snake[-1])
+    return kept
+
+def _encode_points(points):
+    return '[' + ','.join(['{"x":%.1f,"y":%.1f}' % (point['x'], point['y']) for point in points]) + ']'
+
+def _wire_items(items, fields):
+    wire = []
+    for item in items:
+        entry = {field: item[field] for field in fields if field in item}
+        entry['x'] = round(item['x'], 1)
+        entry['y'] = round(item['y'], 1)
+        wire.append(entry)
+    return wire
+
+class SnapshotEncoder:
+    def __init__(self, server_time_ms=None, lod_enabled=LOD_ENABLED, prepare=None):
+        self.server_time_ms = int(server_time_ms if server_time_ms is not None else time.time() * 1000)
+        self.lod_enabled = lod_enabled
+        self.prepare = prepare
+        self._entity_json = {}
+        self._shared_json = {}
+        self._frames = {}
+
+    def _shared(self, key, build):
+        cached = self._shared_json.get(key)
+        if cached is None:
+            cached = json.dumps(build())
+            self._shared_json[key] = cached
+        return cached
+
+    def encode_entity(self, entity, full_resolution):
+        full_resolution = full_resolution or not self.lod_enabled
+        key = (entity['id'], full_resolution)
+        cached = self._entity_json.get(key)
+        if cached is not None:
+            return cached
+
+        wire = {field: entity[field] for field in ENTITY_WIRE_FIELDS if field in entity}
+        snake = entity.get('snake') or []
+        points = snake if full_resolution else simplify_snake(snake)
+        wire['segment_count'] = len(snake)
+
+        cached = json.dumps(wire)[:-1] + ',"snake":' + _encode_points(points) + '}'
+        self._entity_json[key] = cached
+        return cached
+
+    def _encode_entities(self, entities, center, full_radius, region_radius=None):
+        if region_radius is not None:
+            nearby = heads_within(center[0], center[1], region_radius * math.sqrt(2))
+            entities = {entry[4]['id']: entry[4] for _, entry in nearby if entry[4]['id'] in entities}
+
+        parts = []
+        for entity_id, entity in entities.items():
+            snake = entity.get('snake')
+            if region_radius is not None:
+                if not entity['alive'] or not snake or not _within(snake[0], center[0], center[1], region_radius):
+                    continue
+            full_resolution = bool(center and snake and _within(snake[0], center[0], center[1], full_radius))
+            parts.append(json.dumps(entity_id) + ':' + self.encode_entity(entity, full_resolution))
+        return '{' + ','.join(parts) + '}'
+
+    def _frame(self, frame_key, fields):
+        frame = '{' + ','.join(json.dumps(name) + ':' + value for name, value in fields) + '}'
+        if self.prepare is not None:
+            frame = self.prepare(frame)
+        self._frames[frame_key] = frame
+        return frame
+
+    def player_frame(self, player_id):
+        player = game_state['players'].get(player_id)
+        view_key = None
+        center = None
+        if self.lod_enabled and player and player['alive'] and player['snake']:
+            head = player['snake'][0]
+            view_key = (int(head['x'] // LOD_CELL_SIZE), int(head['y'] // LOD_CELL_SIZE))
+            center = ((view_key[0] + 0.5) * LOD_CELL_SIZE, (view_key[1] + 0.5) * LOD_CELL_SIZE)
+
+        frame_key = ('player', view_key)
+        frame = self._frames.get(frame_key)
+        if frame is not None:
+            return frame
+
+        full_radius = LOD_FULL_RADIUS + LOD_CELL_SIZE / 2
+        return self._frame(frame_key, (
+            ('type', '"game_state"'),
+            ('server_time', str(self.server_time_ms)),
+            ('players', self._encode_entities(game_state['players'], center, full_radius)),
+            ('bots', self._encode_entities(game_state['bots'], center, full_radius)),
+            ('food', self._shared('food', lambda: _wire_items(game_state['food'], FOOD_WIRE_FIELDS))),
+            ('power_food', self._shared('power_food', lambda: _wire_items(game_state['power_food'], POWER_WIRE_FIELDS))),
+            ('leaderboard', self._shared('leaderboard', get_top_entries)),
+            ('ranked_count', self._shared('ranked_count', get_ranked_count)),
+            ('arena', self._shared('arena', _arena_wire)),
+        ))
+
+    def spectator_frame(self, follow_target=None, radius=SPECTATOR_FOLLOW_RADIUS):
+        center = find_follow_center(follow_target)
+        frame_key = ('spectator', follow_target if center else None)
+        frame = self._frames.get(frame_key)
+        if frame is not None:
+            return frame
+
+        fields = [
+            ('type', '"game_state"'),
+            ('server_time', str(self.server_time_ms)),
+            ('spectator', 'true'),
+            ('leaderboard', self._shared('leaderboard', get_top_entries)),
+            ('ranked_count', self._shared('ranked_count', get_ranked_count)),
+            ('arena', self._shared('arena', _arena_wire)),
+        ]
+
+        if center is None:
+            fields.extend((
+                ('players', self._encode_entities(game_state['players'], None, 0)),
+                ('bots', self._encode_entities(game_state['bots'], None, 0)),
+                ('food', self._shared('food', lambda: _wire_items(game_state['food'], FOOD_WIRE_FIELDS))),
+                ('power_food', self._shared('power_food', lambda: _wire_items(game_state['power_food'], POWER_WIRE_FIELDS))),
+            ))
+        else:
+            center_x, center_y = center
+            snake_radius = radius + SNAKE_VIEW_MARGIN
+            food = [f for f in game_state['food'] if _within(f, center_x, center_y, radius)]
+            power_food = [p for p in game_state['power_food'] if _within(p, center_x, center_y, radius)]
+            fields.extend((
+                ('follow', json.dumps(follow_target)),
+                ('players', self._encode_entities(game_state['players'], center, LOD_FULL_RADIUS, snake_radius)),
+                ('bots', self._encode_entities(game_state['bots'], center, LOD_FULL_RADIUS, snake_radius)),
+                ('food', json.dumps(_wire_items(food, FOOD_WIRE_FIELDS))),
+                ('power_food', json.dumps(_wire_items(power_food, POWER_WIRE_FIELDS))),
+            ))
+
+        return self._frame(frame_key, fields)
@@ -1,6 +1,9 @@
 import math
 import random
-from .game_state import game_state, WORLD_WIDTH, WORLD_HEIGHT
+import time
+from collections import deque
+from .game_state import game_state, get_grid_key, WORLD_WIDTH, WORLD_HEIGHT, GRID_SIZE
+from .head_index import nearest_head_distance
 
 def distance_squared(pos1, pos2):
     dx = pos1['x'] - pos2['x']
@@ -8,21 +11,26 @@ def distance_squared(pos1, pos2):
     return dx * dx + dy * dy
 
 
-def find_safe_spawn_position():
-    max_attempts = 50
-    min_distance = 150
+SPAWN_MIN_DISTANCE = 150
+SPAWN_EDGE_MARGIN = 100
+SPAWN_HEAD_DISTANCE = 300
+SPAWN_HEAD_ATTEMPTS = 6
 
+_clearance_grid = {'version': -1, 'occupied': set(), 'pending': set(), 'clearance': {}, 'dirty': True}
+
+def get_spawn_bounds():
     arena = game_state.get('arena')
-    if arena and all(k in arena for k in ('min_x', 'min_y', 'max_x', 'max_y')):
-        min_x = int(float(arena['min_x']) + 100)
-        min_y = int(float(arena['min_y']) + 100)
-        max_x = int(float(arena['max_x']) - 100)
-        max_y = int(float(arena['max_y']) - 100)
+    if arena:
+        arena_min_x, arena_min_y, arena_max_x, arena_max_y = arena.bounds
+        min_x = int(arena_min_x + SPAWN_EDGE_MARGIN)
+        min_y = int(arena_min_y + SPAWN_EDGE_MARGIN)
+        max_x = int(arena_max_x - SPAWN_EDGE_MARGIN)
+        max_y = int(arena_max_y - SPAWN_EDGE_MARGIN)
     else:
-        min_x = 100
-        min_y = 100
-        max_x = WORLD_WIDTH - 100
-        max_y = WORLD_HEIGHT - 100
+        min_x = SPAWN_EDGE_MARGIN
+        min_y = SPAWN_EDGE_MARGIN
+        max_x = WORLD_WIDTH - SPAWN_EDGE_MARGIN
+        max_y = WORLD_HEIGHT - SPAWN_EDGE_MARGIN
 
     if min_x >= max_x:
         min_x = 0
@@ -30,37 +38,138 @@ def find_safe_spawn_position():
     if min_y >= max_y:
         min_y = 0
         max_y = WORLD_HEIGHT
-    
-    for _ in range(max_attempts):
-        position = {
-            'x': random.randint(min_x, max_x),
-            'y': random.randint(min_y, max_y)
-        }
-        
-        if is_position_safe(position, min_distance):
-            return position
-    
-    return {
-        'x': random.randint(min_x, max_x),
-        'y': random.randint(min_y, max_y)
-    }
 
-def is_position_safe(position, min_distance):
-    min_distance_squared = min_distance * min_distance
-    
-    for player in game_state['players'].values():
-        if player['alive'] and player['snake']:
-            for segment in player['snake']:
-                if distance_squared(position, segment) < min_distance_squared:
-                    return False
-    
-    for bot in game_state['bots'].values():
-        if bot['alive'] and bot['snake']:
-            for segment in bot['snake']:
-                if distance_squared(position, segment) < min_distance_squared:
-                    return False
-    
-    return True
+    return min_x, min_y, max_x, max_y
+
+def _grid_dimensions():
+    return int(math.ceil(WORLD_WIDTH / GRID_SIZE)), int(math.ceil(WORLD_HEIGHT / GRID_SIZE))
+
+def _clamp_cell(cell):
+    cols, rows = _grid_dimensions()
+    return (min(cols - 1, max(0, cell[0])), min(rows - 1, max(0, cell[1])))
+
+def _clamped_grid_key(x, y):
+    return _clamp_cell(get_grid_key(x, y))
+
+def _collect_occupied_cells():
+    occupied = set()
+    for cell, entries in game_state['spatial_grid'].items():
+        if entries:
+            occupied.add(_clamp_cell(cell))
+
+    now_ms = time.time() * 1000
+    for entities in (game_state['players'], game_state['bots']):
+        for entity in entities.values():
+            spawn_time = entity.get('spawn_time_ms')
+            if entity['alive'] and entity['snake'] and spawn_time is not None and now_ms < spawn_time:
+                for segment in entity['snake']:
+                    occupied.add(_clamped_grid_key(segment['x'], segment['y']))
+
+    return occupied
+
+def _spread_clearance(clearance, frontier):
+    cols, rows = _grid_dimensions()
+    while frontier:
+        cx, cy = frontier.popleft()
+        next_value = clearance[(cx, cy)] + 1
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nx = cx + dx
+                ny = cy + dy
+                if nx < 0 or ny < 0 or nx >= cols or ny >= rows:
+                    continue
+                if clearance.get((nx, ny), next_value + 1) <= next_value:
+                    continue
+                clearance[(nx, ny)] = next_value
+                frontier.append((nx, ny))
+
+def _compute_clearance(occupied):
+    cols, rows = _grid_dimensions()
+    unbounded = cols + rows
+    clearance = {}
+    frontier = deque()
+
+    for cell in occupied:
+        clearance[cell] = 0
+        frontier.append(cell)
+
+    _spread_clearance(clearance, frontier)
+
+    if not occupied:
+        for cx in range(cols):
+            for cy in range(rows):
+                clearance[(cx, cy)] = unbounded
+
+    return clearance
+
+def get_clearance_grid():
+    grid = _clearance_grid
+    version = game_state.get('spatial_version', 0)
+    if grid['version'] != version:
+        grid['version'] = version
+        grid['occupied'] = _collect_occupied_cells()
+        grid['pending'] = set()
+        grid['dirty'] = True
+
+    if grid['dirty']:
+        grid['clearance'] = _compute_clearance(grid['occupied'] | grid['pending'])
+        grid['dirty'] = False
+
+    return grid['clearance']
+
+def reserve_spawn_cell(position):
+    grid = _clearance_grid
+    cell = _clamped_grid_key(position['x'], position['y'])
+    grid['pending'].add(cell)
+    if grid['dirty']:
+        return
+
+    grid['clearance'][cell] = 0
+    _spread_clearance(grid['clearance'], deque([cell]))
+
+def required_clearance(min_distance):
+    return int(math.ceil(min_distance / GRID_SIZE)) + 1
+
+def find_safe_spawn_position(min_distance=SPAWN_MIN_DISTANCE):
+    min_x, min_y, max_x, max_y = get_spawn_bounds()
+    clearance = get_clearance_grid()
+    required = required_clearance(min_distance)
+
+    first_col, first_row = _clamped_grid_key(min_x, min_y)
+    last_col, last_row = _clamped_grid_key(max_x, max_y)
+
+    safe_cells = []
+    best_cells = []
+    best_value = -1
+    for cx in range(first_col, last_col + 1):
+        for cy in range(first_row, last_row + 1):
+            value = clearance.get((cx, cy), 0)
+            if value >= required:
+                safe_cells.append((cx, cy))
+            if value > best_value:
+                best_value = value
+                best_cells = [(cx, cy)]
+            elif value == best_value:
+                best_cells.append((cx, cy))
+
+    candidates = safe_cells or best_cells
+    cx, cy = random.choice(candidates)
+    for _ in range(SPAWN_HEAD_ATTEMPTS):
+        if nearest_head_distance((cx + 0.5) * GRID_SIZE, (cy + 0.5) * GRID_SIZE, SPAWN_HEAD_DISTANCE) is None:
+            break
+        cx, cy = random.choice(candidates)
+
+    cell_min_x = max(min_x, cx * GRID_SIZE)
+    cell_max_x = min(max_x, (cx + 1) * GRID_SIZE - 1)
+    cell_min_y = max(min_y, cy * GRID_SIZE)
+    cell_max_y = min(max_y, (cy + 1) * GRID_SIZE - 1)
+
+    position = {
+        'x': random.randint(int(cell_min_x), int(max(cell_min_x, cell_max_x))),
+        'y': random.randint(int(cell_min_y), int(max(cell_min_y, cell_max_y)))
+    }
+    reserve_spawn_cell(position)
+    return position
 
 def clamp(value, min_value, max_value):
     return max(min_value, min(max_value, value))
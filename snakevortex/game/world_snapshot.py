@@ -0,0 +1,99 @@
+import time
+from .game_state import game_state
+from .arena_system import get_arena, restore_arena
+from .bot_ai import bot_tier_name
+from .food_system import reindex_items
+from .name_index import index_entity
+from .sessions import export_sessions, restore_sessions
+
+WORLD_SNAPSHOT_VERSION = 1
+TRANSIENT_FIELDS = frozenset(('snake', 'powers', 'intent', 'personality', 'cached_nearby_food', 'last_food_scan', 'cpu_ms', 'last_ping'))
+SHIFTED_FIELDS = ('spawn_time_ms', 'spawn_protection', 'death_time', 'decision_cooldown', 'hunt_duration', 'last_mistake')
+
+def _flatten_snake(snake):
+    flat = []
+    for segment in snake:
+        flat.append(round(segment['x'], 2))
+        flat.append(round(segment['y'], 2))
+    return flat
+
+def _unflatten_snake(flat):
+    return [{'x': flat[i], 'y': flat[i + 1]} for i in range(0, len(flat) - 1, 2)]
+
+def _capture_entity(entity):
+    state = {key: value for key, value in entity.items() if key not in TRANSIENT_FIELDS}
+    state['snake'] = _flatten_snake(entity['snake'])
+    state['powers'] = dict(entity.get('powers') or {})
+    if 'intent' in entity:
+        state['intent'] = dict(entity['intent'])
+    if 'personality' in entity:
+        state['personality'] = dict(entity['personality'])
+    return state
+
+def _restore_entity(state, offset_ms):
+    entity = dict(state)
+    entity['snake'] = _unflatten_snake(state['snake'])
+    entity['powers'] = {power: expires + offset_ms for power, expires in state['powers'].items()}
+    for field in SHIFTED_FIELDS:
+        if entity.get(field):
+            entity[field] += offset_ms
+    return entity
+
+def capture_world(now_ms=None):
+    if now_ms is None:
+        now_ms = time.time() * 1000
+
+    sessions = export_sessions()
+    players = [
+        _capture_entity(player)
+        for player in game_state['players'].values()
+        if player['alive'] and player['id'] in sessions
+    ]
+    bots = [_capture_entity(bot) for bot in game_state['bots'].values() if bot['alive']]
+
+    return {
+        'version': WORLD_SNAPSHOT_VERSION,
+        'captured_at_ms': now_ms,
+        'arena': dict(get_arena().to_wire()),
+        'food': [(f['x'], f['y'], f['size'], f['color']) for f in game_state['food'] if f.get('scale', 1.0) > 0],
+        'power_food': [(p['x'], p['y'], p['size'], p['color'], p['type'], p['duration']) for p in game_state['power_food'] if p.get('scale', 1.0) > 0],
+        'players': players,
+        'bots': bots,
+        'sessions': {player['id']: sessions[player['id']] for player in players}
+    }
+
+def restore_world(world, now_ms, reclaim_grace_ms):
+    offset_ms = now_ms - world['captured_at_ms']
+    restore_arena(world['arena'], offset_ms)
+
+    game_state['food'] = [
+        {'x': x, 'y': y, 'size': size, 'color': color, 'scale': 1.0, 'created_at': now_ms}
+        for x, y, size, color in world['food']
+    ]
+    game_state['power_food'] = [
+        {'x': x, 'y': y, 'size': size, 'color': color, 'type': power_type, 'duration': duration, 'scale': 1.0, 'created_at': now_ms}
+        for x, y, size, color, power_type, duration in world['power_food']
+    ]
+    reindex_items()
+
+    last_ping = time.time()
+    for state in world['players']:
+        player = _restore_entity(state, offset_ms)
+        player['last_ping'] = last_ping
+        game_state['players'][player['id']] = player
+        index_entity(player)
+
+    for state in world['bots']:
+        bot = _restore_entity(state, offset_ms)
+        intent = bot.get('intent')
+        if intent and intent.get('until_ms'):
+            intent['until_ms'] += offset_ms
+        bot['tier'] = bot_tier_name(bot)
+        bot['cpu_ms'] = 0.0
+        bot['cached_nearby_food'] = []
+        bot['last_food_scan'] = 0
+        game_state['bots'][bot['id']] = bot
+        index_entity(bot)
+
+    restore_sessions(world['sessions'], now_ms + reclaim_grace_ms)
+    game_state['spatial_grid'].clear()
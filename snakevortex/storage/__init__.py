@@ -0,0 +1,2 @@
+from .score_store import ScoreStore
+from .world_store import WorldStore
@@ -0,0 +1,251 @@
+import asyncio
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from snakevortex.config import (
+    STORE_BATCH_SIZE,
+    STORE_FLUSH_INTERVAL,
+    STORE_LEADERBOARD_TTL,
+    STORE_PATH,
+    STORE_QUEUE_LIMIT,
+)
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS profiles (
+        name_key TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        first_seen REAL NOT NULL,
+        last_seen REAL NOT NULL,
+        matches INTEGER NOT NULL,
+        best_score INTEGER NOT NULL,
+        best_length INTEGER NOT NULL,
+        total_score INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS matches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name_key TEXT NOT NULL,
+        name TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        length INTEGER NOT NULL,
+        started_at REAL NOT NULL,
+        ended_at REAL NOT NULL,
+        cause TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS profiles_best_score ON profiles (best_score DESC)",
+    "CREATE INDEX IF NOT EXISTS matches_name_key ON matches (name_key)",
+)
+
+INSERT_MATCH = """
+    INSERT INTO matches (name_key, name, score, length, started_at, ended_at, cause)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_PROFILE = """
+    INSERT INTO profiles (name_key, name, first_seen, last_seen, matches, best_score, best_length, total_score)
+    VALUES (?, ?, ?, ?, 1, ?, ?, ?)
+    ON CONFLICT (name_key) DO UPDATE SET
+        name = excluded.name,
+        last_seen = excluded.last_seen,
+        matches = matches + 1,
+        best_score = MAX(best_score, excluded.best_score),
+        best_length = MAX(best_length, excluded.best_length),
+        total_score = total_score + excluded.total_score
+"""
+
+SELECT_LEADERBOARD = """
+    SELECT name, best_score, best_length, matches
+    FROM profiles
+    ORDER BY best_score DESC, last_seen ASC
+    LIMIT ?
+"""
+
+SELECT_PROFILE = """
+    SELECT name, first_seen, last_seen, matches, best_score, best_length, total_score
+    FROM profiles
+    WHERE name_key = ?
+"""
+
+
+class ScoreStore:
+    def __init__(
+        self,
+        path=STORE_PATH,
+        flush_interval=STORE_FLUSH_INTERVAL,
+        batch_size=STORE_BATCH_SIZE,
+        queue_limit=STORE_QUEUE_LIMIT,
+        leaderboard_ttl=STORE_LEADERBOARD_TTL,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue_limit = queue_limit
+        self.leaderboard_ttl = leaderboard_ttl
+        self.pending = deque()
+        self.records_written = 0
+        self.records_dropped = 0
+        self.write_ms = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="score-store")
+        self._connection = None
+        self._wakeup = None
+        self._flusher = None
+        self._leaderboard = {}
+
+    def record_match(self, record):
+        if len(self.pending) >= self.queue_limit:
+            self.pending.popleft()
+            self.records_dropped += 1
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self):
+        await self._run(self._open)
+        self._wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        while self.pending and self._connection is not None:
+            await self.flush()
+        await self._run(self._close)
+        self._executor.shutdown(wait=True)
+
+    async def flush(self):
+        if not self.pending:
+            return 0
+
+        batch = []
+        while self.pending and len(batch) < self.batch_size:
+            batch.append(self.pending.popleft())
+
+        started = time.perf_counter()
+        try:
+            await self._run(self._write_batch, batch)
+        except Exception as exc:
+            self.records_dropped += len(batch)
+            print(f"Score store write failed: {exc}")
+            return 0
+
+        self.write_ms += (time.perf_counter() - started) * 1000
+        self.records_written += len(batch)
+        self._leaderboard.clear()
+        return len(batch)
+
+    async def top_scores(self, limit=10):
+        now = time.monotonic()
+        cached = self._leaderboard.get(limit)
+        if cached is not None and now < cached[0]:
+            return await asyncio.shield(cached[1])
+
+        pending = asyncio.ensure_future(self._run(self._read_leaderboard, limit))
+        self._leaderboard[limit] = (now + self.leaderboard_ttl, pending)
+        try:
+            return await asyncio.shield(pending)
+        except Exception:
+            self._leaderboard.pop(limit, None)
+            raise
+
+    async def get_profile(self, name):
+        return await self._run(self._read_profile, name.casefold())
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self.pending:
+                if not await self.flush():
+                    break
+
+    def _run(self, function, *args):
+        return asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _open(self):
+        if self._connection is not None:
+            return
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _write_batch(self, batch):
+        matches = []
+        profiles = []
+        for record in batch:
+            key = record["name"].casefold()
+            matches.append((
+                key,
+                record["name"],
+                record["score"],
+                record["length"],
+                record["started_at"],
+                record["ended_at"],
+                record["cause"],
+            ))
+            profiles.append((
+                key,
+                record["name"],
+                record["started_at"],
+                record["ended_at"],
+                record["score"],
+                record["length"],
+                record["score"],
+            ))
+
+        with self._connection:
+            self._connection.executemany(INSERT_MATCH, matches)
+            self._connection.executemany(UPSERT_PROFILE, profiles)
+
+    def _read_leaderboard(self, limit):
+        rows = self._connection.execute(SELECT_LEADERBOARD, (limit,)).fetchall()
+        return [
+            {"name": name, "best_score": best_score, "best_length": best_length, "matches": matches}
+            for name, best_score, best_length, matches in rows
+        ]
+
+    def _read_profile(self, name_key):
+        row = self._connection.execute(SELECT_PROFILE, (name_key,)).fetchone()
+        if row is None:
+            return None
+        name, first_seen, last_seen, matches, best_score, best_length, total_score = row
+        return {
+            "name": name,
+            "first_seen": first_seen,
+            "last_seen": last_seen,
+            "matches": matches,
+            "best_score": best_score,
+            "best_length": best_length,
+            "total_score": total_score,
+        }
+
+    def stats(self):
+        return {
+            "pending": len(self.pending),
+            "written": self.records_written,
+            "dropped": self.records_dropped,
+            "write_ms": round(self.write_ms, 2),
+        }
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from snakevortex.config import WORLD_SNAPSHOT_INTERVAL, WORLD_SNAPSHOT_MAX_AGE, WORLD_SNAPSHOT_PATH
+from snakevortex.game.room import is_room_active
+from snakevortex.game.world_snapshot import WORLD_SNAPSHOT_VERSION, capture_world
+
+WORLD_COMPRESSION_LEVEL = 6
+
+
+class WorldStore:
+    def __init__(self, path=WORLD_SNAPSHOT_PATH, interval=WORLD_SNAPSHOT_INTERVAL, max_age=WORLD_SNAPSHOT_MAX_AGE):
+        self.path = Path(path)
+        self.interval = interval
+        self.max_age = max_age
+        self.saves = 0
+        self.failures = 0
+        self.capture_ms = 0.0
+        self.write_ms = 0.0
+        self.snapshot_bytes = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="world-store")
+        self._saver = None
+
+    def start(self):
+        if self._saver is None:
+            self._saver = asyncio.create_task(self._save_loop())
+
+    async def close(self):
+        if self._saver is not None:
+            self._saver.cancel()
+            try:
+                await self._saver
+            except asyncio.CancelledError:
+                pass
+            self._saver = None
+
+        await self.save()
+        self._executor.shutdown(wait=True)
+
+    async def load(self):
+        world = await self._run(self._read)
+        if world is None:
+            return None
+
+        age = time.time() - world["captured_at_ms"] / 1000
+        if age > self.max_age:
+            print(f"Ignoring world snapshot from {age:.0f}s ago")
+            return None
+        return world
+
+    async def save(self):
+        if not is_room_active():
+            return False
+
+        started = time.perf_counter()
+        world = capture_world()
+        self.capture_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        try:
+            self.snapshot_bytes = await self._run(self._write, world)
+        except Exception as exc:
+            self.failures += 1
+            print(f"World snapshot failed: {exc}")
+            return False
+
+        self.write_ms = (time.perf_counter() - started) * 1000
+        self.saves += 1
+        return True
+
+    async def _save_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.save()
+
+    def _run(self, function, *args):
+        return asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _write(self, world):
+        payload = zlib.compress(json.dumps(world, separators=(",", ":")).encode("utf-8"), WORLD_COMPRESSION_LEVEL)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        with open(temporary, "wb") as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.path)
+        return len(payload)
+
+    def _read(self):
+        try:
+            payload = self.path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            world = json.loads(zlib.decompress(payload))
+        except (zlib.error, ValueError) as exc:
+            print(f"Discarding unreadable world snapshot: {exc}")
+            return None
+
+        if not isinstance(world, dict) or world.get("version") != WORLD_SNAPSHOT_VERSION:
+            return None
+        return world
+
+    def stats(self):
+        return {
+            "saves": self.saves,
+            "failures": self.failures,
+            "capture_ms": round(self.capture_ms, 2),
+            "write_ms": round(self.write_ms, 2),
+            "bytes": self.snapshot_bytes,
+        }
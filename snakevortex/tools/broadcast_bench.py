@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import time
+
+from wsproto.connection import Connection, ConnectionType
+from wsproto.events import BytesMessage, TextMessage
+from wsproto.extensions import PerMessageDeflate
+
+from snakevortex.config import SNAPSHOT_MIN_INTERVAL_MS
+from snakevortex.game import game_loop
+from snakevortex.game.bot_ai import create_bot
+from snakevortex.game.game_state import BOT_COUNT, connected_clients
+from snakevortex.game.room import prepare_room
+from snakevortex.web.compression import CompressionSettings, FrameCompressor
+from snakevortex.web.connection import ClientConnection
+
+MODES = ("text", "binary", "shared-deflate", "stream-deflate")
+
+
+class FramingSocket:
+    def __init__(self, permessage_deflate):
+        extensions = []
+        if permessage_deflate:
+            extension = PerMessageDeflate()
+            extension.accept("permessage-deflate")
+            extensions.append(extension)
+        self.connection = Connection(ConnectionType.SERVER, extensions=extensions)
+        self.frames = 0
+        self.wire_bytes = 0
+
+    async def send(self, message):
+        if isinstance(message, str):
+            event = TextMessage(data=message)
+        else:
+            event = BytesMessage(data=bytes(message))
+        self.wire_bytes += len(self.connection.send(event))
+        self.frames += 1
+
+
+def create_client(index, mode, permessage_deflate):
+    client = ClientConnection(FramingSocket(permessage_deflate))
+    client.player_id = f"bench-{index}"
+    client.binary_frames = mode != "text"
+    if mode == "shared-deflate":
+        client.compressor = FrameCompressor(CompressionSettings(context_takeover=False))
+    elif mode == "stream-deflate":
+        client.compressor = FrameCompressor(CompressionSettings(context_takeover=True))
+    return client
+
+
+async def drain(clients, expected_frames):
+    while any(client.socket.frames < expected_frames for client in clients):
+        await asyncio.sleep(0)
+
+
+async def run_case(mode, client_count, ticks, permessage_deflate):
+    clients = [create_client(index, mode, permessage_deflate) for index in range(client_count)]
+    for client in clients:
+        connected_clients.add(client)
+        client.start()
+
+    broadcast_ms = 0.0
+    total_ms = 0.0
+    try:
+        for tick in range(1, ticks + 1):
+            await game_loop.update_game_state()
+            for client in clients:
+                client.last_frame_sent_ms = 0.0
+
+            started = time.perf_counter()
+            await game_loop.broadcast_game_state()
+            broadcast_ms += (time.perf_counter() - started) * 1000
+            await drain(clients, tick)
+            total_ms += (time.perf_counter() - started) * 1000
+    finally:
+        for client in clients:
+            await client.close()
+
+    wire_bytes = sum(client.socket.wire_bytes for client in clients)
+    per_tick_ms = total_ms / ticks
+    per_client_us = (total_ms - broadcast_ms) / ticks / client_count * 1000
+    return {
+        "mode": mode,
+        "clients": client_count,
+        "tick_ms": per_tick_ms,
+        "encode_ms": broadcast_ms / ticks,
+        "per_client_us": per_client_us,
+        "bytes_per_frame": wire_bytes / ticks / client_count,
+        "max_clients": int(SNAPSHOT_MIN_INTERVAL_MS * 1000 / per_client_us) if per_client_us > 0 else 0,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure the cost of fanning one snapshot out to N websocket clients.")
+    parser.add_argument("--clients", default="10,100,500", help="comma separated client counts")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma separated subset of " + ", ".join(MODES))
+    parser.add_argument("--ticks", type=int, default=30, help="broadcasts measured per case")
+    parser.add_argument("--bots", type=int, default=24, help="bots in the simulated world")
+    parser.add_argument("--permessage-deflate", action="store_true", help="frame like a server that negotiated permessage-deflate")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    prepare_room()
+    for _ in range(60):
+        await game_loop.update_game_state()
+    for _ in range(max(0, args.bots - BOT_COUNT)):
+        create_bot()
+
+    print(f"{'mode':<16}{'clients':>8}{'tick ms':>10}{'encode ms':>11}{'us/client':>11}{'bytes/frame':>13}{'max clients':>13}")
+    for mode in args.modes.split(","):
+        for client_count in (int(value) for value in args.clients.split(",")):
+            result = await run_case(mode.strip(), client_count, args.ticks, args.permessage_deflate)
+            print(
+                f"{result['mode']:<16}{result['clients']:>8}{result['tick_ms']:>10.2f}{result['encode_ms']:>11.2f}"
+                f"{result['per_client_us']:>11.1f}{result['bytes_per_frame']:>13.0f}{result['max_clients']:>13}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
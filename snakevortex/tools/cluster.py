@@ -0,0 +1,73 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from snakevortex.config import ROUTER_PORT, SERVER_PORT
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def hypercorn(module, port):
+    return [sys.executable, "-m", "hypercorn", f"{module}:app", "--bind", f"127.0.0.1:{port}"]
+
+
+def room_env(index, port, args):
+    env = dict(os.environ)
+    env.update(
+        SNAKEVORTEX_NODE_ID=f"room-{index}",
+        SNAKEVORTEX_PORT=str(port),
+        SNAKEVORTEX_PUBLIC_URL=f"http://127.0.0.1:{port}",
+        SNAKEVORTEX_WORLD_SNAPSHOT=f"data/world-room-{index}.snapshot",
+    )
+    if args.discovery == "directory":
+        env["SNAKEVORTEX_DIRECTORY_URL"] = f"http://127.0.0.1:{args.router_port}"
+    return env
+
+
+def router_env(ports, args):
+    env = dict(os.environ)
+    env.update(SNAKEVORTEX_DISCOVERY=args.discovery, SNAKEVORTEX_ROUTER_PORT=str(args.router_port))
+    if args.discovery == "static":
+        env["SNAKEVORTEX_BACKENDS"] = ",".join(f"http://127.0.0.1:{port}" for port in ports)
+    return env
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run a router and several game rooms as local processes.")
+    parser.add_argument("--rooms", type=int, default=2)
+    parser.add_argument("--router-port", type=int, default=ROUTER_PORT)
+    parser.add_argument("--base-port", type=int, default=SERVER_PORT, help="port of the first room; the rest follow")
+    parser.add_argument("--discovery", choices=("directory", "static"), default="directory")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    ports = [args.base_port + index for index in range(args.rooms)]
+    processes = [subprocess.Popen(hypercorn("router", args.router_port), cwd=ROOT, env=router_env(ports, args))]
+    for index, port in enumerate(ports, start=1):
+        processes.append(subprocess.Popen(hypercorn("app", port), cwd=ROOT, env=room_env(index, port, args)))
+
+    print(f"Router on http://127.0.0.1:{args.router_port} with {args.rooms} rooms ({args.discovery} discovery); Ctrl+C to stop")
+    try:
+        while all(process.poll() is None for process in processes):
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.send_signal(signal.SIGINT)
+        for process in processes:
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+if __name__ == "__main__":
+    main()
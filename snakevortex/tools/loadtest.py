@@ -0,0 +1,338 @@
+import argparse
+import asyncio
+import ipaddress
+import json
+import math
+import random
+import statistics
+import time
+import zlib
+from urllib.parse import urlencode, urlparse
+
+import websockets
+
+from snakevortex.config import MIN_MOVE_INTERVAL_MS, SERVER_PORT
+from snakevortex.web.compression import COMPRESSION_FORMAT, STREAM_HEADER
+from snakevortex.web.frames import FRAME_DEFLATE, FRAME_DEFLATE_STREAM, FRAME_JSON
+from snakevortex.web.security import DIRECTION_STEPS, INPUT_MOVE, INPUT_PING, MOVE_FORMAT, PING_FORMAT
+
+PING_INTERVAL_S = 1.0
+TURN_RATE = 0.15
+LOOPBACK_SOURCE_ADDRESSES = "127.0.0.2-127.0.0.254"
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def source_addresses(spec, url):
+    if spec is None:
+        host = urlparse(url).hostname or ""
+        spec = LOOPBACK_SOURCE_ADDRESSES if host.startswith("127.") else ""
+    if not spec:
+        return [None]
+    first, _, last = spec.partition("-")
+    start = ipaddress.ip_address(first)
+    end = ipaddress.ip_address(last or first)
+    return [str(ipaddress.ip_address(value)) for value in range(int(start), int(end) + 1)]
+
+
+class Report:
+    def __init__(self):
+        self.connected = 0
+        self.failed = 0
+        self.players = 0
+        self.spectators = 0
+        self.rejected = 0
+        self.frames = 0
+        self.wire_bytes = []
+        self.payload_bytes = []
+        self.intervals = {"player": [], "spectator": []}
+        self.input_latency = []
+        self.resumes = 0
+        self.resume_failures = 0
+        self.resume_latency = []
+        self.server_stats = []
+        self.errors = {}
+
+    def error(self, kind):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def interval_summary(self, role):
+        intervals = self.intervals[role]
+        return {
+            f"{role}_interval_ms_p50": round(percentile(intervals, 0.5), 2),
+            f"{role}_interval_ms_p99": round(percentile(intervals, 0.99), 2),
+            f"{role}_jitter_ms": round(statistics.pstdev(intervals), 2) if len(intervals) > 1 else 0.0,
+        }
+
+    def summary(self, duration_s):
+        server = self.server_stats
+        return {
+            "clients": {
+                "connected": self.connected,
+                "failed": self.failed,
+                "players": self.players,
+                "spectators": self.spectators,
+                "rejected": self.rejected,
+            },
+            "frames": {
+                "received": self.frames,
+                "per_second": round(self.frames / duration_s, 1) if duration_s else 0.0,
+                **self.interval_summary("player"),
+                **self.interval_summary("spectator"),
+            },
+            "payload": {
+                "wire_bytes_mean": round(statistics.fmean(self.wire_bytes)) if self.wire_bytes else 0,
+                "wire_bytes_p95": percentile(self.wire_bytes, 0.95),
+                "json_bytes_mean": round(statistics.fmean(self.payload_bytes)) if self.payload_bytes else 0,
+                "megabits_per_second": round(sum(self.wire_bytes) * 8 / duration_s / 1e6, 2) if duration_s else 0.0,
+            },
+            "resume": {
+                "resumed": self.resumes,
+                "failed": self.resume_failures,
+                "latency_ms_p50": round(percentile(self.resume_latency, 0.5), 2),
+                "latency_ms_p95": round(percentile(self.resume_latency, 0.95), 2),
+            },
+            "input_latency_ms": {
+                "samples": len(self.input_latency),
+                "p50": round(percentile(self.input_latency, 0.5), 2),
+                "p95": round(percentile(self.input_latency, 0.95), 2),
+                "p99": round(percentile(self.input_latency, 0.99), 2),
+            },
+            "server": {
+                "tick_ms": round(statistics.fmean(s["tick_ms"] for s in server), 2) if server else None,
+                "tick_max_ms": max(s["tick_max_ms"] for s in server) if server else None,
+                "broadcast_ms": round(statistics.fmean(s["broadcast_ms"] for s in server), 2) if server else None,
+                "tick_interval_ms": round(statistics.fmean(s["tick_interval_ms"] for s in server), 2) if server else None,
+                "clients": max(s["clients"] for s in server) if server else None,
+                "ai_ms": server[-1]["ai"]["ai_ms"] if server and server[-1].get("ai") else None,
+                "sessions": server[-1].get("sessions") if server else None,
+            },
+            "errors": self.errors,
+        }
+
+
+class LoadClient:
+    def __init__(self, index, args, report, local_addr):
+        self.index = index
+        self.args = args
+        self.report = report
+        self.local_addr = local_addr
+        self.player_id = None
+        self.resume_token = None
+        self.room = None
+        self.connect_started = None
+        self.seq = 0
+        self.direction = random.uniform(0, 2 * math.pi)
+        self.sent_inputs = {}
+        self.acked_seq = None
+        self.last_frame_at = None
+        self.stream = None
+
+    def decode(self, message):
+        if isinstance(message, str):
+            return message
+        tag = message[0]
+        if tag == FRAME_JSON:
+            return message[1:].decode("utf-8")
+        if tag == FRAME_DEFLATE:
+            return zlib.decompress(message[1:], -15).decode("utf-8")
+        if tag == FRAME_DEFLATE_STREAM:
+            if self.stream is None:
+                self.stream = zlib.decompressobj(-15)
+            return self.stream.decompress(message[STREAM_HEADER.size:]).decode("utf-8")
+        raise ValueError("unknown frame tag")
+
+    async def run(self, deadline):
+        while time.perf_counter() < deadline:
+            until = deadline
+            if self.args.flap_every:
+                until = min(deadline, time.perf_counter() + random.uniform(0.5, 1.5) * self.args.flap_every)
+            if not await self.connect(until):
+                return
+
+    async def connect(self, until):
+        kwargs = {"max_size": None, "open_timeout": 10}
+        if not self.args.permessage_deflate:
+            kwargs["compression"] = None
+        if self.local_addr:
+            kwargs["local_addr"] = (self.local_addr, 0)
+
+        self.connect_started = time.perf_counter()
+        self.last_frame_at = None
+        self.stream = None
+        try:
+            url = self.args.url
+            if self.resume_token and self.room:
+                url = f"{url}?{urlencode({'room': self.room})}"
+            async with websockets.connect(url, **kwargs) as socket:
+                self.report.connected += 1
+                await socket.send(json.dumps({
+                    "type": "hello",
+                    "frames": ["binary"],
+                    "compression": [COMPRESSION_FORMAT] if self.args.compression else [],
+                    "server_stats": self.index == 0,
+                }))
+                if self.resume_token:
+                    await socket.send(json.dumps({"type": "resume", "token": self.resume_token}))
+                else:
+                    await socket.send(json.dumps({"type": "join", "name": f"load{self.index}", "color": "#4ecdc4"}))
+
+                tasks = [asyncio.create_task(self.send_inputs(socket)), asyncio.create_task(self.send_pings(socket))]
+                try:
+                    await self.receive(socket, until)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+        except (OSError, asyncio.TimeoutError, websockets.InvalidHandshake) as exc:
+            self.report.failed += 1
+            self.report.error(type(exc).__name__)
+            return False
+        except websockets.ConnectionClosed:
+            self.report.error("ConnectionClosed")
+            return False
+        return True
+
+    async def receive(self, socket, deadline):
+        report = self.report
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            try:
+                message = await asyncio.wait_for(socket.recv(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+            arrived = time.perf_counter()
+            text = self.decode(message)
+            data = json.loads(text)
+            message_type = data.get("type")
+
+            if message_type == "game_state":
+                report.frames += 1
+                report.wire_bytes.append(len(message))
+                report.payload_bytes.append(len(text))
+                if self.last_frame_at is not None:
+                    role = "player" if self.player_id else "spectator"
+                    report.intervals[role].append((arrived - self.last_frame_at) * 1000)
+                self.last_frame_at = arrived
+                self.track_ack(data, arrived)
+            elif message_type == "player_id":
+                self.player_id = data.get("player_id")
+                self.resume_token = data.get("resume_token")
+                self.room = data.get("room")
+                if data.get("resumed"):
+                    report.resumes += 1
+                    report.resume_latency.append((arrived - self.connect_started) * 1000)
+                else:
+                    report.players += 1
+            elif message_type == "resume_failed":
+                report.resume_failures += 1
+                self.player_id = None
+                self.resume_token = None
+                await socket.send(json.dumps({"type": "join", "name": f"load{self.index}", "color": "#4ecdc4"}))
+            elif message_type == "error":
+                if data.get("message") == "Server is full":
+                    report.spectators += 1
+                else:
+                    report.error(data.get("message") or "error")
+            elif message_type == "spectator_full":
+                report.rejected += 1
+            elif message_type == "net_stats" and data.get("server"):
+                if self.index == 0:
+                    report.server_stats.append(data["server"])
+
+    def track_ack(self, data, arrived):
+        player = (data.get("players") or {}).get(self.player_id) if self.player_id else None
+        if not player:
+            return
+
+        seq = player.get("input_seq")
+        if seq is None or seq == self.acked_seq:
+            return
+        self.acked_seq = seq
+
+        sent_at = self.sent_inputs.pop(seq, None)
+        if sent_at is not None:
+            self.report.input_latency.append((arrived - sent_at) * 1000)
+        if len(self.sent_inputs) > 256:
+            self.sent_inputs.clear()
+
+    async def send_inputs(self, socket):
+        interval = self.args.move_interval_ms / 1000
+        while True:
+            await asyncio.sleep(interval)
+            if self.player_id is None:
+                continue
+
+            self.direction = (self.direction + random.uniform(-TURN_RATE, TURN_RATE)) % (2 * math.pi)
+            self.seq = (self.seq + 1) & 0xFFFF
+            quantized = int(self.direction / (2 * math.pi) * DIRECTION_STEPS) % DIRECTION_STEPS
+            self.sent_inputs[self.seq] = time.perf_counter()
+            await socket.send(MOVE_FORMAT.pack(INPUT_MOVE, self.seq, quantized, 0))
+
+    async def send_pings(self, socket):
+        while True:
+            await asyncio.sleep(PING_INTERVAL_S)
+            await socket.send(PING_FORMAT.pack(INPUT_PING, 0))
+
+
+async def run_load(args):
+    report = Report()
+    addresses = source_addresses(args.source_addresses, args.url)
+    started = time.perf_counter()
+    deadline = started + args.ramp + args.duration
+    clients = []
+
+    for index in range(args.clients):
+        client = LoadClient(index, args, report, addresses[index % len(addresses)])
+        clients.append(asyncio.create_task(client.run(deadline)))
+        if args.ramp:
+            await asyncio.sleep(args.ramp / args.clients)
+
+    await asyncio.gather(*clients)
+    return report.summary(time.perf_counter() - started)
+
+
+def print_summary(summary):
+    for section, values in summary.items():
+        print(section)
+        for key, value in values.items():
+            print(f"  {key:<22}{value}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Spawn headless websocket clients against a running server and report frame and latency stats.")
+    parser.add_argument("--url", default=f"ws://127.0.0.1:{SERVER_PORT}/ws")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds measured after the ramp")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds spent opening connections")
+    parser.add_argument("--move-interval-ms", type=float, default=MIN_MOVE_INTERVAL_MS)
+    parser.add_argument("--flap-every", type=float, default=0.0, help="drop and resume each connection roughly every N seconds")
+    parser.add_argument("--no-compression", dest="compression", action="store_false", help="do not offer snapshot compression")
+    parser.add_argument("--no-permessage-deflate", dest="permessage_deflate", action="store_false")
+    parser.add_argument(
+        "--source-addresses",
+        default=None,
+        help="range of local addresses to spread connections over, e.g. 127.0.0.2-127.0.0.254 (the default for loopback targets); empty to disable",
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    summary = asyncio.run(run_load(args))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
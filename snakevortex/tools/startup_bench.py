@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from snakevortex.app import create_app
+from snakevortex.config import CLUSTER_TICK_BUDGET_MS, STARTUP_BUDGET_MS
+from snakevortex.game import game_loop
+from snakevortex.game.game_state import BOT_COUNT, FOOD_COUNT, game_state
+from snakevortex.game.room import prepare_room
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+IMPORT_PROBE = "import time; started = time.perf_counter(); import snakevortex.app; print((time.perf_counter() - started) * 1000)"
+MAX_SEED_TICKS = 120
+
+
+def elapsed_ms(started):
+    return (time.perf_counter() - started) * 1000
+
+
+def measure_import(runs):
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+        samples.append(float(result.stdout))
+    return statistics.median(samples)
+
+
+def room_seeded():
+    alive_bots = sum(1 for bot in game_state["bots"].values() if bot["alive"])
+    return alive_bots >= BOT_COUNT and len(game_state["food"]) >= FOOD_COUNT
+
+
+async def measure_startup():
+    started = time.perf_counter()
+    app = create_app()
+    create_ms = elapsed_ms(started)
+
+    started = time.perf_counter()
+    await app.startup()
+    startup_ms = elapsed_ms(started)
+
+    started = time.perf_counter()
+    prepare_room()
+    activation_ms = elapsed_ms(started)
+
+    tick_times = []
+    seeding = time.perf_counter()
+    while not room_seeded() and len(tick_times) < MAX_SEED_TICKS:
+        started = time.perf_counter()
+        await game_loop.update_game_state()
+        tick_times.append(elapsed_ms(started))
+    seed_ms = elapsed_ms(seeding)
+
+    await app.shutdown()
+    return {
+        "create_app_ms": round(create_ms, 2),
+        "startup_ms": round(startup_ms, 2),
+        "activation_ms": round(activation_ms, 2),
+        "seed_ticks": len(tick_times),
+        "seed_ms": round(seed_ms, 2),
+        "seed_tick_max_ms": round(max(tick_times, default=0.0), 2),
+        "seeded": room_seeded(),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure how long a fresh room process takes to start serving and to seed its world.")
+    parser.add_argument("--import-runs", type=int, default=3, help="fresh interpreters used to time the imports")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS, help="budget for create_app plus startup")
+    parser.add_argument("--tick-budget-ms", type=float, default=CLUSTER_TICK_BUDGET_MS, help="budget for each seeding tick")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    import_ms = measure_import(args.import_runs)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        results = {"import_ms": round(import_ms, 2), **asyncio.run(measure_startup())}
+
+    ready_ms = results["create_app_ms"] + results["startup_ms"]
+    results["within_budget"] = (
+        ready_ms <= args.budget_ms and results["seed_tick_max_ms"] <= args.tick_budget_ms and results["seeded"]
+    )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for key, value in results.items():
+            print(f"{key:<18}{value}")
+        print(f"{'ready_ms':<18}{ready_ms:.2f} (budget {args.budget_ms:.0f} ms, seeding ticks {args.tick_budget_ms:.0f} ms)")
+
+    if not results["within_budget"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import struct
+import time
+import zlib
+
+from snakevortex.config import (
+    WS_COMPRESSION_CONTEXT_TAKEOVER,
+    WS_COMPRESSION_ENABLED,
+    WS_COMPRESSION_LEVEL,
+    WS_COMPRESSION_MEM_LEVEL,
+    WS_COMPRESSION_THRESHOLD,
+    WS_COMPRESSION_WINDOW_BITS,
+)
+from snakevortex.web.frames import FRAME_DEFLATE_STREAM
+
+COMPRESSION_FORMAT = "deflate-raw"
+STREAM_HEADER = struct.Struct("!BI")
+
+
+class CompressionSettings:
+    def __init__(
+        self,
+        enabled=WS_COMPRESSION_ENABLED,
+        level=WS_COMPRESSION_LEVEL,
+        window_bits=WS_COMPRESSION_WINDOW_BITS,
+        mem_level=WS_COMPRESSION_MEM_LEVEL,
+        threshold=WS_COMPRESSION_THRESHOLD,
+        context_takeover=WS_COMPRESSION_CONTEXT_TAKEOVER,
+    ):
+        self.enabled = enabled
+        self.level = level
+        self.window_bits = max(9, min(15, int(window_bits)))
+        self.mem_level = max(1, min(9, int(mem_level)))
+        self.threshold = threshold
+        self.context_takeover = context_takeover
+
+    def new_compressor(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, -self.window_bits, self.mem_level)
+
+    def to_wire(self):
+        return {
+            "type": "compression",
+            "format": COMPRESSION_FORMAT,
+            "context_takeover": self.context_takeover,
+            "threshold": self.threshold,
+        }
+
+
+shared_settings = CompressionSettings()
+
+
+class FrameCompressor:
+    def __init__(self, settings=shared_settings):
+        self.settings = settings
+        self._stream = settings.new_compressor() if settings.context_takeover else None
+        self.raw_bytes = 0
+        self.wire_bytes = 0
+        self.compress_ms = 0.0
+        self.shared_hits = 0
+
+    def encode(self, frame):
+        raw_size = len(frame)
+        if raw_size < self.settings.threshold:
+            payload = frame.data
+        elif self._stream is None:
+            payload, compressed_here = frame.deflated(self.settings)
+            if compressed_here:
+                self.compress_ms += frame.compress_ms
+            else:
+                self.shared_hits += 1
+        else:
+            started = time.process_time()
+            data = frame.raw
+            payload = STREAM_HEADER.pack(FRAME_DEFLATE_STREAM, len(data)) + self._stream.compress(data) + self._stream.flush(zlib.Z_SYNC_FLUSH)
+            self.compress_ms += (time.process_time() - started) * 1000
+
+        self.raw_bytes += raw_size
+        self.wire_bytes += len(payload)
+        return payload
+
+    def stats(self):
+        ratio = self.wire_bytes / self.raw_bytes if self.raw_bytes else 1.0
+        return {
+            "compression_ratio": round(ratio, 3),
+            "compress_ms": round(self.compress_ms, 2),
+            "shared_hits": self.shared_hits,
+        }
+
+
+def negotiate_compression(offered):
+    if not shared_settings.enabled:
+        return None
+    if not isinstance(offered, list) or COMPRESSION_FORMAT not in offered:
+        return None
+    return FrameCompressor()
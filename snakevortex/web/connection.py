@@ -0,0 +1,179 @@
+import asyncio
+import json
+import time
+from collections import deque
+
+from snakevortex.config import (
+    NET_STATS_INTERVAL_MS,
+    OUTBOUND_QUEUE_DEPTH,
+    RANK_UPDATE_INTERVAL_MS,
+    SNAPSHOT_MAX_INTERVAL_MS,
+    SNAPSHOT_MIN_INTERVAL_MS,
+)
+from snakevortex.game.game_state import connected_clients, tick_stats
+
+traffic = {"bytes_sent": 0}
+
+
+class ClientConnection:
+    def __init__(self, socket):
+        self.socket = socket
+        self.player_id = None
+        self.follow_target = None
+        self.spectator_admitted = False
+        self.rtt_ms = 0
+        self.compressor = None
+        self.binary_frames = False
+        self.server_stats = False
+        self.control_queue = deque()
+        self.pending_frame = None
+        self.frames_sent = 0
+        self.frames_coalesced = 0
+        self.messages_dropped = 0
+        self.messages_throttled = 0
+        self.send_interval_ms = SNAPSHOT_MIN_INTERVAL_MS
+        self.last_send_ms = 0.0
+        self.last_frame_sent_ms = 0.0
+        self.last_stats_ms = time.time() * 1000
+        self.rank = None
+        self.last_rank_ms = 0.0
+        self.closed = False
+        self._wakeup = asyncio.Event()
+        self._writer = None
+
+    def start(self):
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self):
+        self.closed = True
+        connected_clients.discard(self)
+        if self._writer is None:
+            return
+
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            pass
+        self._writer = None
+
+    def queue_depth(self):
+        return len(self.control_queue) + (1 if self.pending_frame is not None else 0)
+
+    def push_frame(self, message):
+        if self.closed:
+            return
+
+        if self.pending_frame is not None:
+            self.frames_coalesced += 1
+        self.pending_frame = message
+        self._wakeup.set()
+
+    def push_control(self, message):
+        if self.closed:
+            return
+
+        if len(self.control_queue) >= OUTBOUND_QUEUE_DEPTH:
+            self.control_queue.popleft()
+            self.messages_dropped += 1
+        self.control_queue.append(message)
+        self._wakeup.set()
+
+    def push_rank(self, rank, now_ms):
+        if rank == self.rank or now_ms - self.last_rank_ms < RANK_UPDATE_INTERVAL_MS:
+            return
+
+        self.rank = rank
+        self.last_rank_ms = now_ms
+        self.push_control(json.dumps({"type": "rank", "rank": rank}))
+
+    def encode_frame(self, frame):
+        if self.compressor is not None:
+            return self.compressor.encode(frame)
+        if self.binary_frames:
+            return frame.data
+        return frame.text
+
+    def update_rtt(self, rtt_ms):
+        self.rtt_ms = rtt_ms
+
+    def target_interval_ms(self):
+        interval = SNAPSHOT_MIN_INTERVAL_MS
+        if self.rtt_ms > 250:
+            interval = max(interval, 100)
+        elif self.rtt_ms > 120:
+            interval = max(interval, 50)
+        return min(interval, SNAPSHOT_MAX_INTERVAL_MS)
+
+    def adapt_send_rate(self, send_duration_ms):
+        target = self.target_interval_ms()
+        congested = send_duration_ms > self.send_interval_ms * 0.5 or len(self.control_queue) > OUTBOUND_QUEUE_DEPTH // 2
+
+        if congested:
+            interval = self.send_interval_ms * 1.25
+        else:
+            interval = self.send_interval_ms * 0.9
+
+        self.send_interval_ms = min(SNAPSHOT_MAX_INTERVAL_MS, max(target, interval))
+
+    def stats(self):
+        stats = {
+            "sent": self.frames_sent,
+            "coalesced": self.frames_coalesced,
+            "dropped": self.messages_dropped,
+            "throttled": self.messages_throttled,
+            "send_interval_ms": round(self.send_interval_ms, 1),
+            "rtt_ms": self.rtt_ms,
+        }
+        if self.compressor is not None:
+            stats.update(self.compressor.stats())
+        return stats
+
+    async def _send(self, message):
+        started = time.perf_counter()
+        await self.socket.send(message)
+        traffic["bytes_sent"] += len(message)
+        duration_ms = (time.perf_counter() - started) * 1000
+        self.last_send_ms = time.time() * 1000
+        return duration_ms
+
+    async def _write_loop(self):
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+                while self.control_queue:
+                    await self._send(self.control_queue.popleft())
+
+                if self.pending_frame is None:
+                    continue
+
+                wait_ms = self.last_frame_sent_ms + self.send_interval_ms - time.time() * 1000
+                if wait_ms > 0:
+                    await asyncio.sleep(wait_ms / 1000)
+
+                frame = self.pending_frame
+                self.pending_frame = None
+                if frame is None:
+                    continue
+
+                duration_ms = await self._send(self.encode_frame(frame))
+                self.frames_sent += 1
+                self.last_frame_sent_ms = time.time() * 1000
+                self.adapt_send_rate(duration_ms)
+
+                if self.last_frame_sent_ms - self.last_stats_ms >= NET_STATS_INTERVAL_MS:
+                    self.last_stats_ms = self.last_frame_sent_ms
+                    stats = {"type": "net_stats", **self.stats()}
+                    if self.server_stats:
+                        stats["server"] = tick_stats
+                    self.push_control(json.dumps(stats))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.closed = True
+            connected_clients.discard(self)
@@ -0,0 +1,45 @@
+import time
+import zlib
+
+FRAME_JSON = 0x00
+FRAME_DEFLATE = 0x01
+FRAME_DEFLATE_STREAM = 0x02
+
+_JSON_TAG = bytes([FRAME_JSON])
+_DEFLATE_TAG = bytes([FRAME_DEFLATE])
+
+
+class PreparedFrame:
+    __slots__ = ("text", "_raw", "_data", "_deflated", "compress_ms")
+
+    def __init__(self, text):
+        self.text = text
+        self._raw = None
+        self._data = None
+        self._deflated = None
+        self.compress_ms = 0.0
+
+    def __len__(self):
+        return len(self.text)
+
+    @property
+    def raw(self):
+        if self._raw is None:
+            self._raw = self.text.encode("utf-8")
+        return self._raw
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = _JSON_TAG + self.raw
+        return self._data
+
+    def deflated(self, settings):
+        if self._deflated is not None:
+            return self._deflated, False
+
+        started = time.process_time()
+        compressor = settings.new_compressor()
+        self._deflated = _DEFLATE_TAG + compressor.compress(self.raw) + compressor.flush(zlib.Z_FINISH)
+        self.compress_ms = (time.process_time() - started) * 1000
+        return self._deflated, True
@@ -2,8 +2,13 @@ import random
 import time
 import uuid
 
-from snakevortex.game.food_system import create_death_food
+from snakevortex.game.food_system import add_food, create_death_food
 from snakevortex.game.game_state import INITIAL_SNAKE_LENGTH, MAX_PLAYERS, game_state
+from snakevortex.game.input_queue import discard_inputs, queue_input
+from snakevortex.game.leaderboard import untrack_entity
+from snakevortex.game.match_events import end_match
+from snakevortex.game.name_index import index_entity, is_name_taken, unindex_entity
+from snakevortex.game.sessions import claim_session, detach_session, drop_session, is_detached, issue_session
 from snakevortex.game.snake_logic import create_snake
 from snakevortex.game.utils import find_safe_spawn_position
 
@@ -13,17 +18,7 @@ class PlayerService:
         return len(game_state["players"]) < MAX_PLAYERS
 
     def is_name_unique(self, name):
-        lowered = name.lower()
-
-        for player in game_state["players"].values():
-            if player["name"].lower() == lowered:
-                return False
-
-        for bot in game_state["bots"].values():
-            if bot["name"].lower() == lowered:
-                return False
-
-        return True
+        return not is_name_taken(name)
 
     def get_unique_name(self, base_name):
         if self.is_name_unique(base_name):
@@ -55,11 +50,13 @@ class PlayerService:
             "color": color,
             "powers": {},
             "ping": 0,
+            "input_seq": None,
             "spawn_time_ms": now_ms,
             "spawn_duration_ms": 700,
             "spawn_protection": now_ms + 5000,
             "last_ping": time.time(),
         }
+        index_entity(game_state["players"][player_id])
 
         return player_id, unique_name
 
@@ -73,11 +70,42 @@ class PlayerService:
 
         if drop_food and player.get("alive") and player.get("snake"):
             death_food = create_death_food(player["snake"], player.get("score", 0))
-            game_state["food"].extend(death_food)
-
+            add_food(death_food)
+
+        if player.get("alive"):
+            end_match(player, "disconnect")
+        untrack_entity(player_id)
+        unindex_entity(player_id)
+        drop_session(player_id)
+        discard_inputs(player_id)
         del game_state["players"][player_id]
 
-    def handle_move(self, player_id, direction, accelerating, last_move_ms, min_interval_ms):
+    def detach_player(self, player_id, grace_ms):
+        player = game_state["players"].get(player_id) if player_id else None
+        if not player or not player.get("alive"):
+            self.remove_player(player_id)
+            return
+
+        detach_session(player_id, time.time() * 1000 + grace_ms)
+        if not is_detached(player_id):
+            self.remove_player(player_id)
+            return
+
+        discard_inputs(player_id)
+
+    def start_session(self, player_id):
+        return issue_session(player_id)
+
+    def resume_session(self, token):
+        player_id, new_token = claim_session(token)
+        player = game_state["players"].get(player_id) if player_id else None
+        if not player:
+            return None, None
+
+        player["last_ping"] = time.time()
+        return player, new_token
+
+    def handle_move(self, player_id, direction, accelerating, last_move_ms, min_interval_ms, seq=None):
         if not player_id:
             return last_move_ms
 
@@ -89,9 +117,7 @@ class PlayerService:
         if not player or not player.get("alive"):
             return now_ms
 
-        player["direction"] = direction
-        player["desired_speed"] = 3.0 if accelerating else 2.0
-        player["last_ping"] = time.time()
+        queue_input(player_id, seq, direction, accelerating)
 
         return now_ms
 
@@ -1,45 +1,83 @@
 import asyncio
 import json
 
-from quart import abort, render_template, request, websocket
+from quart import abort, jsonify, render_template, request, url_for, websocket
 
-from snakevortex.config import MAX_WS_MESSAGE_SIZE, MIN_MOVE_INTERVAL_MS, PING_INTERVAL_MS
-from snakevortex.game.game_state import connected_clients
+from snakevortex.config import (
+    MAX_WS_MESSAGE_SIZE,
+    MIN_MOVE_INTERVAL_MS,
+    PING_INTERVAL_MS,
+    RESUME_GRACE_MS,
+    WS_MESSAGE_BURST,
+    WS_MESSAGE_RATE,
+)
+from snakevortex.game.game_state import MAX_SPECTATORS, connected_clients
+from snakevortex.game.room import activate_room
+from snakevortex.web.compression import negotiate_compression
+from snakevortex.web.connection import ClientConnection
 from snakevortex.web.player_service import PlayerService
-from snakevortex.web.security import parse_client_message, parse_direction, parse_ping, sanitize_color, sanitize_name
+from snakevortex.web.static_assets import IMMUTABLE_CACHE_CONTROL, PAGE_CACHE_CONTROL
+from snakevortex.web.security import (
+    TokenBucket,
+    client_address,
+    parse_binary_input,
+    parse_client_message,
+    parse_direction,
+    parse_follow_target,
+    parse_ping,
+    parse_sequence,
+    sanitize_color,
+    sanitize_name,
+)
 
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "Referrer-Policy": "no-referrer",
+    "Cross-Origin-Opener-Policy": "same-origin",
+    "Cross-Origin-Resource-Policy": "same-origin",
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+    "Content-Security-Policy": (
+        "default-src 'self'; "
+        "script-src 'self'; "
+        "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
+        "font-src 'self' https://fonts.gstatic.com data:; "
+        "img-src 'self' data: https:; "
+        "connect-src 'self' ws: wss:; "
+        "frame-ancestors 'none'"
+    ),
+}
+LEADERBOARD_API_DEFAULT = 10
+LEADERBOARD_API_MAX = 100
+LEADERBOARD_CACHE_CONTROL = "public, max-age=10"
 
-def register_routes(app, rate_limiter, security_checker):
-    player_service = PlayerService()
 
-    async def send_error(message):
-        await websocket.send(json.dumps({"type": "error", "message": message}))
+def register_page_routes(app, rate_limiter, assets):
+    @app.template_global()
+    def asset_url(filename):
+        return assets.url(filename) or url_for("static", filename=filename)
 
     @app.route("/")
     async def index():
-        client_ip = request.remote_addr
+        client_ip = client_address(request.remote_addr, request.headers)
         if not rate_limiter.is_allowed(client_ip):
             abort(429)
 
-        return await render_template("index.html")
+        page = assets.page("index.html")
+        if page is None:
+            page = assets.cache_page("index.html", await render_template("index.html"))
+        return assets.respond(page, request.headers, PAGE_CACHE_CONTROL)
+
+    @app.route("/assets/<path:filename>")
+    async def static_asset(filename):
+        asset = assets.get(filename)
+        if asset is None:
+            abort(404)
+        return assets.respond(asset, request.headers, IMMUTABLE_CACHE_CONTROL)
 
     @app.after_request
     async def add_security_headers(response):
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "no-referrer"
-        response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-        response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self'; "
-            "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
-            "font-src 'self' https://fonts.gstatic.com data:; "
-            "img-src 'self' data: https:; "
-            "connect-src 'self' ws: wss:; "
-            "frame-ancestors 'none'"
-        )
+        response.headers.update(SECURITY_HEADERS)
         return response
 
     @app.errorhandler(404)
@@ -50,49 +88,131 @@ def register_routes(app, rate_limiter, security_checker):
     async def rate_limit_exceeded(_error):
         return "Too many requests", 429
 
+
+def register_routes(app, rate_limiter, security_checker, assets, handshake_limiter, score_store, cluster_node):
+    player_service = PlayerService()
+    player_connections = {}
+    register_page_routes(app, rate_limiter, assets)
+
+    def send_error(connection, message):
+        connection.push_control(json.dumps({"type": "error", "message": message}))
+
+    def bind_player(connection, player_id):
+        previous = player_connections.get(player_id)
+        if previous is not None and previous is not connection:
+            previous.player_id = None
+        player_connections[player_id] = connection
+        connection.player_id = player_id
+
+    def release_player(connection):
+        player_id = connection.player_id
+        connection.player_id = None
+        if player_id and player_connections.get(player_id) is connection:
+            del player_connections[player_id]
+        return player_id
+
+    def count_spectators():
+        return sum(1 for client in connected_clients if not client.player_id and client.spectator_admitted)
+
+    @app.route("/api/leaderboard")
+    async def all_time_leaderboard():
+        limit = request.args.get("limit", LEADERBOARD_API_DEFAULT, type=int)
+        limit = max(1, min(LEADERBOARD_API_MAX, limit))
+        response = jsonify({"leaderboard": await score_store.top_scores(limit)})
+        response.headers["Cache-Control"] = LEADERBOARD_CACHE_CONTROL
+        return response
+
+    @app.route("/cluster/status")
+    async def cluster_status():
+        return jsonify(cluster_node.status())
+
     @app.websocket("/ws")
     async def websocket_endpoint():
         if not security_checker(websocket.headers):
             return
 
-        ws_client = websocket._get_current_object()
-        connected_clients.add(ws_client)
+        if not handshake_limiter.is_allowed(client_address(websocket.remote_addr, websocket.headers)):
+            abort(429)
+
+        activate_room()
+        message_bucket = TokenBucket(WS_MESSAGE_RATE, WS_MESSAGE_BURST)
+        connection = ClientConnection(websocket._get_current_object())
+        connection.spectator_admitted = count_spectators() < MAX_SPECTATORS
+        connection.start()
+        connected_clients.add(connection)
+
+        if not connection.spectator_admitted:
+            connection.push_control(json.dumps({"type": "spectator_full"}))
 
-        current_player_id = None
         last_move_ms = 0
         last_ping_ms = 0
 
         try:
             while True:
                 raw_message = await websocket.receive()
-                data = parse_client_message(raw_message, MAX_WS_MESSAGE_SIZE)
+                if not message_bucket.consume():
+                    connection.messages_throttled += 1
+                    continue
+
+                if isinstance(raw_message, (bytes, bytearray)):
+                    data = parse_binary_input(raw_message)
+                else:
+                    data = parse_client_message(raw_message, MAX_WS_MESSAGE_SIZE)
                 if not data:
                     continue
 
                 message_type = data.get("type")
 
                 if message_type == "join":
-                    if current_player_id:
-                        player_service.remove_player(current_player_id, drop_food=False)
+                    if connection.player_id:
+                        player_service.remove_player(release_player(connection), drop_food=False)
 
                     if not player_service.can_join():
-                        await send_error("Server is full")
+                        send_error(connection, "Server is full")
                         continue
 
                     name = sanitize_name(data.get("name", ""))
                     if not name:
-                        await send_error("Invalid nickname")
+                        send_error(connection, "Invalid nickname")
                         continue
 
                     color = sanitize_color(data.get("color"))
-                    current_player_id, unique_name = player_service.register_player(name, color)
+                    player_id, unique_name = player_service.register_player(name, color)
+                    bind_player(connection, player_id)
 
-                    await websocket.send(
+                    connection.push_control(
                         json.dumps(
                             {
                                 "type": "player_id",
-                                "player_id": current_player_id,
+                                "player_id": player_id,
                                 "assigned_name": unique_name,
+                                "resume_token": player_service.start_session(player_id),
+                                "room": cluster_node.node_id,
+                            }
+                        )
+                    )
+                    continue
+
+                if message_type == "resume":
+                    player, resume_token = player_service.resume_session(data.get("token"))
+                    if player is None:
+                        connection.push_control(json.dumps({"type": "resume_failed"}))
+                        continue
+
+                    if connection.player_id and connection.player_id != player["id"]:
+                        player_service.remove_player(release_player(connection), drop_food=False)
+
+                    bind_player(connection, player["id"])
+
+                    connection.push_control(
+                        json.dumps(
+                            {
+                                "type": "player_id",
+                                "player_id": player["id"],
+                                "assigned_name": player["name"],
+                                "resume_token": resume_token,
+                                "resumed": True,
+                                "room": cluster_node.node_id,
                             }
                         )
                     )
@@ -105,18 +225,35 @@ def register_routes(app, rate_limiter, security_checker):
 
                     accelerating = bool(data.get("accelerating", False))
                     last_move_ms = player_service.handle_move(
-                        current_player_id,
+                        connection.player_id,
                         direction,
                         accelerating,
                         last_move_ms,
                         MIN_MOVE_INTERVAL_MS,
+                        parse_sequence(data.get("seq")),
                     )
                     continue
 
+                if message_type == "hello":
+                    frames = data.get("frames")
+                    connection.binary_frames = isinstance(frames, list) and "binary" in frames
+                    connection.server_stats = data.get("server_stats") is True
+                    compressor = negotiate_compression(data.get("compression"))
+                    if compressor is not None and connection.compressor is None:
+                        connection.compressor = compressor
+                        connection.push_control(json.dumps(compressor.settings.to_wire()))
+                    continue
+
+                if message_type == "spectate":
+                    connection.follow_target = parse_follow_target(data.get("target"))
+                    continue
+
                 if message_type == "ping":
                     ping_value = parse_ping(data.get("ping"))
+                    connection.update_rtt(ping_value)
+                    connection.push_control(json.dumps({"type": "pong"}))
                     last_ping_ms = player_service.handle_ping(
-                        current_player_id,
+                        connection.player_id,
                         ping_value,
                         last_ping_ms,
                         PING_INTERVAL_MS,
@@ -128,5 +265,5 @@ def register_routes(app, rate_limiter, security_checker):
         except Exception as exc:
             print(f"WebSocket error: {exc}")
         finally:
-            connected_clients.discard(ws_client)
-            player_service.remove_player(current_player_id, drop_food=True)
+            await connection.close()
+            player_service.detach_player(release_player(connection), RESUME_GRACE_MS)
@@ -1,42 +1,100 @@
+import asyncio
+import hmac
 import json
 import math
 import re
+import struct
 import time
-from collections import defaultdict
+from collections import OrderedDict
 
-from snakevortex.config import DEFAULT_PLAYER_COLOR
+from snakevortex.config import (
+    CLUSTER_SECRET,
+    DEFAULT_PLAYER_COLOR,
+    RATE_LIMIT_EXPIRY_INTERVAL,
+    RATE_LIMIT_MAX_ENTRIES,
+    TRUSTED_PROXIES,
+)
 
 HEX_COLOR_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
+MAX_NAME_LENGTH = 15
+MAX_FOLLOW_TARGET_LENGTH = MAX_NAME_LENGTH + 5
+
+INPUT_MOVE = 0x01
+INPUT_PING = 0x02
+MOVE_FORMAT = struct.Struct("!BHHB")
+PING_FORMAT = struct.Struct("!BH")
+DIRECTION_STEPS = 65536
 
 
 class RateLimiter:
-    def __init__(self, requests_limit, window_seconds):
+    def __init__(self, requests_limit, window_seconds, max_entries=RATE_LIMIT_MAX_ENTRIES):
         self.requests_limit = requests_limit
         self.window_seconds = window_seconds
-        self.storage = defaultdict(list)
+        self.max_entries = max_entries
+        self.storage = OrderedDict()
 
-    def is_allowed(self, client_ip):
-        if not client_ip:
+    def is_allowed(self, key, now=None):
+        if not key:
             return True
 
-        current_time = time.time()
-        requests = self.storage[client_ip]
-        requests[:] = [value for value in requests if current_time - value < self.window_seconds]
-
-        if len(requests) >= self.requests_limit:
+        position = (time.monotonic() if now is None else now) / self.window_seconds
+        window = int(position)
+        entry = self.storage.get(key)
+
+        if entry is None:
+            entry = [window, 0, 0]
+            self.storage[key] = entry
+            if len(self.storage) > self.max_entries:
+                self.storage.popitem(last=False)
+        else:
+            self.storage.move_to_end(key)
+            if entry[0] != window:
+                entry[2] = entry[1] if window - entry[0] == 1 else 0
+                entry[1] = 0
+                entry[0] = window
+
+        estimated = entry[2] * (1 - (position - window)) + entry[1]
+        if estimated >= self.requests_limit:
             return False
 
-        requests.append(current_time)
+        entry[1] += 1
+        return True
 
-        if len(self.storage) > 1000:
-            stale_ips = [
-                ip
-                for ip, values in self.storage.items()
-                if not values or current_time - max(values) > self.window_seconds * 2
-            ]
-            for ip in stale_ips[:500]:
-                del self.storage[ip]
+    def expire(self, now=None):
+        stale_window = int((time.monotonic() if now is None else now) / self.window_seconds) - 1
+        removed = 0
+        while self.storage:
+            key = next(iter(self.storage))
+            if self.storage[key][0] >= stale_window:
+                break
+            del self.storage[key]
+            removed += 1
+        return removed
+
+    async def run_expiry(self, interval_seconds=RATE_LIMIT_EXPIRY_INTERVAL):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            self.expire()
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def consume(self, cost=1.0, now=None):
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens < cost:
+            return False
 
+        self.tokens -= cost
         return True
 
 
@@ -52,6 +110,22 @@ def is_same_origin(headers):
     return origin.startswith(f"http://{host}") or origin.startswith(f"https://{host}")
 
 
+def carries_secret(headers, secret=CLUSTER_SECRET):
+    if not secret:
+        return False
+    return hmac.compare_digest(headers.get("Authorization", ""), f"Bearer {secret}")
+
+
+def client_address(remote_addr, headers):
+    if remote_addr not in TRUSTED_PROXIES and not carries_secret(headers):
+        return remote_addr
+
+    forwarded = headers.get("X-Forwarded-For")
+    if not forwarded:
+        return remote_addr
+    return forwarded.rsplit(",", 1)[-1].strip() or remote_addr
+
+
 def sanitize_name(name):
     if not isinstance(name, str):
         return ""
@@ -60,7 +134,7 @@ def sanitize_name(name):
     for char in name.strip():
         if char.isalnum() or char in " _-":
             cleaned.append(char)
-    return "".join(cleaned)[:15].strip()
+    return "".join(cleaned)[:MAX_NAME_LENGTH].strip()
 
 
 def sanitize_color(color):
@@ -81,6 +155,12 @@ def parse_direction(value):
     return direction % (2 * math.pi)
 
 
+def parse_follow_target(value):
+    if not isinstance(value, str) or not value or len(value) > MAX_FOLLOW_TARGET_LENGTH:
+        return None
+    return value
+
+
 def parse_ping(value):
     try:
         ping = int(value)
@@ -107,3 +187,35 @@ def parse_client_message(message, max_size):
         return None
 
     return payload
+
+
+def parse_sequence(value):
+    if isinstance(value, bool) or not isinstance(value, int):
+        return None
+
+    if value < 0 or value > 0xFFFF:
+        return None
+
+    return value
+
+
+def parse_binary_input(message):
+    if not isinstance(message, (bytes, bytearray)) or not message:
+        return None
+
+    opcode = message[0]
+
+    if opcode == INPUT_MOVE and len(message) == MOVE_FORMAT.size:
+        _, seq, quantized, flags = MOVE_FORMAT.unpack(message)
+        return {
+            "type": "move",
+            "seq": seq,
+            "direction": quantized * (2 * math.pi) / DIRECTION_STEPS,
+            "accelerating": bool(flags & 0x01),
+        }
+
+    if opcode == INPUT_PING and len(message) == PING_FORMAT.size:
+        _, ping = PING_FORMAT.unpack(message)
+        return {"type": "ping", "ping": ping}
+
+    return None
@@ -0,0 +1,126 @@
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+
+from quart import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSET_URL_PREFIX = "/assets"
+ASSET_HASH_LENGTH = 12
+COMPRESS_MIN_SIZE = 512
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PAGE_CACHE_CONTROL = "no-cache"
+
+
+def parse_accept_encoding(header):
+    accepted = set()
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name)
+    return accepted
+
+
+class StaticAsset:
+    def __init__(self, data, content_type):
+        self.content_type = content_type
+        self.etag = '"' + hashlib.sha256(data).hexdigest()[:ASSET_HASH_LENGTH] + '"'
+        self.variants = {"identity": data}
+        if len(data) >= COMPRESS_MIN_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            self._compress(data)
+
+    def _compress(self, data):
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(compressed) < len(data):
+            self.variants["gzip"] = compressed
+
+        if brotli is not None:
+            compressed = brotli.compress(data, quality=11)
+            if len(compressed) < len(data):
+                self.variants["br"] = compressed
+
+    def select(self, accept_encoding):
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding, self.variants[encoding]
+        return "identity", self.variants["identity"]
+
+
+class StaticAssetPipeline:
+    def __init__(self, static_folder, url_prefix=ASSET_URL_PREFIX):
+        self.static_folder = Path(static_folder)
+        self.url_prefix = url_prefix
+        self.manifest = {}
+        self.assets = {}
+        self.pages = {}
+
+    def build(self):
+        self.manifest.clear()
+        self.assets.clear()
+        self.pages.clear()
+
+        for path in sorted(self.static_folder.rglob("*")):
+            if not path.is_file():
+                continue
+
+            data = path.read_bytes()
+            relative = path.relative_to(self.static_folder).as_posix()
+            content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type == "application/javascript":
+                content_type += "; charset=utf-8"
+
+            asset = StaticAsset(data, content_type)
+            digest = asset.etag.strip('"')
+            hashed = path.relative_to(self.static_folder).with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+            self.manifest[relative] = hashed
+            self.assets[hashed] = asset
+
+        return self
+
+    def url(self, filename):
+        hashed = self.manifest.get(filename)
+        if hashed is None:
+            return None
+        return f"{self.url_prefix}/{hashed}"
+
+    def get(self, hashed_name):
+        return self.assets.get(hashed_name)
+
+    def page(self, name):
+        return self.pages.get(name)
+
+    def cache_page(self, name, html):
+        page = StaticAsset(html.encode("utf-8"), "text/html; charset=utf-8")
+        self.pages[name] = page
+        return page
+
+    def respond(self, asset, request_headers, cache_control):
+        headers = {
+            "Cache-Control": cache_control,
+            "ETag": asset.etag,
+            "Vary": "Accept-Encoding",
+        }
+
+        if asset.etag in request_headers.get("If-None-Match", ""):
+            return Response(b"", status=304, headers=headers)
+
+        encoding, body = asset.select(request_headers.get("Accept-Encoding"))
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(body, status=200, headers=headers, content_type=asset.content_type)
@@ -1,9 +1,14 @@
 class Game {
-  constructor() {
-    this.canvas = document.getElementById("game-canvas")
-    this.ctx = this.canvas.getContext("2d")
+  constructor(options = {}) {
+    this.canvas = options.canvas || document.getElementById("game-canvas")
+    this.renderWorker = null
+    this.workerConnected = false
+    this.ctx = options.canvas || !this.shouldUseRenderWorker() ? this.canvas.getContext("2d") : null
     this.gameState = null
     this.playerId = null
+    this.resumeToken = null
+    this.room = null
+    this.ownRank = null
     this.ws = null
     this.camera = { x: 0, y: 0 }
     this.mouse = { x: 0, y: 0 }
@@ -14,10 +19,23 @@ class Game {
     this.fps = 0
     this.spectatorMode = false
     this.spectatorTarget = null
+    this.deathScreenVisible = false
     this.lastDirection = null
     this.directionSendTime = 0
     this.pingStartTime = 0
     this.ping = 0
+    this.netStats = null
+    this.inputSeq = 0
+    this.followTarget = null
+    this.snapshots = []
+    this.maxSnapshots = 30
+    this.clockOffset = null
+    this.snapshotInterval = 1000 / 30
+    this.lastSnapshotArrival = 0
+    this.interpolationDelay = 100
+    this.pendingInputs = []
+    this.maxPredictionMs = 200
+    this.renderFrames = { from: null, to: null, alpha: 0 }
     this.selectedColor = "#ff6b6b"
     this.connectionLost = false
     this.reconnectAttempts = 0
@@ -30,15 +48,34 @@ class Game {
     this.leaderboardUpdateInterval = 500
 
     this.renderCache = {
-      visibleEntities: { food: [], powerFood: [], players: [], bots: [] },
+      visibleEntities: {
+        food: new Int32Array(0),
+        foodCount: 0,
+        powerFood: new Int32Array(0),
+        powerFoodCount: 0,
+        players: [],
+        bots: [],
+      },
+      activeIds: new Set(),
+      snakeBounds: { left: 0, right: 0, top: 0, bottom: 0 },
       lastCameraUpdate: 0,
-      gridPattern: null,
-      backgroundPattern: null,
+      backgroundTile: null,
+      backgroundLayer: null,
+      spriteAtlas: { canvas: null, ctx: null, slots: new Map(), count: 0 },
       viewBounds: { left: 0, right: 0, top: 0, bottom: 0 },
+      interpolated: new Map(),
     }
 
     this.spawnCache = new Map()
 
+    this.world = {
+      food: new ItemColumns(),
+      powerFood: new ItemColumns(64),
+      foodGrid: new VisibilityGrid(),
+      powerGrid: new VisibilityGrid(),
+      names: new Map(),
+    }
+
     this.performanceSettings = {
       maxFoodRender: 150,
       maxPowerRender: 20,
@@ -59,14 +96,41 @@ class Game {
     }
 
     this.initAnimationCache()
+
+    if (options.canvas) {
+      this.startSimulation()
+      return
+    }
+
+    if (!this.ctx) {
+      this.startRenderWorker()
+    }
     this.setupCanvas()
     this.setupEventListeners()
+    if (this.ctx) {
+      this.startSimulation()
+    }
+
+    document.body.classList.add("menu-active")
+  }
+
+  shouldUseRenderWorker() {
+    if (typeof Worker === "undefined" || typeof this.canvas.transferControlToOffscreen !== "function") {
+      return false
+    }
+    if (!this.canvas.dataset.renderWorker) {
+      return false
+    }
+
+    const requested = new URLSearchParams(location.search).get("render") || localStorage.getItem("snakevortex-render-mode")
+    return requested === "worker"
+  }
+
+  startSimulation() {
     this.connectWebSocket()
     this.startRenderLoop()
     this.startConnectionMonitor()
-    this.createBackgroundPattern()
-
-    document.body.classList.add("menu-active")
+    this.createBackgroundLayer()
   }
 
   initAnimationCache() {
@@ -82,28 +146,39 @@ class Game {
       const width = window.innerWidth
       const height = window.innerHeight
 
-      if (this.canvas.width !== width || this.canvas.height !== height) {
-        this.canvas.width = width
-        this.canvas.height = height
-        this.createBackgroundPattern()
-        this.objectPools.gradients.clear()
+      if (this.renderWorker) {
+        this.renderWorker.postMessage({ type: "resize", width, height })
+        return
       }
+
+      this.resizeCanvas(width, height)
     }
 
     updateCanvasSize()
     window.addEventListener("resize", updateCanvasSize, { passive: true })
   }
 
+  resizeCanvas(width, height) {
+    if (this.canvas.width !== width || this.canvas.height !== height) {
+      this.canvas.width = width
+      this.canvas.height = height
+      this.createBackgroundLayer()
+      this.objectPools.gradients.clear()
+    }
+  }
+
   setupEventListeners() {
     const mouseMoveHandler = (e) => {
       this.mouse.x = e.clientX
       this.mouse.y = e.clientY
+      this.forwardInput()
     }
 
     const keyDownHandler = (e) => {
       if (e.code === "Space") {
         e.preventDefault()
         this.isAccelerating = true
+        this.forwardInput()
       }
     }
 
@@ -111,6 +186,7 @@ class Game {
       if (e.code === "Space") {
         e.preventDefault()
         this.isAccelerating = false
+        this.forwardInput()
       }
     }
 
@@ -135,6 +211,8 @@ class Game {
     document.getElementById("restart-button").addEventListener("click", () => this.resetGame())
     document.getElementById("spectate-button").addEventListener("click", () => {
       this.spectatorMode = true
+      this.deathScreenVisible = false
+      this.syncViewMode()
       document.getElementById("death-screen").style.display = "none"
       document.getElementById("spectator-mode").style.display = "block"
     })
@@ -149,56 +227,60 @@ class Game {
       return
     }
 
-    if (!this.ws || this.ws.readyState !== WebSocket.OPEN) {
+    if (!this.isConnectionReady()) {
       alert("Connection is not ready yet")
       return
     }
 
-    this.ws.send(
-      JSON.stringify({
-        type: "join",
-        name,
-        color: this.selectedColor,
-      }),
-    )
+    this.sendJson({
+      type: "join",
+      name,
+      color: this.selectedColor,
+    })
 
     document.getElementById("login-screen").classList.remove("active")
     document.getElementById("game-screen").classList.add("active")
     document.body.classList.remove("menu-active")
   }
 
+  returnToMenu() {
+    this.spectatorMode = false
+    this.spectatorTarget = null
+    this.deathScreenVisible = false
+    this.syncViewMode()
+    document.getElementById("death-screen").style.display = "none"
+    document.getElementById("spectator-mode").style.display = "none"
+    document.getElementById("game-screen").classList.remove("active")
+    document.getElementById("login-screen").classList.add("active")
+    document.body.classList.add("menu-active")
+  }
+
   resetGame() {
     const nameInput = document.getElementById("nickname-input")
     const name = nameInput.value.trim()
 
     if (!name) {
-      this.spectatorMode = false
-      this.spectatorTarget = null
-      document.getElementById("death-screen").style.display = "none"
-      document.getElementById("spectator-mode").style.display = "none"
-      document.getElementById("game-screen").classList.remove("active")
-      document.getElementById("login-screen").classList.add("active")
-      document.body.classList.add("menu-active")
+      this.returnToMenu()
       return
     }
 
-    if (!this.ws || this.ws.readyState !== WebSocket.OPEN) {
+    if (!this.isConnectionReady()) {
       alert("Connection is not ready yet")
       return
     }
 
     this.spectatorMode = false
     this.spectatorTarget = null
+    this.deathScreenVisible = false
+    this.syncViewMode()
     document.getElementById("death-screen").style.display = "none"
     document.getElementById("spectator-mode").style.display = "none"
 
-    this.ws.send(
-      JSON.stringify({
-        type: "join",
-        name,
-        color: this.selectedColor,
-      }),
-    )
+    this.sendJson({
+      type: "join",
+      name,
+      color: this.selectedColor,
+    })
 
     document.body.classList.remove("menu-active")
   }
@@ -208,7 +290,7 @@ class Game {
 
     const player = this.gameState.players[this.playerId]
     if (!player?.alive) {
-      if (player && !this.spectatorMode && document.getElementById("death-screen").style.display !== "flex") {
+      if (player && !this.spectatorMode && !this.deathScreenVisible) {
         this.showDeathScreen(player)
       }
       return
@@ -227,19 +309,14 @@ class Game {
 
     const currentTime = Date.now()
     if (currentTime - this.directionSendTime > 100) {
-      this.ws.send(
-        JSON.stringify({
-          type: "move",
-          player_id: this.playerId,
-          direction,
-          accelerating: this.isAccelerating,
-        }),
-      )
+      const seq = this.sendMoveInput(direction, this.isAccelerating)
+      this.recordPendingInput(seq, direction, this.isAccelerating, currentTime)
       this.directionSendTime = currentTime
     }
   }
 
   showDeathScreen(player) {
+    this.deathScreenVisible = true
     const deathScreen = document.getElementById("death-screen")
     document.getElementById("final-score").textContent = player.score
     document.getElementById("final-length").textContent = player.length
@@ -267,21 +344,26 @@ class Game {
         }
       }
 
-      if (targetEntity?.snake?.length > 0) {
-        targetX = targetEntity.snake[0].x
-        targetY = targetEntity.snake[0].y
+      const head = targetEntity ? this.getRenderHead(targetEntity) : null
+      if (head) {
+        targetX = head.x
+        targetY = head.y
       }
+      this.requestSpectateTarget(this.spectatorTarget)
     } else {
       const player = this.playerId ? this.gameState.players[this.playerId] : null
       if (player?.alive && player?.snake?.length > 0) {
-        targetX = player.snake[0].x
-        targetY = player.snake[0].y
+        const head = this.getRenderHead(player, true)
+        targetX = head.x
+        targetY = head.y
       } else if (this.gameState.leaderboard?.length > 0) {
         const entity = this.findEntityByName(this.gameState.leaderboard[0].name)
-        if (entity?.snake?.length > 0) {
-          targetX = entity.snake[0].x
-          targetY = entity.snake[0].y
+        const head = entity ? this.getRenderHead(entity) : null
+        if (head) {
+          targetX = head.x
+          targetY = head.y
         }
+        this.requestSpectateTarget(this.gameState.leaderboard[0].name)
       }
     }
 
@@ -291,13 +373,7 @@ class Game {
   }
 
   findEntityByName(name) {
-    for (const player of Object.values(this.gameState.players)) {
-      if (player.name === name) return player
-    }
-    for (const bot of Object.values(this.gameState.bots)) {
-      if (bot.name === name) return bot
-    }
-    return null
+    return this.world.names.get(name) || null
   }
 
   switchToNextPlayer() {
@@ -333,6 +409,7 @@ class Game {
   startRenderLoop() {
     const gameLoop = (currentTime) => {
       this.updateMovement()
+      this.updateRenderFrames()
       this.updateCamera()
       this.render(currentTime)
       requestAnimationFrame(gameLoop)
@@ -341,6 +418,8 @@ class Game {
   }
 }
 
-document.addEventListener('DOMContentLoaded', () => {
-  new Game()
-})
+if (typeof document !== "undefined") {
+  document.addEventListener('DOMContentLoaded', () => {
+    new Game()
+  })
+}
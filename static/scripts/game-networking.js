@@ -1,3 +1,14 @@
+const INPUT_MOVE = 0x01
+const INPUT_PING = 0x02
+const MAX_PENDING_INPUTS = 32
+const COMPRESSION_FORMAT = "deflate-raw"
+const FRAME_JSON = 0x00
+const FRAME_DEFLATE = 0x01
+const FRAME_DEFLATE_STREAM = 0x02
+const RECONNECT_DELAY_MS = 2000
+const RESUME_RECONNECT_DELAY_MS = 250
+const frameDecoder = new TextDecoder()
+
 Game.prototype.connectWebSocket = function () {
   if (this.ws && (this.ws.readyState === WebSocket.OPEN || this.ws.readyState === WebSocket.CONNECTING)) {
     return
@@ -7,29 +18,36 @@ Game.prototype.connectWebSocket = function () {
     this.showConnectionLost()
   }
 
-  const protocol = window.location.protocol === "https:" ? "wss:" : "ws:"
-  const wsUrl = `${protocol}//${window.location.host}/ws`
+  const protocol = location.protocol === "https:" ? "wss:" : "ws:"
+  const room = this.resumeToken && this.room ? `?room=${encodeURIComponent(this.room)}` : ""
+  const wsUrl = `${protocol}//${location.host}/ws${room}`
   this.ws = new WebSocket(wsUrl)
+  this.ws.binaryType = "arraybuffer"
 
   this.ws.onopen = () => {
+    this.followTarget = null
+    this.snapshots.length = 0
+    this.pendingInputs.length = 0
+    this.clockOffset = null
+    this.lastSnapshotArrival = 0
+    this.compression = null
+    this.inflateState = null
+    this.inflateChain = Promise.resolve()
+    this.sendHello()
+    if (this.resumeToken) {
+      this.sendJson({ type: "resume", token: this.resumeToken })
+    }
     this.hideConnectionLost()
     this.reconnectAttempts = 0
     this.startPing()
   }
 
   this.ws.onmessage = (event) => {
-    let data
-    try {
-      data = JSON.parse(event.data)
-    } catch (_error) {
+    if (event.data instanceof ArrayBuffer) {
+      this.handleBinaryFrame(event.data)
       return
     }
-
-    if (!data || typeof data !== "object") {
-      return
-    }
-
-    this.handleMessage(data)
+    this.handleRawMessage(event.data)
   }
 
   this.ws.onerror = () => {
@@ -46,8 +64,9 @@ Game.prototype.connectWebSocket = function () {
     }
 
     if (this.reconnectAttempts < this.maxReconnectAttempts) {
+      const delay = this.resumeToken && this.reconnectAttempts === 0 ? RESUME_RECONNECT_DELAY_MS : RECONNECT_DELAY_MS
       this.reconnectAttempts += 1
-      setTimeout(() => this.connectWebSocket(), 2000)
+      setTimeout(() => this.connectWebSocket(), delay)
     }
   }
 }
@@ -74,28 +93,61 @@ Game.prototype.hideConnectionLost = function () {
   this.connectionLost = false
 }
 
+Game.prototype.handleRawMessage = function (text) {
+  let data
+  try {
+    data = JSON.parse(text)
+  } catch (_error) {
+    return
+  }
+
+  if (!data || typeof data !== "object") {
+    return
+  }
+
+  this.handleMessage(data)
+}
+
 Game.prototype.handleMessage = function (data) {
   switch (data.type) {
     case "player_id":
       this.playerId = data.player_id
+      this.ownRank = null
+      this.resumeToken = data.resume_token || null
+      this.room = data.room || null
       if (data.assigned_name) {
-        const nameInput = document.getElementById("nickname-input")
-        if (nameInput.value !== data.assigned_name) {
-          nameInput.value = data.assigned_name
-        }
+        this.applyAssignedName(data.assigned_name)
+      }
+      break
+    case "resume_failed":
+      this.resumeToken = null
+      if (this.playerId) {
+        this.playerId = null
+        this.returnToMenu()
       }
       break
     case "game_state":
       this.gameState = data
+      this.decodeWorld(data)
+      this.pushSnapshot(data)
       this.updateUI()
       this.updateVisibleEntities()
       break
     case "error":
-      alert(data.message)
+      this.showError(data.message)
       break
     case "pong":
       this.ping = Date.now() - this.pingStartTime
       break
+    case "rank":
+      this.ownRank = data.rank
+      break
+    case "net_stats":
+      this.netStats = data
+      break
+    case "compression":
+      this.compression = data
+      break
   }
 }
 
@@ -107,13 +159,268 @@ Game.prototype.startPing = function () {
   this.pingInterval = setInterval(() => {
     if (this.ws?.readyState === WebSocket.OPEN) {
       this.pingStartTime = Date.now()
-      this.ws.send(
-        JSON.stringify({
-          type: "ping",
-          player_id: this.playerId,
-          ping: this.ping,
-        }),
-      )
+      const message = new DataView(new ArrayBuffer(3))
+      message.setUint8(0, INPUT_PING)
+      message.setUint16(1, Math.min(0xffff, Math.max(0, Math.round(this.ping))))
+      this.ws.send(message.buffer)
     }
   }, 1000)
 }
+
+Game.prototype.sendMoveInput = function (direction, accelerating) {
+  const fullTurn = Math.PI * 2
+  const normalized = ((direction % fullTurn) + fullTurn) % fullTurn
+  this.inputSeq = (this.inputSeq + 1) & 0xffff
+
+  const message = new DataView(new ArrayBuffer(6))
+  message.setUint8(0, INPUT_MOVE)
+  message.setUint16(1, this.inputSeq)
+  message.setUint16(3, Math.round((normalized / fullTurn) * 65536) & 0xffff)
+  message.setUint8(5, accelerating ? 1 : 0)
+  this.ws.send(message.buffer)
+
+  return this.inputSeq
+}
+
+Game.prototype.requestSpectateTarget = function (name) {
+  const target = name || null
+  if (this.followTarget === target || this.ws?.readyState !== WebSocket.OPEN) {
+    return
+  }
+
+  this.followTarget = target
+  this.sendJson({
+    type: "spectate",
+    target: target || "",
+  })
+}
+
+Game.prototype.sendJson = function (message) {
+  if (this.renderWorker) {
+    this.renderWorker.postMessage({ type: "send", message })
+    return
+  }
+  this.ws.send(JSON.stringify(message))
+}
+
+Game.prototype.isConnectionReady = function () {
+  if (this.renderWorker) {
+    return this.workerConnected
+  }
+  return this.ws?.readyState === WebSocket.OPEN
+}
+
+Game.prototype.startRenderWorker = function () {
+  const scripts = []
+  document.querySelectorAll("script[data-worker-import]").forEach((script) => scripts.push(script.src))
+
+  const offscreen = this.canvas.transferControlToOffscreen()
+  this.renderWorker = new Worker(this.canvas.dataset.renderWorker)
+  this.renderWorker.onmessage = (event) => this.handleWorkerMessage(event.data)
+  this.renderWorker.postMessage({ type: "init", canvas: offscreen, scripts }, [offscreen])
+}
+
+Game.prototype.forwardInput = function () {
+  if (!this.renderWorker) return
+  this.renderWorker.postMessage({
+    type: "input",
+    x: this.mouse.x,
+    y: this.mouse.y,
+    accelerating: this.isAccelerating,
+  })
+}
+
+Game.prototype.syncViewMode = function () {
+  if (!this.renderWorker) return
+  this.renderWorker.postMessage({
+    type: "view",
+    spectatorMode: this.spectatorMode,
+    spectatorTarget: this.spectatorTarget,
+  })
+}
+
+Game.prototype.handleWorkerMessage = function (data) {
+  switch (data.type) {
+    case "connection":
+      this.workerConnected = !data.lost
+      if (data.lost) {
+        this.showConnectionLost()
+      } else {
+        this.hideConnectionLost()
+      }
+      break
+    case "state":
+      this.gameState = data.state
+      this.playerId = data.playerId
+      this.ownRank = data.rank
+      this.updateUI()
+      break
+    case "player_name":
+      this.applyAssignedName(data.name)
+      break
+    case "error":
+      this.showError(data.message)
+      break
+    case "death":
+      this.showDeathScreen(data.player)
+      break
+    case "return_to_menu":
+      this.returnToMenu()
+      break
+    case "spectator_target":
+      this.spectatorTarget = data.name
+      this.renderUI()
+      break
+  }
+}
+
+Game.prototype.getServerTime = function () {
+  return Date.now() + (this.clockOffset || 0)
+}
+
+Game.prototype.pushSnapshot = function (state) {
+  const now = Date.now()
+  if (typeof state.server_time !== "number") {
+    state.server_time = this.getServerTime()
+  }
+
+  const sample = state.server_time - now
+  if (this.clockOffset === null || sample > this.clockOffset) {
+    this.clockOffset = sample
+  } else {
+    this.clockOffset += (sample - this.clockOffset) * 0.02
+  }
+
+  if (this.lastSnapshotArrival) {
+    const gap = Math.min(500, now - this.lastSnapshotArrival)
+    this.snapshotInterval += (gap - this.snapshotInterval) * 0.1
+  }
+  this.lastSnapshotArrival = now
+  this.interpolationDelay = Math.min(250, Math.max(50, this.snapshotInterval * 2))
+
+  const snapshots = this.snapshots
+  const last = snapshots[snapshots.length - 1]
+  if (last && state.server_time <= last.server_time) {
+    snapshots[snapshots.length - 1] = state
+  } else {
+    snapshots.push(state)
+    if (snapshots.length > this.maxSnapshots) {
+      snapshots.shift()
+    }
+  }
+
+  this.reconcilePendingInputs(state)
+}
+
+Game.prototype.recordPendingInput = function (seq, direction, accelerating, time) {
+  const pending = this.pendingInputs
+  pending.push({ seq, direction, accelerating, time })
+  if (pending.length > MAX_PENDING_INPUTS) {
+    pending.shift()
+  }
+}
+
+Game.prototype.reconcilePendingInputs = function (state) {
+  const player = this.playerId ? state.players?.[this.playerId] : null
+  const acked = player?.input_seq
+  if (typeof acked !== "number") return
+
+  const pending = this.pendingInputs
+  let kept = 0
+  for (let i = 0; i < pending.length; i++) {
+    const ahead = (pending[i].seq - acked) & 0xffff
+    if (ahead > 0 && ahead < 0x8000) {
+      pending[kept++] = pending[i]
+    }
+  }
+  pending.length = kept
+}
+
+Game.prototype.sendHello = function () {
+  this.ws.send(
+    JSON.stringify({
+      type: "hello",
+      frames: ["binary"],
+      compression: typeof DecompressionStream === "undefined" ? [] : [COMPRESSION_FORMAT],
+    }),
+  )
+}
+
+Game.prototype.handleBinaryFrame = function (buffer) {
+  const tag = new Uint8Array(buffer, 0, 1)[0]
+  const body = new Uint8Array(buffer, 1)
+  switch (tag) {
+    case FRAME_JSON:
+      this.queueFrame(Promise.resolve(frameDecoder.decode(body)))
+      break
+    case FRAME_DEFLATE:
+      this.queueFrame(new Response(new Blob([body]).stream().pipeThrough(new DecompressionStream(COMPRESSION_FORMAT))).text())
+      break
+    case FRAME_DEFLATE_STREAM:
+      this.inflateStreamFrame(buffer)
+      break
+  }
+}
+
+Game.prototype.queueFrame = function (decoded) {
+  const socket = this.ws
+  this.inflateChain = this.inflateChain
+    .then(() => decoded)
+    .then((text) => {
+      if (socket === this.ws) {
+        this.handleRawMessage(text)
+      }
+    })
+    .catch(() => {})
+}
+
+Game.prototype.inflateStreamFrame = function (buffer) {
+  let state = this.inflateState
+  if (!state) {
+    const stream = new DecompressionStream(COMPRESSION_FORMAT)
+    state = {
+      writer: stream.writable.getWriter(),
+      lengths: [],
+      chunks: [],
+      buffered: 0,
+      decoder: new TextDecoder(),
+    }
+    this.inflateState = state
+
+    const reader = stream.readable.getReader()
+    const pump = async () => {
+      for (;;) {
+        const { value, done } = await reader.read()
+        if (done || this.inflateState !== state) return
+        state.chunks.push(value)
+        state.buffered += value.length
+        this.drainInflated(state)
+      }
+    }
+    pump().catch(() => {})
+  }
+
+  state.lengths.push(new DataView(buffer).getUint32(1))
+  state.writer.write(new Uint8Array(buffer, 5)).catch(() => {})
+}
+
+Game.prototype.drainInflated = function (state) {
+  while (state.lengths.length && state.buffered >= state.lengths[0]) {
+    const length = state.lengths.shift()
+    const message = new Uint8Array(length)
+    let offset = 0
+    while (offset < length) {
+      const chunk = state.chunks[0]
+      const take = Math.min(chunk.length, length - offset)
+      message.set(chunk.subarray(0, take), offset)
+      offset += take
+      if (take === chunk.length) {
+        state.chunks.shift()
+      } else {
+        state.chunks[0] = chunk.subarray(take)
+      }
+    }
+    state.buffered -= length
+    this.handleRawMessage(state.decoder.decode(message))
+  }
+}
@@ -1,3 +1,60 @@
+const SERVER_TICK_MS = 1000 / 60
+const EMPTY_POWERS = Object.freeze({})
+const BACKGROUND_TILE_SIZE = 50
+const SPRITE_CELL_SIZE = 32
+const SPRITE_MAX_RADIUS = 14
+const SPRITE_ATLAS_COLUMNS = 16
+const BORDER_STYLES = {
+  static: {
+    color: "rgba(78, 205, 196, 1)",
+    overlay: "rgba(0, 0, 0, 0.18)",
+    stops: ["rgba(78, 205, 196, 0.35)", "rgba(78, 205, 196, 0.2)", "rgba(78, 205, 196, 0)"],
+  },
+  shrinking: {
+    color: "rgba(255, 120, 80, 1)",
+    overlay: "rgba(0, 0, 0, 0.28)",
+    stops: ["rgba(255, 120, 80, 0.55)", "rgba(255, 120, 80, 0.18)", "rgba(255, 120, 80, 0)"],
+  },
+}
+
+function lerpSnakePoint(out, previous, snake, index, aligned, alpha) {
+  const target = snake[index]
+  const source = aligned || index === 0 ? previous[Math.min(index, previous.length - 1)] : target
+  out.x = source.x + (target.x - source.x) * alpha
+  out.y = source.y + (target.y - source.y) * alpha
+  return out
+}
+
+function isPointInBounds(point, bounds) {
+  return point.x >= bounds.left && point.x <= bounds.right && point.y >= bounds.top && point.y <= bounds.bottom
+}
+
+function isSnakeInBounds(snake, bounds) {
+  const len = snake.length
+  if (len <= 3) {
+    for (let i = 0; i < len; i++) {
+      if (isPointInBounds(snake[i], bounds)) return true
+    }
+    return false
+  }
+
+  const samples = Math.min(12, len)
+  const step = (len - 1) / (samples - 1)
+  for (let i = 0; i < samples; i++) {
+    if (isPointInBounds(snake[Math.floor(i * step)], bounds)) return true
+  }
+  return false
+}
+
+function pooledPoint(pool, index) {
+  let point = pool[index]
+  if (!point) {
+    point = { x: 0, y: 0 }
+    pool[index] = point
+  }
+  return point
+}
+
 Game.prototype.render = function (currentTime) {
   if (currentTime - this.lastRenderTime < this.frameInterval) {
     return
@@ -26,24 +83,89 @@ Game.prototype.render = function (currentTime) {
   this.updateFPS()
 }
 
-Game.prototype.createBackgroundPattern = function () {
-  if (this.renderCache.backgroundPattern) return
+Game.prototype.createBackgroundLayer = function () {
+  if (!this.ctx) return
+
+  let tile = this.renderCache.backgroundTile
+  if (!tile) {
+    tile = this.createLayerCanvas(BACKGROUND_TILE_SIZE, BACKGROUND_TILE_SIZE)
+    const tileCtx = tile.getContext("2d")
+    const half = BACKGROUND_TILE_SIZE / 2
+
+    tileCtx.strokeStyle = "rgba(255, 255, 255, 0.03)"
+    tileCtx.lineWidth = 1
+    tileCtx.beginPath()
+    tileCtx.moveTo(0, half)
+    tileCtx.lineTo(BACKGROUND_TILE_SIZE, half)
+    tileCtx.moveTo(half, 0)
+    tileCtx.lineTo(half, BACKGROUND_TILE_SIZE)
+    tileCtx.stroke()
+    this.renderCache.backgroundTile = tile
+  }
+
+  const width = this.canvas.width + BACKGROUND_TILE_SIZE
+  const height = this.canvas.height + BACKGROUND_TILE_SIZE
+  const current = this.renderCache.backgroundLayer
+  if (current && current.width === width && current.height === height) return
+
+  const layer = this.createLayerCanvas(width, height)
+  const layerCtx = layer.getContext("2d")
+  layerCtx.fillStyle = layerCtx.createPattern(tile, "repeat")
+  layerCtx.fillRect(0, 0, width, height)
+  this.renderCache.backgroundLayer = layer
+}
+
+Game.prototype.getFoodSprite = function (color, radius) {
+  const atlas = this.renderCache.spriteAtlas
+  const size = Math.max(1, Math.min(SPRITE_MAX_RADIUS, Math.round(radius)))
+  let sizes = atlas.slots.get(color)
+  if (!sizes) {
+    sizes = []
+    atlas.slots.set(color, sizes)
+  }
+
+  let slot = sizes[size]
+  if (slot) return slot
+
+  if (!atlas.canvas || atlas.count >= SPRITE_ATLAS_COLUMNS * SPRITE_ATLAS_COLUMNS) {
+    const dimension = SPRITE_ATLAS_COLUMNS * SPRITE_CELL_SIZE
+    atlas.canvas = this.createLayerCanvas(dimension, dimension)
+    atlas.ctx = atlas.canvas.getContext("2d")
+    atlas.count = 0
+    atlas.slots.clear()
+    sizes = []
+    atlas.slots.set(color, sizes)
+  }
 
-  const patternCanvas = document.createElement("canvas")
-  patternCanvas.width = 50
-  patternCanvas.height = 50
-  const patternCtx = patternCanvas.getContext("2d")
+  const index = atlas.count++
+  const sx = (index % SPRITE_ATLAS_COLUMNS) * SPRITE_CELL_SIZE
+  const sy = Math.floor(index / SPRITE_ATLAS_COLUMNS) * SPRITE_CELL_SIZE
+  const center = SPRITE_CELL_SIZE / 2
 
-  patternCtx.strokeStyle = "rgba(255, 255, 255, 0.03)"
-  patternCtx.lineWidth = 1
-  patternCtx.beginPath()
-  patternCtx.moveTo(0, 25)
-  patternCtx.lineTo(50, 25)
-  patternCtx.moveTo(25, 0)
-  patternCtx.lineTo(25, 50)
-  patternCtx.stroke()
+  atlas.ctx.fillStyle = color
+  atlas.ctx.beginPath()
+  atlas.ctx.arc(sx + center, sy + center, size, 0, Math.PI * 2)
+  atlas.ctx.fill()
 
-  this.renderCache.backgroundPattern = this.ctx.createPattern(patternCanvas, "repeat")
+  slot = { sx, sy, radius: size }
+  sizes[size] = slot
+  return slot
+}
+
+Game.prototype.drawFoodSprite = function (color, radius, x, y, scale) {
+  const slot = this.getFoodSprite(color, radius)
+  const extent = (SPRITE_CELL_SIZE * scale * radius) / slot.radius
+  this.ctx.drawImage(
+    this.renderCache.spriteAtlas.canvas,
+    slot.sx,
+    slot.sy,
+    SPRITE_CELL_SIZE,
+    SPRITE_CELL_SIZE,
+    x - extent / 2,
+    y - extent / 2,
+    extent,
+    extent,
+  )
 }
 
 Game.prototype.updateVisibleEntities = function () {
@@ -55,74 +177,49 @@ Game.prototype.updateVisibleEntities = function () {
   bounds.right = this.camera.x + this.canvas.width + margin
   bounds.top = this.camera.y - margin
   bounds.bottom = this.camera.y + this.canvas.height + margin
-  const activeIds = new Set()
-
-  const isVisible = (obj) =>
-    obj.x >= bounds.left &&
-    obj.x <= bounds.right &&
-    obj.y >= bounds.top &&
-    obj.y <= bounds.bottom &&
-    (obj.scale || 1.0) > 0
-
-  this.renderCache.visibleEntities.food = this.gameState.food
-    .filter(isVisible)
-    .slice(0, this.performanceSettings.maxFoodRender)
-
-  this.renderCache.visibleEntities.powerFood = this.gameState.power_food
-    .filter(isVisible)
-    .slice(0, this.performanceSettings.maxPowerRender)
-
-  const snakeMargin = margin + 160
-  const snakeBounds = {
-    left: this.camera.x - snakeMargin,
-    right: this.camera.x + this.canvas.width + snakeMargin,
-    top: this.camera.y - snakeMargin,
-    bottom: this.camera.y + this.canvas.height + snakeMargin,
+  const visible = this.renderCache.visibleEntities
+  const world = this.world
+  const activeIds = this.renderCache.activeIds
+  activeIds.clear()
+
+  const maxFood = this.performanceSettings.maxFoodRender
+  if (visible.food.length < maxFood) {
+    visible.food = new Int32Array(maxFood)
   }
+  visible.foodCount = world.foodGrid.query(world.food, bounds, visible.food, maxFood)
 
-  const isPointInSnakeBounds = (p) =>
-    p.x >= snakeBounds.left && p.x <= snakeBounds.right && p.y >= snakeBounds.top && p.y <= snakeBounds.bottom
-
-  const isSnakeVisible = (snake) => {
-    if (!snake?.length) return false
-
-    const len = snake.length
-    if (len <= 3) {
-      for (let i = 0; i < len; i++) {
-        if (isPointInSnakeBounds(snake[i])) return true
-      }
-      return false
-    }
-
-    const samples = Math.min(12, len)
-    const step = (len - 1) / (samples - 1)
-    for (let i = 0; i < samples; i++) {
-      const idx = Math.floor(i * step)
-      if (isPointInSnakeBounds(snake[idx])) return true
-    }
-    return false
+  const maxPower = this.performanceSettings.maxPowerRender
+  if (visible.powerFood.length < maxPower) {
+    visible.powerFood = new Int32Array(maxPower)
   }
+  visible.powerFoodCount = world.powerGrid.query(world.powerFood, bounds, visible.powerFood, maxPower)
 
-  const visiblePlayers = []
-  if (this.gameState.players) {
-    for (const [playerId, player] of Object.entries(this.gameState.players)) {
-      if (!player?.alive || !player.snake?.length) continue
-      const entityId = player.id || playerId
-      activeIds.add(entityId)
-      if (isSnakeVisible(player.snake)) visiblePlayers.push([playerId, player])
-    }
+  const snakeMargin = margin + 160
+  const snakeBounds = this.renderCache.snakeBounds
+  snakeBounds.left = this.camera.x - snakeMargin
+  snakeBounds.right = this.camera.x + this.canvas.width + snakeMargin
+  snakeBounds.top = this.camera.y - snakeMargin
+  snakeBounds.bottom = this.camera.y + this.canvas.height + snakeMargin
+
+  const visiblePlayers = visible.players
+  visiblePlayers.length = 0
+  const players = this.gameState.players
+  for (const playerId in players) {
+    const player = players[playerId]
+    if (!player?.alive || !player.snake?.length) continue
+    activeIds.add(player.id || playerId)
+    if (isSnakeInBounds(player.snake, snakeBounds)) visiblePlayers.push(player)
   }
-  this.renderCache.visibleEntities.players = visiblePlayers
 
-  const visibleBots = []
-  if (this.gameState.bots) {
-    for (const bot of Object.values(this.gameState.bots)) {
-      if (!bot?.alive || !bot.snake?.length) continue
-      if (bot.id) activeIds.add(bot.id)
-      if (isSnakeVisible(bot.snake)) visibleBots.push(bot)
-    }
+  const visibleBots = visible.bots
+  visibleBots.length = 0
+  const bots = this.gameState.bots
+  for (const botId in bots) {
+    const bot = bots[botId]
+    if (!bot?.alive || !bot.snake?.length) continue
+    if (bot.id) activeIds.add(bot.id)
+    if (isSnakeInBounds(bot.snake, snakeBounds)) visibleBots.push(bot)
   }
-  this.renderCache.visibleEntities.bots = visibleBots
 
   for (const key of this.spawnCache.keys()) {
     if (!activeIds.has(key)) {
@@ -130,9 +227,15 @@ Game.prototype.updateVisibleEntities = function () {
     }
   }
 
+  for (const key of this.renderCache.interpolated.keys()) {
+    if (!activeIds.has(key)) {
+      this.renderCache.interpolated.delete(key)
+    }
+  }
+
   let totalSegments = 0
   for (let i = 0; i < visiblePlayers.length; i++) {
-    totalSegments += visiblePlayers[i][1].snake.length
+    totalSegments += visiblePlayers[i].snake.length
   }
   for (let i = 0; i < visibleBots.length; i++) {
     totalSegments += visibleBots[i].snake.length
@@ -149,12 +252,13 @@ Game.prototype.updateVisibleEntities = function () {
 }
 
 Game.prototype.renderGridOptimized = function () {
-  if (!this.renderCache.backgroundPattern) return
+  this.createBackgroundLayer()
+  const layer = this.renderCache.backgroundLayer
+  if (!layer) return
 
-  this.ctx.save()
-  this.ctx.fillStyle = this.renderCache.backgroundPattern
-  this.ctx.fillRect(this.camera.x, this.camera.y, this.canvas.width, this.canvas.height)
-  this.ctx.restore()
+  const x = Math.floor(this.camera.x / BACKGROUND_TILE_SIZE) * BACKGROUND_TILE_SIZE
+  const y = Math.floor(this.camera.y / BACKGROUND_TILE_SIZE) * BACKGROUND_TILE_SIZE
+  this.ctx.drawImage(layer, x, y)
 }
 
 Game.prototype.renderMapBorders = function () {
@@ -201,56 +305,76 @@ Game.prototype.renderMapBorders = function () {
 
   this.ctx.save()
 
-  const shrinking = this.arenaRender.phase === "shrinking"
-  const borderColor = shrinking ? "rgba(255, 120, 80, 1)" : "rgba(78, 205, 196, 1)"
-  const glowA = shrinking ? 0.55 : 0.35
-  const glowB = shrinking ? 0.18 : 0.2
+  const style = this.arenaRender.phase === "shrinking" ? BORDER_STYLES.shrinking : BORDER_STYLES.static
 
-  const overlayAlpha = shrinking ? 0.28 : 0.18
-  this.ctx.fillStyle = `rgba(0, 0, 0, ${overlayAlpha})`
+  this.ctx.fillStyle = style.overlay
   this.ctx.fillRect(worldMinX - borderWidth, worldMinY - borderWidth, worldMaxX + 2 * borderWidth, minY - worldMinY + borderWidth)
   this.ctx.fillRect(worldMinX - borderWidth, maxY, worldMaxX + 2 * borderWidth, worldMaxY - maxY + borderWidth)
   this.ctx.fillRect(worldMinX - borderWidth, minY, minX - worldMinX + borderWidth, h)
   this.ctx.fillRect(maxX, minY, worldMaxX - maxX + borderWidth, h)
 
-  const gradient = this.ctx.createLinearGradient(minX, minY, minX + borderWidth, minY)
-  const glowColorA = shrinking ? `rgba(255, 120, 80, ${glowA})` : `rgba(78, 205, 196, ${glowA})`
-  const glowColorB = shrinking ? `rgba(255, 120, 80, ${glowB})` : `rgba(78, 205, 196, ${glowB})`
-  const glowColorC = shrinking ? "rgba(255, 120, 80, 0)" : "rgba(78, 205, 196, 0)"
-  gradient.addColorStop(0, glowColorA)
-  gradient.addColorStop(0.6, glowColorB)
-  gradient.addColorStop(1, glowColorC)
-
-  this.ctx.fillStyle = gradient
-  this.ctx.fillRect(minX - borderWidth, minY - borderWidth, borderWidth, h + 2 * borderWidth)
-  this.ctx.fillRect(maxX, minY - borderWidth, borderWidth, h + 2 * borderWidth)
-  this.ctx.fillRect(minX - borderWidth, minY - borderWidth, w + 2 * borderWidth, borderWidth)
-  this.ctx.fillRect(minX - borderWidth, maxY, w + 2 * borderWidth, borderWidth)
-
-  this.ctx.strokeStyle = borderColor
+  this.ctx.translate(minX, minY)
+  this.ctx.fillStyle = this.getBorderGradient(style, borderWidth)
+  this.ctx.fillRect(-borderWidth, -borderWidth, borderWidth, h + 2 * borderWidth)
+  this.ctx.fillRect(w, -borderWidth, borderWidth, h + 2 * borderWidth)
+  this.ctx.fillRect(-borderWidth, -borderWidth, w + 2 * borderWidth, borderWidth)
+  this.ctx.fillRect(-borderWidth, h, w + 2 * borderWidth, borderWidth)
+
+  this.ctx.strokeStyle = style.color
   this.ctx.lineWidth = 2
-  this.ctx.strokeRect(minX, minY, w, h)
+  this.ctx.strokeRect(0, 0, w, h)
 
   this.ctx.restore()
 }
 
+Game.prototype.getBorderGradient = function (style, borderWidth) {
+  const gradients = this.objectPools.gradients
+  let gradient = gradients.get(style)
+  if (!gradient) {
+    gradient = this.ctx.createLinearGradient(0, 0, borderWidth, 0)
+    gradient.addColorStop(0, style.stops[0])
+    gradient.addColorStop(0.6, style.stops[1])
+    gradient.addColorStop(1, style.stops[2])
+    gradients.set(style, gradient)
+  }
+  return gradient
+}
+
+Game.prototype.getHeadGradient = function (color, width, headLength, headWidth) {
+  const gradients = this.objectPools.gradients
+  let byWidth = gradients.get(color)
+  if (!byWidth) {
+    byWidth = new Map()
+    gradients.set(color, byWidth)
+  }
+
+  let gradient = byWidth.get(width)
+  if (!gradient) {
+    gradient = this.ctx.createRadialGradient(headLength * 0.2, -headWidth * 0.3, width * 0.2, 0, 0, headLength)
+    gradient.addColorStop(0, this.lightenColor(color, 20))
+    gradient.addColorStop(1, this.darkenColor(color, 12))
+    byWidth.set(width, gradient)
+  }
+  return gradient
+}
+
 Game.prototype.renderFoodOptimized = function () {
-  const food = this.renderCache.visibleEntities.food
-  if (!food.length) return
+  const visible = this.renderCache.visibleEntities
+  const count = visible.foodCount
+  if (!count) return
 
+  const food = this.world.food
+  const indices = visible.food
   this.ctx.save()
 
-  const limit = this.performanceSettings.lowDetailMode ? Math.min(food.length, 110) : food.length
+  const limit = this.performanceSettings.lowDetailMode ? Math.min(count, 110) : count
   for (let i = 0; i < limit; i++) {
-    const item = food[i]
-    const scale = item.scale || 1.0
+    const index = indices[i]
+    const scale = food.scale[index]
 
     if (scale > 0) {
-      this.ctx.fillStyle = item.color
       this.ctx.globalAlpha = Math.min(1.0, scale)
-      this.ctx.beginPath()
-      this.ctx.arc(item.x, item.y, item.size * scale, 0, Math.PI * 2)
-      this.ctx.fill()
+      this.drawFoodSprite(food.color[index], food.size[index], food.x[index], food.y[index], scale)
     }
   }
 
@@ -258,24 +382,23 @@ Game.prototype.renderFoodOptimized = function () {
 }
 
 Game.prototype.renderPowerFoodOptimized = function () {
-  const powerFood = this.renderCache.visibleEntities.powerFood
-  if (!powerFood.length) return
+  const visible = this.renderCache.visibleEntities
+  const count = visible.powerFoodCount
+  if (!count) return
 
+  const powerFood = this.world.powerFood
+  const indices = visible.powerFood
   this.ctx.save()
-  const time = this.animationCache.time
+  const pulse = Math.sin(this.animationCache.time * 0.005) * 0.2 + 0.8
 
-  const limit = this.performanceSettings.lowDetailMode ? Math.min(powerFood.length, 14) : powerFood.length
+  const limit = this.performanceSettings.lowDetailMode ? Math.min(count, 14) : count
   for (let i = 0; i < limit; i++) {
-    const power = powerFood[i]
-    const scale = power.scale || 1.0
+    const index = indices[i]
+    const scale = powerFood.scale[index]
 
     if (scale > 0) {
-      const pulse = Math.sin(time * 0.005) * 0.2 + 0.8
-      this.ctx.fillStyle = power.color
       this.ctx.globalAlpha = Math.min(1.0, scale) * pulse
-      this.ctx.beginPath()
-      this.ctx.arc(power.x, power.y, power.size * scale * pulse, 0, Math.PI * 2)
-      this.ctx.fill()
+      this.drawFoodSprite(powerFood.color[index], powerFood.size[index], powerFood.x[index], powerFood.y[index], scale * pulse)
     }
   }
 
@@ -283,62 +406,63 @@ Game.prototype.renderPowerFoodOptimized = function () {
 }
 
 Game.prototype.renderSnakes = function () {
-  const renderSnake = (entity, isPlayer = false, playerId = null) => {
-    const snake = entity?.snake
-    if (!snake?.length) return
-
-    let hasSpawnProtection = false
-    if (isPlayer && playerId && this.gameState.players[playerId]) {
-      const player = this.gameState.players[playerId]
-      hasSpawnProtection = player.spawn_protection && Date.now() < player.spawn_protection
-    }
-
-    const currentTime = this.animationCache.time
-    const isLocal = isPlayer && playerId === this.playerId
-    const spawnProgress = this.getSpawnProgress(entity, isLocal)
-    if (spawnProgress <= 0) return
+  const visiblePlayers = this.renderCache.visibleEntities.players
+  for (let i = 0; i < visiblePlayers.length; i++) {
+    const player = visiblePlayers[i]
+    this.renderSnake(player, true, player.id)
+  }
 
-    const head = snake[0]
-    const neck = snake[1] || head
-    const bodyWidth = Math.min(26, 8 + Math.min(snake.length, 200) * 0.09)
-    const sizeScale = 0.7 + 0.3 * spawnProgress
-    const maxPoints = this.performanceSettings.lowDetailMode ? 24 : 48
-    const points = this.getSnakeRenderPoints(snake, maxPoints)
+  const visibleBots = this.renderCache.visibleEntities.bots
+  for (let i = 0; i < visibleBots.length; i++) {
+    this.renderSnake(visibleBots[i], false)
+  }
+}
 
-    this.ctx.save()
+Game.prototype.renderSnake = function (entity, isPlayer = false, playerId = null) {
+  const snake = entity?.snake
+  if (!snake?.length) return
 
-    let alpha = spawnProgress
-    if ("ghost" in (entity.powers || {}) || hasSpawnProtection) {
-      const flicker = Math.sin(currentTime * 0.01) * 0.2 + 0.6
-      alpha *= flicker
-    }
-    this.ctx.globalAlpha = alpha
+  let hasSpawnProtection = false
+  if (isPlayer && playerId && this.gameState.players[playerId]) {
+    const player = this.gameState.players[playerId]
+    hasSpawnProtection = player.spawn_protection && Date.now() < player.spawn_protection
+  }
 
-    this.drawSnakeBody(points, entity.color, bodyWidth * sizeScale, this.performanceSettings.lowDetailMode)
-    this.drawSnakeHead(head, neck, entity.color, bodyWidth * sizeScale)
+  const currentTime = this.animationCache.time
+  const isLocal = isPlayer && playerId === this.playerId
+  const spawnProgress = this.getSpawnProgress(entity, isLocal)
+  if (spawnProgress <= 0) return
 
-    this.ctx.restore()
+  const segmentCount = entity.segment_count || snake.length
+  const bodyWidth = Math.min(26, 8 + Math.min(segmentCount, 200) * 0.09)
+  const sizeScale = 0.7 + 0.3 * spawnProgress
+  const maxPoints = this.performanceSettings.lowDetailMode ? 24 : 48
+  const rendered = this.getRenderPoints(entity, maxPoints, isLocal)
+  const points = rendered.points
+  const head = rendered.head
+  const neck = rendered.neck
 
-    const headVisible = this.isInViewport(head)
-    if (entity.name && headVisible && spawnProgress > 0.65) {
-      this.renderPlayerName(head, entity.name, entity.color)
-    }
+  this.ctx.save()
 
-    if (headVisible && spawnProgress > 0.35) {
-      this.renderPowerEffects(head, entity.powers || {}, hasSpawnProtection, currentTime)
-    }
+  let alpha = spawnProgress
+  if ("ghost" in (entity.powers || EMPTY_POWERS) || hasSpawnProtection) {
+    const flicker = Math.sin(currentTime * 0.01) * 0.2 + 0.6
+    alpha *= flicker
   }
+  this.ctx.globalAlpha = alpha
 
-  const visiblePlayers = this.renderCache.visibleEntities.players || []
-  for (let i = 0; i < visiblePlayers.length; i++) {
-    const [playerId, player] = visiblePlayers[i]
-    renderSnake(player, true, playerId)
+  this.drawSnakeBody(points, entity.color, bodyWidth * sizeScale, this.performanceSettings.lowDetailMode)
+  this.drawSnakeHead(head, neck, entity.color, bodyWidth * sizeScale)
+
+  this.ctx.restore()
+
+  const headVisible = this.isInViewport(head)
+  if (entity.name && headVisible && spawnProgress > 0.65) {
+    this.renderPlayerName(head, entity.name, entity.color)
   }
 
-  const visibleBots = this.renderCache.visibleEntities.bots || []
-  for (let i = 0; i < visibleBots.length; i++) {
-    const bot = visibleBots[i]
-    renderSnake(bot, false)
+  if (headVisible && spawnProgress > 0.35) {
+    this.renderPowerEffects(head, entity.powers || EMPTY_POWERS, hasSpawnProtection, currentTime)
   }
 }
 
@@ -463,20 +587,121 @@ Game.prototype.getSpawnProgress = function (entity, isLocal) {
   return t
 }
 
-Game.prototype.getSnakeRenderPoints = function (snake, maxPoints) {
-  const len = snake.length
-  if (len === 0) return []
-  if (len === 1) return [snake[0]]
+Game.prototype.updateRenderFrames = function () {
+  const frames = this.renderFrames
+  const snapshots = this.snapshots
+  if (!snapshots.length) {
+    frames.from = this.gameState
+    frames.to = this.gameState
+    frames.alpha = 0
+    return
+  }
+
+  const renderTime = this.getServerTime() - this.interpolationDelay
+  let index = snapshots.length - 1
+  while (index > 0 && snapshots[index].server_time > renderTime) {
+    index--
+  }
+
+  if (index > 0) {
+    snapshots.splice(0, index)
+    index = 0
+  }
+
+  const from = snapshots[index]
+  const to = snapshots[index + 1] || from
+  frames.from = from
+  frames.to = to
+  frames.alpha = to === from ? 0 : Math.min(1, Math.max(0, (renderTime - from.server_time) / (to.server_time - from.server_time)))
+}
+
+Game.prototype.findSnapshotEntity = function (state, id) {
+  if (!state || id == null) return null
+  return state.players?.[id] || state.bots?.[id] || null
+}
 
+Game.prototype.getRenderPoints = function (entity, maxPoints, isLocal = false) {
+  const key = entity.id || entity.name
+  let rendered = this.renderCache.interpolated.get(key)
+  if (!rendered) {
+    rendered = { points: [], pool: [], head: { x: 0, y: 0 }, neck: { x: 0, y: 0 } }
+    this.renderCache.interpolated.set(key, rendered)
+  }
+
+  let to = entity
+  let from = entity
+  let alpha = 0
+  if (!isLocal) {
+    const frames = this.renderFrames
+    to = this.findSnapshotEntity(frames.to, entity.id) || entity
+    from = this.findSnapshotEntity(frames.from, entity.id) || to
+    alpha = frames.alpha
+  }
+
+  const snake = to.snake?.length ? to.snake : entity.snake
+  const previous = from.snake?.length ? from.snake : snake
+  const aligned = previous.length === snake.length && snake.length === (to.segment_count || snake.length)
+  const len = snake.length
+  const points = rendered.points
+  const pool = rendered.pool
   const step = Math.max(1, Math.floor(len / maxPoints))
-  const points = []
-  for (let i = len - 1; i >= 0; i -= step) {
-    points.push(snake[i])
+  let count = 0
+  let index = len - 1
+  for (; index >= 0; index -= step) {
+    points[count] = lerpSnakePoint(pooledPoint(pool, count), previous, snake, index, aligned, alpha)
+    count++
   }
-  if (points[points.length - 1] !== snake[0]) {
-    points.push(snake[0])
+  if (index + step !== 0) {
+    points[count] = lerpSnakePoint(pooledPoint(pool, count), previous, snake, 0, aligned, alpha)
+    count++
   }
-  return points
+  points.length = count
+
+  const head = points[count - 1]
+  rendered.head.x = head.x
+  rendered.head.y = head.y
+  if (len > 1) {
+    lerpSnakePoint(rendered.neck, previous, snake, 1, aligned, alpha)
+  } else {
+    rendered.neck.x = head.x
+    rendered.neck.y = head.y
+  }
+
+  if (isLocal) {
+    this.applyLocalPrediction(entity, rendered)
+  }
+  return rendered
+}
+
+Game.prototype.applyLocalPrediction = function (entity, rendered) {
+  if (!entity.alive || typeof this.gameState?.server_time !== "number") return
+
+  const elapsed = Math.min(this.maxPredictionMs, this.getServerTime() - this.gameState.server_time)
+  if (!(elapsed > 0)) return
+
+  const pending = this.pendingInputs
+  const direction = pending.length ? pending[pending.length - 1].direction : entity.direction
+  if (typeof direction !== "number") return
+
+  const distance = ((entity.speed || 2) * elapsed) / SERVER_TICK_MS
+  if (distance < 0.5) return
+
+  const head = rendered.head
+  rendered.neck.x = head.x
+  rendered.neck.y = head.y
+  head.x += Math.cos(direction) * distance
+  head.y += Math.sin(direction) * distance
+
+  const points = rendered.points
+  const point = pooledPoint(rendered.pool, points.length)
+  point.x = head.x
+  point.y = head.y
+  points.push(point)
+}
+
+Game.prototype.getRenderHead = function (entity, isLocal = false) {
+  if (!entity?.snake?.length) return null
+  return this.getRenderPoints(entity, 2, isLocal).head
 }
 
 Game.prototype.drawSnakeBody = function (points, color, width, lowDetail) {
@@ -509,8 +734,9 @@ Game.prototype.drawSnakeBody = function (points, color, width, lowDetail) {
   ctx.restore()
 }
 
-Game.prototype.drawSnakeHead = function (head, neck, color, width) {
+Game.prototype.drawSnakeHead = function (head, neck, color, bodyWidth) {
   const ctx = this.ctx
+  const width = Math.round(bodyWidth * 2) / 2
   const angle = Math.atan2(head.y - neck.y, head.x - neck.x)
   const headLength = width * 1.8
   const headWidth = width * 1.15
@@ -519,11 +745,7 @@ Game.prototype.drawSnakeHead = function (head, neck, color, width) {
   ctx.translate(head.x, head.y)
   ctx.rotate(angle)
 
-  const gradient = ctx.createRadialGradient(headLength * 0.2, -headWidth * 0.3, width * 0.2, 0, 0, headLength)
-  gradient.addColorStop(0, this.lightenColor(color, 20))
-  gradient.addColorStop(1, this.darkenColor(color, 12))
-
-  ctx.fillStyle = gradient
+  ctx.fillStyle = this.getHeadGradient(color, width, headLength, headWidth)
   ctx.beginPath()
   ctx.moveTo(headLength * 0.75, 0)
   ctx.quadraticCurveTo(headLength * 0.25, headWidth * 0.9, -headLength * 0.65, 0)
@@ -22,6 +22,8 @@ Game.prototype.updateLeaderboard = function () {
   const currentData = this.gameState.leaderboard.slice(0, 10)
   const existingItems = leaderboard.children
 
+  this.updateOwnRank(currentData.length)
+
   if (existingItems.length !== currentData.length) {
     this.rebuildLeaderboard(leaderboard, currentData)
     return
@@ -47,6 +49,24 @@ Game.prototype.updateLeaderboard = function () {
   }
 }
 
+Game.prototype.updateOwnRank = function (shownCount) {
+  const selfRow = document.getElementById("leaderboard-self")
+  const rank = this.playerId ? this.ownRank : null
+
+  if (!rank || rank <= shownCount) {
+    if (selfRow.style.display !== "none") {
+      selfRow.style.display = "none"
+    }
+    return
+  }
+
+  const text = `Your rank: #${rank} of ${this.gameState.ranked_count || rank}`
+  if (selfRow.textContent !== text) {
+    selfRow.textContent = text
+  }
+  selfRow.style.display = "block"
+}
+
 Game.prototype.rebuildLeaderboard = function (leaderboard, data) {
   const fragment = document.createDocumentFragment()
 
@@ -76,6 +96,7 @@ Game.prototype.rebuildLeaderboard = function (leaderboard, data) {
         "click",
         () => {
           this.spectatorTarget = entry.name
+          this.syncViewMode()
         },
         { passive: true },
       )
@@ -87,3 +108,14 @@ Game.prototype.rebuildLeaderboard = function (leaderboard, data) {
   leaderboard.textContent = ""
   leaderboard.appendChild(fragment)
 }
+
+Game.prototype.applyAssignedName = function (name) {
+  const nameInput = document.getElementById("nickname-input")
+  if (nameInput.value !== name) {
+    nameInput.value = name
+  }
+}
+
+Game.prototype.showError = function (message) {
+  alert(message)
+}
@@ -1,17 +1,42 @@
-Game.prototype.lightenColor = function(color, percent) {
+const derivedColors = new Map()
+
+function shiftColor(color, amount) {
   const num = Number.parseInt(color.replace("#", ""), 16)
-  const amt = Math.round(2.55 * percent)
-  const R = Math.min(255, Math.max(0, (num >> 16) + amt))
-  const G = Math.min(255, Math.max(0, ((num >> 8) & 0x00ff) + amt))
-  const B = Math.min(255, Math.max(0, (num & 0x0000ff) + amt))
+  const R = Math.min(255, Math.max(0, (num >> 16) + amount))
+  const G = Math.min(255, Math.max(0, ((num >> 8) & 0x00ff) + amount))
+  const B = Math.min(255, Math.max(0, (num & 0x0000ff) + amount))
   return "#" + (0x1000000 + R * 0x10000 + G * 0x100 + B).toString(16).slice(1)
 }
 
+function deriveColor(color, amount) {
+  let table = derivedColors.get(color)
+  if (!table) {
+    table = new Map()
+    derivedColors.set(color, table)
+  }
+
+  let derived = table.get(amount)
+  if (derived === undefined) {
+    derived = shiftColor(color, amount)
+    table.set(amount, derived)
+  }
+  return derived
+}
+
+Game.prototype.lightenColor = function(color, percent) {
+  return deriveColor(color, Math.round(2.55 * percent))
+}
+
 Game.prototype.darkenColor = function(color, percent) {
-  const num = Number.parseInt(color.replace("#", ""), 16)
-  const amt = Math.round(2.55 * percent)
-  const R = Math.min(255, Math.max(0, (num >> 16) - amt))
-  const G = Math.min(255, Math.max(0, ((num >> 8) & 0x00ff) - amt))
-  const B = Math.min(255, Math.max(0, (num & 0x0000ff) - amt))
-  return "#" + (0x1000000 + R * 0x10000 + G * 0x100 + B).toString(16).slice(1)
+  return deriveColor(color, -Math.round(2.55 * percent))
+}
+
+Game.prototype.createLayerCanvas = function(width, height) {
+  if (typeof OffscreenCanvas !== "undefined") {
+    return new OffscreenCanvas(width, height)
+  }
+  const canvas = document.createElement("canvas")
+  canvas.width = width
+  canvas.height = height
+  return canvas
 }
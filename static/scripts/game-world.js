@@ -0,0 +1,119 @@
+const WORLD_SIZE = 2000
+const VISIBILITY_CELL_SIZE = 200
+
+class ItemColumns {
+  constructor(capacity = 256) {
+    this.count = 0
+    this.allocate(capacity)
+  }
+
+  allocate(capacity) {
+    this.capacity = capacity
+    this.x = new Float32Array(capacity)
+    this.y = new Float32Array(capacity)
+    this.size = new Float32Array(capacity)
+    this.scale = new Float32Array(capacity)
+    this.color = new Array(capacity).fill("")
+    this.kind = new Array(capacity).fill(null)
+  }
+
+  load(items) {
+    const count = items ? items.length : 0
+    if (count > this.capacity) {
+      this.allocate(Math.max(count, this.capacity * 2))
+    }
+
+    for (let i = 0; i < count; i++) {
+      const item = items[i]
+      this.x[i] = item.x
+      this.y[i] = item.y
+      this.size[i] = item.size
+      this.scale[i] = item.scale == null ? 1 : item.scale
+      this.color[i] = item.color
+      this.kind[i] = item.type || null
+    }
+    this.count = count
+  }
+}
+
+class VisibilityGrid {
+  constructor(cellSize = VISIBILITY_CELL_SIZE, width = WORLD_SIZE, height = WORLD_SIZE) {
+    this.cellSize = cellSize
+    this.columns = Math.ceil(width / cellSize)
+    this.rows = Math.ceil(height / cellSize)
+    this.heads = new Int32Array(this.columns * this.rows)
+    this.next = new Int32Array(256)
+  }
+
+  column(x) {
+    return Math.min(this.columns - 1, Math.max(0, Math.floor(x / this.cellSize)))
+  }
+
+  row(y) {
+    return Math.min(this.rows - 1, Math.max(0, Math.floor(y / this.cellSize)))
+  }
+
+  build(items) {
+    const heads = this.heads
+    heads.fill(-1)
+    if (items.capacity > this.next.length) {
+      this.next = new Int32Array(items.capacity)
+    }
+
+    const next = this.next
+    for (let i = items.count - 1; i >= 0; i--) {
+      if (items.scale[i] <= 0) continue
+      const cell = this.row(items.y[i]) * this.columns + this.column(items.x[i])
+      next[i] = heads[cell]
+      heads[cell] = i
+    }
+  }
+
+  query(items, bounds, out, limit) {
+    const maxCount = Math.min(limit, out.length)
+    const startColumn = this.column(bounds.left)
+    const endColumn = this.column(bounds.right)
+    const startRow = this.row(bounds.top)
+    const endRow = this.row(bounds.bottom)
+    let count = 0
+
+    for (let row = startRow; row <= endRow; row++) {
+      for (let column = startColumn; column <= endColumn; column++) {
+        let index = this.heads[row * this.columns + column]
+        while (index !== -1) {
+          const x = items.x[index]
+          const y = items.y[index]
+          if (x >= bounds.left && x <= bounds.right && y >= bounds.top && y <= bounds.bottom) {
+            out[count++] = index
+            if (count >= maxCount) return count
+          }
+          index = this.next[index]
+        }
+      }
+    }
+    return count
+  }
+}
+
+Game.prototype.decodeWorld = function (state) {
+  const world = this.world
+  world.food.load(state.food)
+  world.powerFood.load(state.power_food)
+  world.foodGrid.build(world.food)
+  world.powerGrid.build(world.powerFood)
+
+  const names = world.names
+  names.clear()
+  for (const id in state.players) {
+    const player = state.players[id]
+    if (!names.has(player.name)) {
+      names.set(player.name, player)
+    }
+  }
+  for (const id in state.bots) {
+    const bot = state.bots[id]
+    if (!names.has(bot.name)) {
+      names.set(bot.name, bot)
+    }
+  }
+}
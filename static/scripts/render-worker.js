@@ -0,0 +1,109 @@
+const UI_STATE_INTERVAL_MS = 100
+
+if (typeof self.requestAnimationFrame !== "function") {
+  self.requestAnimationFrame = (callback) => setTimeout(() => callback(performance.now()), 1000 / 60)
+}
+
+let game = null
+
+function createWorkerGame(canvas) {
+  class WorkerGame extends Game {
+    showConnectionLost() {
+      self.postMessage({ type: "connection", lost: true })
+    }
+
+    hideConnectionLost() {
+      this.connectionLost = false
+      self.postMessage({ type: "connection", lost: false })
+    }
+
+    applyAssignedName(name) {
+      self.postMessage({ type: "player_name", name })
+    }
+
+    showError(message) {
+      self.postMessage({ type: "error", message })
+    }
+
+    returnToMenu() {
+      this.spectatorMode = false
+      this.deathScreenVisible = false
+      self.postMessage({ type: "return_to_menu" })
+    }
+
+    showDeathScreen(player) {
+      this.deathScreenVisible = true
+      self.postMessage({ type: "death", player: { score: player.score, length: player.length } })
+    }
+
+    updateUI() {
+      const now = Date.now()
+      if (this.gameState === null || now - (this.lastStatePost || 0) < UI_STATE_INTERVAL_MS) return
+      this.lastStatePost = now
+
+      const state = this.gameState
+      const player = this.playerId ? state.players[this.playerId] : null
+      const players = {}
+      if (player) {
+        players[this.playerId] = { score: player.score, length: player.length, alive: player.alive }
+      }
+
+      self.postMessage({
+        type: "state",
+        playerId: this.playerId,
+        rank: this.ownRank,
+        state: {
+          players,
+          leaderboard: state.leaderboard,
+          ranked_count: state.ranked_count,
+        },
+      })
+    }
+
+    renderUI() {
+      if (this.postedSpectatorTarget === this.spectatorTarget) return
+      this.postedSpectatorTarget = this.spectatorTarget
+      self.postMessage({ type: "spectator_target", name: this.spectatorTarget })
+    }
+
+    handleHostMessage(data) {
+      switch (data.type) {
+        case "input":
+          this.mouse.x = data.x
+          this.mouse.y = data.y
+          this.isAccelerating = data.accelerating
+          break
+        case "resize":
+          this.resizeCanvas(data.width, data.height)
+          break
+        case "send":
+          if (this.ws?.readyState === WebSocket.OPEN) {
+            this.ws.send(JSON.stringify(data.message))
+          }
+          break
+        case "view":
+          this.spectatorMode = data.spectatorMode
+          this.spectatorTarget = data.spectatorTarget
+          this.deathScreenVisible = false
+          break
+      }
+    }
+  }
+
+  return new WorkerGame({ canvas })
+}
+
+self.onmessage = (event) => {
+  const data = event.data
+  if (data.type === "init") {
+    if (!game) {
+      importScripts(...data.scripts)
+      game = createWorkerGame(data.canvas)
+    }
+    return
+  }
+
+  if (game) {
+    game.handleHostMessage(data)
+  }
+}